@@ -11,13 +11,27 @@ import csv
 import pandas as pd
 import fugashi
 import pysrt
-import jieba
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
+import heapq
+import shutil
+import argparse
 from datetime import datetime
 import abc
 
-from app.path_utils import get_user_file, get_resource, get_data_path, get_user_files_path
+from app.path_utils import (get_user_file, get_resource, get_data_path, get_user_files_path, get_manifest_path,
+                            read_manifest_files, SUPPORTED_LANGUAGES)
 from app import settings_manager
+from app import jieba_utils
+from app import yomitan_utils
+from app import known_word_store
+from app.file_utils import atomic_write, atomic_write_json, atomic_write_csv
+from app.progress_utils import ProgressReporter
+from app.watch_utils import FolderWatcher, DEFAULT_POLL_SECONDS, DEFAULT_DEBOUNCE_SECONDS
+from app.checkpoint_utils import (AnalysisCheckpoint, CancelMonitor, compute_fingerprint,
+                                  get_checkpoint_path, CANCELLED_EXIT_CODE,
+                                  DEFAULT_EVERY_FILES, DEFAULT_EVERY_SECONDS)
+from app.results_utils import (compute_config_hash, create_run_dir, publish_run, prune_runs,
+                               get_active_run_dir, DEFAULT_KEEP_RUNS)
 
 # Default Weights (Overwritten by settings.json if present)
 WEIGHT_HIGH = 10
@@ -57,7 +71,8 @@ except Exception as e:
     print(f"Warning: Could not load logic settings: {e}")
 
 # Paths - Now determined dynamically in main()
-# RESULTS_DIR remains shared for the "Active" analysis result
+# Each run writes into its own results/runs/<lang>_<config>_... folder; RESULTS_DIR
+# holds the published "Active" result (see results_utils.publish_run)
 RESULTS_DIR = get_user_file("results")
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
@@ -65,6 +80,9 @@ OUTPUT_CSV = os.path.join(RESULTS_DIR, "priority_learning_list.csv")
 OUTPUT_STATS = os.path.join(RESULTS_DIR, "file_statistics.txt")
 OUTPUT_PROGRESSIVE = os.path.join(RESULTS_DIR, "progressive_learning_list.csv")
 
+# --watch keeps tokenized files between runs up to this many tokens (roughly 200-300 MB)
+SENTENCE_CACHE_MAX_TOKENS = 1000000
+
 
 # --- Classes & Functions ---
 
@@ -77,9 +95,38 @@ class Tokenizer(abc.ABC):
     def tokenize_sentences(self, text):
         pass
 
+def _boundary_set(boundary_str):
+    """
+    Precompute every string that `surface in boundary_str` would accept.
+    The tokenizers historically used a substring test against the raw settings
+    string, so multi-char runs like "！？" (and the empty string) also count as
+    boundaries. A frozenset of all substrings keeps those semantics with O(1) lookups.
+    """
+    n = len(boundary_str)
+    return frozenset(boundary_str[i:j] for i in range(n + 1) for j in range(i, n + 1))
+
+# Unidic-lite pos1 values that never count as words:
+# '補助記号' (punctuation), '空白' (spaces), '记号' (legacy symbol tag)
+JA_SKIP_POS = frozenset(['记号', '補助記号', '空白'])
+
 class JapaneseTokenizer(Tokenizer):
-    def __init__(self):
+    def __init__(self, fast_path=True):
         self.tagger = fugashi.Tagger()
+        # Fast path reads only the needed columns from node.feature_raw instead of
+        # building the full UniDic namedtuple for every morpheme. Output is identical.
+        # The columns depend on the dictionary fugashi picked (unidic-lite has 26 fields,
+        # full unidic 29), so they are looked up once; an unknown layout uses the slow path.
+        self.feature_columns = self._find_feature_columns(self.tagger)
+        self.fast_path = fast_path and self.feature_columns is not None
+
+    @staticmethod
+    def _find_feature_columns(tagger):
+        """(pos1, lemma, kana) indices in the tagger's raw feature CSV, or None if unknown."""
+        try:
+            fields = type(tagger("猫")[0].feature)._fields
+            return fields.index("pos1"), fields.index("lemma"), fields.index("kana")
+        except (AttributeError, IndexError, ValueError):
+            return None
 
     def tokenize(self, text):
         """Returns a list of (lemma, parsing_reading, original_surface) tuples."""
@@ -91,6 +138,71 @@ class JapaneseTokenizer(Tokenizer):
 
     def tokenize_sentences(self, text):
         """Yields (sentence_string, list_of_filtered_tokens)"""
+        if self.fast_path:
+            return self._tokenize_sentences_fast(text)
+        return self._tokenize_sentences_reference(text)
+
+    def _tokenize_sentences_fast(self, text):
+        """
+        Low-overhead equivalent of _tokenize_sentences_reference.
+        The whole text still goes through MeCab in one call (same lattice), but per
+        token we only split the raw feature string once and look up precomputed sets.
+        """
+        boundaries = _boundary_set(LOGIC.get("sentence_boundaries", {}).get("ja", "。！?！？!\n"))
+        sanitize = SANITIZE_JA
+        skip_pos = JA_SKIP_POS
+        i_pos, i_lemma, i_kana = self.feature_columns
+        last = max(self.feature_columns)
+        max_split = last + 1
+
+        current_sentence_tokens = []
+        current_sentence_surface = []
+        add_token = current_sentence_tokens.append
+        add_surface = current_sentence_surface.append
+
+        for word in self.tagger(text):
+            surface = word.surface
+            raw = word.feature_raw
+            cols = raw.split(",", max_split)
+
+            # Quoted CSV fields (e.g. accent type "0,2") only matter if they land in
+            # the columns we read; otherwise let fugashi's CSV parser handle it.
+            quote = raw.find('"')
+            if quote != -1 and (len(cols) <= max_split or quote < len(raw) - len(cols[-1])):
+                feature = word.feature
+                pos, lemma, reading = feature.pos1, feature.lemma, feature.kana
+            elif len(cols) > last:
+                pos, lemma, reading = cols[i_pos], cols[i_lemma], cols[i_kana]
+            else:
+                # Unknown words only carry the POS columns (fugashi pads with None)
+                pos, lemma, reading = cols[i_pos], None, None
+
+            if not lemma:
+                lemma = surface
+            if sanitize:
+                lemma = _sanitize_term(lemma)
+
+            add_surface(surface)
+            if pos not in skip_pos:
+                add_token((lemma, reading or "", surface))
+
+            if surface in boundaries:
+                s_text = "".join(current_sentence_surface).strip()
+                if s_text:
+                    yield s_text, current_sentence_tokens
+                current_sentence_tokens = []
+                current_sentence_surface = []
+                add_token = current_sentence_tokens.append
+                add_surface = current_sentence_surface.append
+
+        # Flush remaining
+        if current_sentence_surface:
+            s_text = "".join(current_sentence_surface).strip()
+            if s_text:
+                yield s_text, current_sentence_tokens
+
+    def _tokenize_sentences_reference(self, text):
+        """Original namedtuple-based implementation (kept for equivalence checks)."""
         current_sentence_tokens = []
         current_sentence_surface = []
         
@@ -130,12 +242,13 @@ class JapaneseTokenizer(Tokenizer):
                 yield s_text, current_sentence_tokens
 
 class ChineseTokenizer(Tokenizer):
-    def __init__(self, reinforce_segmentation=False):
+    def __init__(self, reinforce_segmentation=False, workers=None):
         # Force separation of common collocations that users prefer to see split
         # e.g. "就把" -> "就", "把" instead of "就把"
+        # The tuned prefix dictionary is cached in the user data directory (see jieba_utils),
+        # so neither the dictionary build nor suggest_freq is repeated on every start.
+        jieba_utils.load_dictionary(reinforce=reinforce_segmentation)
         if reinforce_segmentation:
-            jieba.suggest_freq(('就', '把'), tune=True)
-            jieba.suggest_freq(('您', '不'), tune=True)
             print("Configuration: Chinese segmentation reinforcement ENABLED.")
         else:
             # We can't easily "undo" suggest_freq cleanly without reloading jieba or messing with internal dicts
@@ -143,6 +256,9 @@ class ChineseTokenizer(Tokenizer):
             # In this architecture, analyzer.py is run as a subprocess, so it starts fresh each time.
             pass
 
+        # Large texts are cut over paragraph blocks across cores; small ones stay in-process
+        self.segmenter = jieba_utils.ParallelSegmenter(reinforce=reinforce_segmentation, workers=workers)
+
     def tokenize(self, text):
         """Returns a list of (lemma, pinyin_placeholder, original_surface) tuples."""
         all_tokens = []
@@ -160,7 +276,7 @@ class ChineseTokenizer(Tokenizer):
         
         # Simple approach: Tokenize everything, then buffer into sentences based on punctuation tokens
         
-        seg_list = jieba.cut(text, cut_all=False)
+        seg_list = self.segmenter.cut(text)
         
         current_sentence_tokens = []
         current_sentence_surface = []
@@ -208,6 +324,13 @@ class ChineseTokenizer(Tokenizer):
             if s_text:
                 yield s_text, current_sentence_tokens
 
+def make_tokenizer(language, reinforce=False):
+    """Tokenizer for a worker process or tool (Chinese without a nested segmenter pool)."""
+    if language == 'zh':
+        # One process per worker already; no nested pool inside the segmenter
+        return ChineseTokenizer(reinforce_segmentation=reinforce, workers=1)
+    return JapaneseTokenizer()
+
 def _sanitize_term(term):
     """
     Strip all characters starting from the hyphen - or space in the Term field.
@@ -238,7 +361,8 @@ def load_simple_list(file_path):
 
 def discover_yomitan_frequency_lists(user_files_dir, language='ja'):
     """
-    Scan User Files directory for frequency_list_{lang}_*.csv files.
+    Scan User Files directory for frequency_list_{lang}_*.csv files
+    (and Yomitan frequency dictionaries saved as frequency_list_{lang}_*.zip).
     Returns a dictionary mapping frequency list name -> filepath.
     """
     freq_lists = {}
@@ -248,12 +372,14 @@ def discover_yomitan_frequency_lists(user_files_dir, language='ja'):
     prefix = f"frequency_list_{language}_"
     
     try:
-        for filename in os.listdir(user_files_dir):
-            if filename.startswith(prefix) and filename.endswith(".csv"):
+        # Sorted so that a CSV wins over a zip of the same name
+        for filename in sorted(os.listdir(user_files_dir)):
+            stem, ext = os.path.splitext(filename)
+            if filename.startswith(prefix) and ext.lower() in (".csv", ".zip"):
                 # Extract name: frequency_list_ja_Novel.csv -> Novel
-                list_name = filename.replace(prefix, "").replace(".csv", "")
+                list_name = stem[len(prefix):]
                 filepath = os.path.join(user_files_dir, filename)
-                freq_lists[list_name] = filepath
+                freq_lists.setdefault(list_name, filepath)
     except Exception as e:
         print(f"Warning: Error scanning frequency lists: {e}")
     
@@ -280,6 +406,9 @@ def load_yomitan_frequency_list(csv_path):
         print(f"Warning: Frequency list not found: {csv_path}")
         return word_to_rank
     
+    if csv_path.lower().endswith(".zip"):
+        return load_yomitan_frequency_zip(csv_path)
+    
     try:
         with open(csv_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
@@ -297,6 +426,21 @@ def load_yomitan_frequency_list(csv_path):
     print(f"Loaded {len(word_to_rank)} words from {os.path.basename(csv_path)}")
     return word_to_rank
 
+def load_yomitan_frequency_zip(zip_path):
+    """
+    Load a Yomitan frequency dictionary (.zip) into the same word -> rank dictionary.
+    The term banks are stream-parsed once; later runs read the compiled index from the cache.
+    """
+    try:
+        # Frequency lists ALWAYS sanitize to ensure matching (Fix 1)
+        word_to_rank = yomitan_utils.load_rank_index(zip_path, normalize=_sanitize_term)
+    except Exception as e:
+        print(f"Warning: Error loading frequency list {zip_path}: {e}")
+        return {}
+    
+    print(f"Loaded {len(word_to_rank)} words from {os.path.basename(zip_path)}")
+    return word_to_rank
+
 def get_tier_from_rank(rank):
     """
     Determine tier from frequency rank.
@@ -318,6 +462,19 @@ def get_tier_from_rank(rank):
             
     return str(len(thresholds) + 1)
 
+def _read_known_terms(json_path):
+    """Distinct known dictForms (KNOWN or has a card) of a KnownWord.json."""
+    try:
+        return known_word_store.load_known_terms(json_path)
+    except Exception as e:
+        # e.g. a read-only folder: parse the JSON itself like before
+        print(f"Warning: Known-word store unavailable ({e}), reading the JSON directly.")
+    terms = {}
+    for entry in known_word_store.read_json_words(json_path):
+        if entry.get("knownStatus", "") == "KNOWN" or entry.get("hasCard", 0) == 1:
+            terms[entry.get("dictForm", "")] = None
+    return list(terms)
+
 def load_known_words(json_path, tokenizer):
     try:
         print(f"Loading known words from {json_path}...")
@@ -327,54 +484,37 @@ def load_known_words(json_path, tokenizer):
         print("Warning: Known words file not found.")
         return set(), set()
     
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        
     known_tuples = set()
     known_lemmas = set()
-    # Handle both Dict (list in 'words') and List formats
-    if isinstance(data, dict):
-         word_list = data.get("words", [])
-    elif isinstance(data, list):
-         word_list = data
-    else:
-         word_list = []
-
-    for entry in word_list:
-        status = entry.get("knownStatus", "")
-        has_card = entry.get("hasCard", 0)
-        
-        is_known = (status == "KNOWN") or (has_card == 1)
+    # Each distinct known dictForm once, read from the indexed store next to the JSON
+    for term in _read_known_terms(json_path):
+        if SANITIZE_JA:
+            term = _sanitize_term(term)
         
-        if is_known:
-            term = entry.get("dictForm", "")
-            if SANITIZE_JA:
-                term = _sanitize_term(term)
-            
-            if term:
-                # Normalize using the same tokenizer
-                try:
-                    tokens = tokenizer.tokenize(term)
+        if term:
+            # Normalize using the same tokenizer
+            try:
+                tokens = tokenizer.tokenize(term)
+                
+                # 0. Trust the explicit dictForm as a lemma (catches cases where tokenizer normalizes "その" -> "其の")
+                known_lemmas.add(term) 
+
+                # 1. Add individual tokens
+                for lemma, reading, _ in tokens:
+                    known_tuples.add((lemma, reading))
+                    known_lemmas.add(lemma)
                     
-                    # 0. Trust the explicit dictForm as a lemma (catches cases where tokenizer normalizes "その" -> "其の")
-                    known_lemmas.add(term) 
-
-                    # 1. Add individual tokens
-                    for lemma, reading, _ in tokens:
-                        known_tuples.add((lemma, reading))
-                        known_lemmas.add(lemma)
-                        
-                    # 2. Heuristic: If multiple tokens, add the combined form too.
-                    # This fixes issues like "まで" (which tokenizer might split as "Ma"+"De" in isolation, 
-                    # but find as "Made" particle in context).
-                    if len(tokens) > 1:
-                        full_reading = "".join([t[1] for t in tokens if t[1]]) # Concat readings
-                        known_tuples.add((term, full_reading))
-                        known_lemmas.add(term)
-                        
-                except Exception:
-                    # Fallback if tokenization fails
-                    pass
+                # 2. Heuristic: If multiple tokens, add the combined form too.
+                # This fixes issues like "まで" (which tokenizer might split as "Ma"+"De" in isolation, 
+                # but find as "Made" particle in context).
+                if len(tokens) > 1:
+                    full_reading = "".join([t[1] for t in tokens if t[1]]) # Concat readings
+                    known_tuples.add((term, full_reading))
+                    known_lemmas.add(term)
+                    
+            except Exception:
+                # Fallback if tokenization fails
+                pass
                 
     print(f"Loaded {len(known_tuples)} known word variations and {len(known_lemmas)} unique lemmas.")
     return known_tuples, known_lemmas
@@ -592,12 +732,30 @@ def get_tier_label(word, freq_data):
     
     return tiers_found
 
+def push_extra_context(heap, rank, seq, sentence_text, limit):
+    """
+    Offers a candidate sentence to a word's bounded "best extra contexts" heap.
+    rank is (is_too_short, is_too_long, cost); lower is better.
+    The heap holds at most `limit` entries, stored negated so heap[0] is the current worst.
+    seq only ever grows, so a later sentence never displaces an earlier one with an equal
+    rank (same result as the old append + stable sort + slice, at O(log k) per candidate).
+    """
+    if limit <= 0:
+        return
+    item = (-rank[0], -rank[1], -rank[2], -seq, sentence_text)
+    if len(heap) < limit:
+        heapq.heappush(heap, item)
+    elif rank < (-heap[0][0], -heap[0][1], -heap[0][2]):
+        heapq.heapreplace(heap, item)
+
+def sorted_extra_contexts(heap):
+    """Converts a push_extra_context heap back into the sorted (is_too_short, is_too_long, cost, sentence_text) list."""
+    ordered = sorted(heap, reverse=True)
+    return [(-short, -long, -cost, text) for short, long, cost, _, text in ordered]
+
 def main():
     import sys
     
-    # --- VISUALIZER REMOVED ---
-    # Legacy interactive visualizer logic removed.
-
     # --- STATIC ONLY MODE ---
     if "--static-only" in sys.argv:
         try:
@@ -611,7 +769,6 @@ def main():
             return
 
     # --- ARGUMENT PARSING ---
-    import argparse
     parser = argparse.ArgumentParser(description="Japanese Text Analyzer")
     
     # Flags for standard run
@@ -622,18 +779,170 @@ def main():
     parser.add_argument("--reinforce", action="store_true", help="Force strict segmentation for Chinese (e.g. split common collocations like 'jiu ba')")
     
     # These are handled manually above but good to have in help
-    parser.add_argument("--visualize-only", action="store_true", help="Launch visualizer server")
+    parser.add_argument("--visualize-only", action="store_true", help="Serve the existing results locally (no analysis)")
     parser.add_argument("--static-only", action="store_true", help="Generate static HTML")
-    parser.add_argument("--visualize", action="store_true", help="Launch visualizer after analysis")
+    parser.add_argument("--visualize", action="store_true", help="Serve the results locally after analysis (paginated, for large libraries)")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the --visualize server (localhost)")
     parser.add_argument("--static", action="store_true", help="Generate static HTML after analysis")
     parser.add_argument("--theme", type=str, default="default", help="Theme for static HTML (default, world-class, modern-light, zen-focus)")
     parser.add_argument("--target-coverage", type=int, default=0, help="Target cumulative coverage percent (0-100)")
-    parser.add_argument("--language", type=str, default="ja", help="Target language code (ja, zh)")
+    parser.add_argument("--language", type=str, default="ja", help="Target language code (ja, zh). Several (ja,zh) or 'all' are analyzed side by side")
     parser.add_argument("--sanitize", action="store_true", help="Sanitize Japanese terms (strip hyphen/space suffixes)")
     parser.add_argument("--zen-limit", type=int, default=0, help="Limit words for Zen Mode")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes for Chinese segmentation (default 0 = all cores)")
+    parser.add_argument("--progress-format", choices=["text", "json"], default="text", help="Emit machine-readable progress events as JSON lines (used by the dashboard)")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run from its last checkpoint (if files/settings are unchanged)")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_EVERY_FILES, help="Save a checkpoint every N files (0 = off)")
+    parser.add_argument("--checkpoint-interval", type=int, default=DEFAULT_EVERY_SECONDS, help="Save a checkpoint at least every T seconds (0 = off)")
+    parser.add_argument("--cancel-file", type=str, default=None, help="Stop cleanly at the next file boundary once this file exists")
+    parser.add_argument("--watch", action="store_true", help="Keep running: re-analyze and refresh the static page whenever content or word lists change")
+    parser.add_argument("--watch-interval", type=float, default=DEFAULT_POLL_SECONDS, help="Seconds between folder polls in --watch mode")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE_SECONDS, help="Seconds without further changes before re-analyzing in --watch mode")
+    parser.add_argument("--keep-runs", type=int, default=DEFAULT_KEEP_RUNS, help="Finished runs to keep per language in results/runs (the active one always stays)")
 
     args, unknown = parser.parse_known_args()
-    
+
+    languages = parse_languages(args.language)
+    if not languages:
+        print(f"Error: Unsupported language '{args.language}'. Use one or more of: {', '.join(SUPPORTED_LANGUAGES)}")
+        sys.exit(2)
+
+    # --- VISUALIZE ONLY MODE ---
+    if args.visualize_only:
+        visualize_results(args, languages[0])
+        return
+
+    if len(languages) > 1:
+        if args.watch:
+            print("Error: --watch supports one language at a time.")
+            sys.exit(2)
+        exit_code = analyze_languages(args, languages)
+        if exit_code:
+            sys.exit(exit_code)
+        if args.visualize:
+            print(f"Serving the results of '{languages[0]}' (use --visualize-only --language <code> for the others).")
+            visualize_results(args, languages[0])
+        return
+    args.language = languages[0]
+
+    if args.watch:
+        if args.visualize:
+            # Reloads by itself whenever a re-analysis publishes a new run
+            from app import results_server
+            server = results_server.start_in_background(args.language, port=args.port,
+                                                        theme=args.theme)
+            print(f"Serving results at {results_server.server_url(server)}")
+        watch_and_analyze(args)
+        return
+
+    run_analysis(args)
+
+    if args.visualize:
+        visualize_results(args, args.language)
+
+
+def visualize_results(args, language):
+    """--visualize / --visualize-only: serve the active results of `language` until Ctrl+C."""
+    from app import results_server
+    results_server.serve_results(language, port=args.port, theme=args.theme)
+
+
+def parse_languages(value):
+    """'ja', 'ja,zh' or 'all' -> list of language codes (order kept, duplicates dropped).
+    Returns an empty list if any code is not supported."""
+    if value.strip().lower() == "all":
+        return list(SUPPORTED_LANGUAGES)
+    languages = []
+    for code in value.split(","):
+        code = code.strip()
+        if not code:
+            continue
+        if code not in SUPPORTED_LANGUAGES:
+            return []
+        if code not in languages:
+            languages.append(code)
+    return languages
+
+
+def _analyze_language_worker(args, language):
+    """Entry point of one language's process in analyze_languages()."""
+    # Line-buffered, so log lines and progress events of the languages never interleave mid-line
+    try:
+        sys.stdout.reconfigure(line_buffering=True)
+    except (AttributeError, ValueError):
+        pass
+    args = argparse.Namespace(**vars(args))
+    args.language = language
+    args.tag_progress = True
+    run_analysis(args, open_browser=False)
+
+
+def analyze_languages(args, languages):
+    """
+    --language ja,zh: analyzes every language in its own process at the same time, so a batch
+    takes as long as the slowest language instead of the sum. Startup work shared by all
+    languages (imports, settings, argument parsing) is done once here and inherited by the
+    workers where the platform forks. Each worker writes and publishes its own run folder
+    (see results_utils), so the outputs never collide.
+    Returns the exit code: 0, CANCELLED_EXIT_CODE if a language was stopped, 1 on errors.
+    """
+    import multiprocessing
+
+    # Chinese segmentation fans out over cores itself; leave one core per other language
+    if args.workers == 0 and "zh" in languages:
+        args.workers = max(1, (os.cpu_count() or 1) - (len(languages) - 1))
+
+    print(f"Analyzing {len(languages)} languages side by side: {', '.join(languages)}")
+    sys.stdout.flush()
+
+    context = multiprocessing.get_context()
+    workers = {}
+    for language in languages:
+        process = context.Process(target=_analyze_language_worker, args=(args, language), name=f"analyzer-{language}")
+        process.start()
+        workers[language] = process
+
+    cancel = CancelMonitor(args.cancel_file)
+    cancel.install()
+    forwarded = False
+    try:
+        while any(p.is_alive() for p in workers.values()):
+            for process in workers.values():
+                process.join(timeout=0.2)
+            # The workers watch the cancel file themselves; a SIGTERM sent to us is passed on
+            if not forwarded and cancel.signalled():
+                for process in workers.values():
+                    if process.is_alive():
+                        process.terminate()
+                forwarded = True
+    finally:
+        cancel.uninstall()
+
+    exit_codes = {language: p.exitcode for language, p in workers.items()}
+    print("\n---------------------------------------------------")
+    for language, code in exit_codes.items():
+        status = "done" if code == 0 else ("stopped (resume later)" if code == CANCELLED_EXIT_CODE else f"failed (exit code {code})")
+        print(f"{language}: {status}")
+
+    if args.static and all(code == 0 for code in exit_codes.values()):
+        from app import static_html_generator
+        for language in languages:
+            page = os.path.join(get_active_run_dir(RESULTS_DIR, language), "reading_list_static.html")
+            if os.path.exists(page):
+                static_html_generator.open_in_browser(page)
+
+    if any(code not in (0, CANCELLED_EXIT_CODE) for code in exit_codes.values()):
+        return 1
+    if any(code == CANCELLED_EXIT_CODE for code in exit_codes.values()):
+        return CANCELLED_EXIT_CODE
+    return 0
+
+
+def run_analysis(args, sentence_cache=None, open_browser=True):
+    """
+    One full analysis run (aggregation + outputs + progressive report + optional static page).
+    sentence_cache (watch mode) keeps tokenized files between runs so unchanged files are not re-read.
+    """
     global SKIP_SINGLE_CHARS, MIN_FREQ, SANITIZE_JA
     
     if args.sanitize:
@@ -673,7 +982,7 @@ def main():
     
     # 1. Load Resources
     if language == 'zh':
-        tokenizer = ChineseTokenizer(reinforce_segmentation=args.reinforce)
+        tokenizer = ChineseTokenizer(reinforce_segmentation=args.reinforce, workers=args.workers)
         # For consistency, we might look for KnownWord.json in the zh folder too?
         # Legacy: KnownWord_zh.json in User Files?
         # New Plan: User Files/zh/KnownWord.json
@@ -683,6 +992,12 @@ def main():
         known_file = os.path.join(user_files_dir, "KnownWord.json")
         
     known_words_initial, known_lemmas_initial = load_known_words(known_file, tokenizer)
+
+    def read_sentences(file_path):
+        """(sentence, tokens) pairs of a file, from the watch-mode cache when it is unchanged."""
+        if sentence_cache is not None:
+            return sentence_cache.get(file_path, lambda: tokenizer.tokenize_sentences(extract_text(file_path, language)))
+        return tokenizer.tokenize_sentences(extract_text(file_path, language))
     
     ignore_list_file = os.path.join(user_files_dir, "IgnoreList.txt")
     black_list_file = os.path.join(user_files_dir, "Blacklist.txt")
@@ -701,7 +1016,7 @@ def main():
     
     if not available_freq_lists:
         print("Warning: No frequency lists found in User Files/")
-        print("Expected format: frequency_list_{lang}_*.csv")
+        print("Expected format: frequency_list_{lang}_*.csv (or a Yomitan frequency .zip)")
     
     freq_data = {}
     for list_name, filepath in sorted(available_freq_lists.items()):
@@ -721,7 +1036,7 @@ def main():
         "score": 0, "total_count": 0, "sources": set(), 
         "high_count": 0, "low_count": 0, "goal_count": 0,
         "first_context": "", 
-        "best_extra_contexts": [], # List of (is_too_short, is_too_long, cost, sentence_text)
+        "best_extra_contexts": [], # Heap while aggregating, then sorted (is_too_short, is_too_long, cost, sentence_text)
         "surface": "",
         "min_seq": float('inf') # Track first appearance sequence index
     })
@@ -744,7 +1059,7 @@ def main():
     found_files = []
     
     # Check for master_manifest.json
-    manifest_path = os.path.join(user_files_dir, "master_manifest.json")
+    manifest_path = get_manifest_path(language)
     
     if os.path.exists(manifest_path):
         try:
@@ -752,70 +1067,16 @@ def main():
         except UnicodeEncodeError:
             print("Loading Sort Order from Manifest (path contains non-ASCII characters)")
         try:
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                manifest = json.load(f)
-                
-            schedule = manifest.get("schedule", {})
-            phases = ["PHASE_1_NOW", "PHASE_2_SOON", "PHASE_3_LATER"] # order matters
-            
-            seen_paths = set()
-            
-            for phase_key in phases:
-                items = schedule.get(phase_key, [])
-                for item in items:
-                    # Logic: We need the absolute path.
-                    # Manifest stores "physical_path" relative to data_dir usually? 
-                    # Immersion Architect stores: "./01_NOW/..." relative to data root
-                    # logic: os.path.join(data_dir, item["physical_path"])
-                    
-                    # Need to handle potential "../" or "./" in the stored path
-                    # "physical_path": "./01_NOW/HarryPotter/HP_01.txt"
-                    # data_dir is "User Data/data/ja"
-                    # We need to resolve this carefully.
-                    
-                    rel_path = item.get("physical_path", "")
-                    
-                    # Hack/Fix: Immersion Architect uses:
-                    # self.buckets = { "01_NOW": .../HighPriority, ... }
-                    # and indexes files there. 
-                    # But the manifest path stored might be raw path?
-                    # Let's check Immersion Architect implementation.
-                    # It stores: os.path.relpath(winner["file_path"], self.data_root)
-                    # So "./HighPriority/Book/File.txt" -> "HighPriority/Book/File.txt" roughly
-                    
-                    if rel_path.startswith("./"):
-                        rel_path = rel_path[2:]
-                        
-                    abs_path = os.path.join(data_dir, rel_path)
-                    
-                    if not os.path.exists(abs_path):
-                        # Try matching by title if path fails (moved files?)
-                        # For now, just skip or warn
-                        print(f"Warning: Manifest file not found: {abs_path}")
-                        continue
-                        
-                    if abs_path in seen_paths: continue
-                    seen_paths.add(abs_path)
-                    
-                    # Determine Weight based on Phase
-                    weight = WEIGHT_GOAL # Default
-                    if phase_key == "PHASE_1_NOW": weight = WEIGHT_HIGH
-                    elif phase_key == "PHASE_2_SOON": weight = WEIGHT_LOW
-                    
-                    # Label? "HighPriority" etc is used for stats. 
-                    # We can infer label from original path or just use phase?
-                    # Logic: origin_source in manifest: "01_NOW", "02_SOON", "03_LATER"
-                    # We should Probably map these back to "HighPriority", "LowPriority", "GoalContent"
-                    # for consistency in output reporting? 
-                    # Actually, the user might want to see "NOW" in the report.
-                    # But let's map for backward compat first.
-                    
-                    origin = item.get("origin_source", "03_LATER")
-                    label = "GoalContent"
-                    if origin == "01_NOW": label = "HighPriority"
-                    elif origin == "02_SOON": label = "LowPriority"
-                    
-                    found_files.append((abs_path, label, weight))
+            # Paths resolved against data_dir, missing files skipped (with a warning)
+            for abs_path, phase_key, label in read_manifest_files(manifest_path, data_dir):
+                # Determine Weight based on Phase
+                weight = WEIGHT_GOAL # Default
+                if phase_key == "PHASE_1_NOW": weight = WEIGHT_HIGH
+                elif phase_key == "PHASE_2_SOON": weight = WEIGHT_LOW
+
+                # Label: the scan target of the item's origin ("01_NOW" -> HighPriority, ...),
+                # kept for backward compat of the reporting
+                found_files.append((abs_path, label, weight))
                     
             print(f"Manifest Loaded: {len(found_files)} files scheduled.")
             
@@ -852,19 +1113,81 @@ def main():
                 found_files.append((path, label, weight))
 
     print(f"Final Count: Found {len(found_files)} files to process.")
+
+    # Context selection settings (read once, not per sentence)
+    context_settings = LOGIC.get("context", {})
+    min_words = context_settings.get("min_words", 4)
+    preferred_max_chars = context_settings.get("preferred_max_chars", 50)
+    max_extra = context_settings.get("max_extra", 2)
+    sentence_seq = 0
+
+    progress = ProgressReporter(args.progress_format, language=language if getattr(args, "tag_progress", False) else None)
+    progress.begin([path for path, _, _ in found_files])
+
+    # --- CHECKPOINT / RESUME ---
+    # Everything that changes the counted state is part of the fingerprint
+    run_options = {
+        "language": language, "sanitize": SANITIZE_JA, "skip_single": SKIP_SINGLE_CHARS,
+        "min_freq": MIN_FREQ, "target_coverage": args.target_coverage,
+        "reinforce": args.reinforce, "logic": LOGIC
+    }
+    config_hash = compute_config_hash(run_options)
+    checkpoint = AnalysisCheckpoint(
+        get_checkpoint_path(RESULTS_DIR, language, config_hash),
+        compute_fingerprint(found_files, user_files_dir, run_options),
+        every_files=args.checkpoint_every,
+        every_seconds=args.checkpoint_interval
+    )
+    resume_state = checkpoint.load() if args.resume else None
+    resume_phase = resume_state["phase"] if resume_state else None
+
+    cancel = CancelMonitor(args.cancel_file)
+    cancel.install()
+    # This run's own output folder (created once the aggregation pass is done)
+    run_dir = None
+
+    def stop_if_cancelled(get_state):
+        """Called at file boundaries: saves the checkpoint and exits if a stop was requested."""
+        if not cancel.requested():
+            return
+        checkpoint.save(get_state())
+        cancel.uninstall()
+        if run_dir:
+            # Unpublished partial outputs; the resumed run writes its own folder
+            shutil.rmtree(run_dir, ignore_errors=True)
+        print("\nAnalysis cancelled. Progress saved - run again with --resume to continue.")
+        sys.exit(CANCELLED_EXIT_CODE)
+
+    agg_done = 0
+    if resume_state:
+        word_stats.update(resume_state["word_stats"])
+        file_stats = resume_state["file_stats"]
+        sentence_seq = resume_state["sentence_seq"]
+        agg_done = resume_state["next_index"] if resume_phase == "aggregate" else len(found_files)
+        print(f"Resuming from checkpoint ({resume_phase} pass, {resume_state['next_index']} of {len(found_files)} files done).")
+
+    def aggregation_state(next_index):
+        return {
+            "phase": "aggregate", "next_index": next_index,
+            "word_stats": dict(word_stats), "file_stats": file_stats, "sentence_seq": sentence_seq
+        }
     
     # --- AGGREGATION PASS ---
+    progress.set_stage("aggregate")
     for seq_idx, (file_path, label, weight) in enumerate(found_files, 1):
+        if seq_idx <= agg_done:
+            # Already counted in the checkpoint
+            progress.file_skipped(file_path)
+            continue
+        stop_if_cancelled(lambda: aggregation_state(seq_idx - 1))
         try:
             print(f"Processing {os.path.basename(file_path)}...")
         except UnicodeEncodeError:
             print(f"Processing file {found_files.index((file_path, label, weight)) + 1}...")
-        text = extract_text(file_path, language)
-        
         file_total_words = 0
         file_known_words = 0
         
-        for s_text, s_tokens in tokenizer.tokenize_sentences(text):
+        for s_text, s_tokens in read_sentences(file_path):
             # 1. Identify unknowns and calculate cost (relative to constant initial knowns)
             sentence_unknowns = []
             for lemma, reading, surface in s_tokens:
@@ -908,12 +1231,10 @@ def main():
                     entry["min_seq"] = seq_idx
 
             # 3. Update Best Contexts (once per unique unknown per sentence)
-            sentence_token_count = len(s_tokens)
-            min_words = LOGIC.get("context", {}).get("min_words", 4)
-            is_too_short = 1 if sentence_token_count < min_words else 0
-            
-            preferred_max_chars = LOGIC.get("context", {}).get("preferred_max_chars", 50)
+            sentence_seq += 1
+            is_too_short = 1 if len(s_tokens) < min_words else 0
             is_too_long = 1 if len(s_text) > preferred_max_chars else 0
+            rank = (is_too_short, is_too_long, cost)
             
             for (lemma, reading) in unique_lrs:
                 entry = word_stats[(lemma, reading)]
@@ -922,15 +1243,11 @@ def main():
                 else:
                     if s_text == entry["first_context"]: continue
                     
-                    # Maintain top 2 easiest sentences (lowest cost)
+                    # Maintain top N easiest sentences (lowest cost)
                     # Priority order: 1. Not too short, 2. Not too long, 3. Low cost
-                    best = entry["best_extra_contexts"]
-                    best.append((is_too_short, is_too_long, cost, s_text))
-                    # Sort by: 1. Not too short, 2. Not too long, 3. Low cost
-                    best.sort(key=lambda x: (x[0], x[1], x[2]))
-                    max_extra = LOGIC.get("context", {}).get("max_extra", 2)
-                    entry["best_extra_contexts"] = best[:max_extra]
+                    push_extra_context(entry["best_extra_contexts"], rank, sentence_seq, s_text, max_extra)
         
+        progress.file_done(file_path, file_total_words)
         coverage = (file_known_words / file_total_words * 100) if file_total_words > 0 else 0
         file_stats.append({
             "File": os.path.basename(file_path),
@@ -938,9 +1255,24 @@ def main():
             "Known Count": file_known_words,
             "Coverage (%)": round(coverage, 2)
         })
+        checkpoint.file_finished(lambda: aggregation_state(seq_idx))
+
+    # Turn the per-word context heaps back into sorted lists for reporting
+    # (a checkpoint from the progressive pass already holds the sorted lists)
+    if resume_phase != "progressive":
+        for entry in word_stats.values():
+            entry["best_extra_contexts"] = sorted_extra_contexts(entry["best_extra_contexts"])
+
+    # Outputs go to this run's folder; they are published to RESULTS_DIR when the run completes
+    run_dir = create_run_dir(RESULTS_DIR, language, config_hash)
+    output_csv = os.path.join(run_dir, os.path.basename(OUTPUT_CSV))
+    output_stats = os.path.join(run_dir, os.path.basename(OUTPUT_STATS))
+    output_progressive = os.path.join(run_dir, os.path.basename(OUTPUT_PROGRESSIVE))
 
     # Output Priority CSV
+    progress.set_stage("write")
     output_rows = []
+    priority_rows = []  # What was written, handed to the static page as-is
     for (lemma, reading), data in word_stats.items():
         if MIN_FREQ > 0 and data["total_count"] < MIN_FREQ:
             continue
@@ -1021,17 +1353,18 @@ def main():
             # Use the filtered DF for output, but make sure to drop _MinSeq
             df_display = df.drop(columns=["_MinSeq"], errors='ignore')
 
-        df_display.to_csv(OUTPUT_CSV, index=False, encoding='utf-8-sig')
+        atomic_write_csv(df_display, output_csv, index=False)
+        priority_rows = df_display.to_dict(orient="records")
         try:
-            print(f"Saved priority list to {OUTPUT_CSV}")
+            print(f"Saved priority list to {output_csv}")
         except UnicodeEncodeError:
             print("Saved priority list to CSV.")
     else:
         print("No unknown words found!")
 
     # Output Stats
-    OUTPUT_STATS_JSON = os.path.join(RESULTS_DIR, "file_statistics.json")
-    with open(OUTPUT_STATS, 'w', encoding='utf-8') as f:
+    OUTPUT_STATS_JSON = os.path.join(run_dir, "file_statistics.json")
+    with atomic_write(output_stats) as f:
         f.write("--- File Statistics ---\n")
         f.write(f"Configuration: Skip Single Chars = {SKIP_SINGLE_CHARS}\n\n")
         for stat in file_stats:
@@ -1041,19 +1374,18 @@ def main():
             f.write(f"  Coverage: {stat['Coverage (%)']}%\n")
             f.write("\n")
         try:
-            print(f"Saved stats to {OUTPUT_STATS}")
+            print(f"Saved stats to {output_stats}")
         except UnicodeEncodeError:
             print("Saved stats to file.")
     
-    with open(OUTPUT_STATS_JSON, 'w', encoding='utf-8') as f:
-        json.dump(file_stats, f, indent=4, ensure_ascii=False)
+    atomic_write_json(OUTPUT_STATS_JSON, file_stats, indent=4, ensure_ascii=False)
     try:
         print(f"Saved JSON stats to {OUTPUT_STATS_JSON}")
     except UnicodeEncodeError:
         print("Saved JSON stats.")
 
     # Output Raw Word Stats for GUI
-    OUTPUT_WORD_STATS = os.path.join(RESULTS_DIR, "word_stats.json")
+    OUTPUT_WORD_STATS = os.path.join(run_dir, "word_stats.json")
     # Convert word_stats to JSON-serializable format
     # Keys are (lemma, reading) tuples -> Convert to string "lemma|reading"
     # Values have sets -> Convert to lists
@@ -1064,8 +1396,7 @@ def main():
         serializable_data["sources"] = list(data["sources"])
         serializable_stats[key] = serializable_data
         
-    with open(OUTPUT_WORD_STATS, 'w', encoding='utf-8') as f:
-        json.dump(serializable_stats, f, indent=2, ensure_ascii=False)
+    atomic_write_json(OUTPUT_WORD_STATS, serializable_stats, indent=2, ensure_ascii=False)
     try:
         print(f"Saved raw word stats to {OUTPUT_WORD_STATS}")
     except UnicodeEncodeError:
@@ -1073,6 +1404,7 @@ def main():
     
     # --- PROGRESSIVE REPORT PASS ---
     print("Generating Progressive Report...")
+    progress.set_stage("progressive")
     progressive_rows = []
     # Work with a COPY of known words so we don't pollute the global set if we re-run logic, 
     # but here we just have one run.
@@ -1081,11 +1413,32 @@ def main():
     # Start with initial known
     session_known = set(known_words_initial)
     session_lemmas = set(known_lemmas_initial) 
+
+    prog_done = 0
+    if resume_phase == "progressive":
+        progressive_rows = resume_state["progressive_rows"]
+        session_known = resume_state["session_known"]
+        session_lemmas = resume_state["session_lemmas"]
+        prog_done = resume_state["next_index"]
+
+    def progressive_state(next_index):
+        state = aggregation_state(len(found_files))
+        state.update({
+            "phase": "progressive", "next_index": next_index,
+            "progressive_rows": progressive_rows,
+            "session_known": session_known, "session_lemmas": session_lemmas
+        })
+        return state
     
     for seq_idx, (file_path, label, weight) in enumerate(found_files, 1):
+        if seq_idx <= prog_done:
+            progress.file_skipped(file_path)
+            continue
+        stop_if_cancelled(lambda: progressive_state(seq_idx - 1))
         filename = os.path.basename(file_path)
-        text = extract_text(file_path, language)
-        tokens = tokenizer.tokenize(text)
+        # Same as tokenizer.tokenize(text), but shares the watch-mode cache
+        tokens = [token for _, s_tokens in read_sentences(file_path) for token in s_tokens]
+        progress.file_done(file_path, len(tokens))
         
         # 1. Calculate File Baselines
         file_total_tokens = 0
@@ -1188,18 +1541,21 @@ def main():
         # After finishing the file, these words are now "Known" for the next file
         session_known.update(words_learned_this_file)
         session_lemmas.update([x[0] for x in words_learned_this_file])
+        checkpoint.file_finished(lambda: progressive_state(seq_idx))
         
     df_prog = pd.DataFrame(progressive_rows)
     if not df_prog.empty:
-        df_prog.to_csv(OUTPUT_PROGRESSIVE, index=False, encoding='utf-8-sig')
-        print(f"Saved progressive report to {OUTPUT_PROGRESSIVE}")
+        atomic_write_csv(df_prog, output_progressive, index=False)
+        print(f"Saved progressive report to {output_progressive}")
     else:
         print("No progressive words found (all known).")
 
-    # --- VISUALIZER REMOVED ---
-            
+    # Run completed: the checkpoint is no longer needed
+    checkpoint.clear()
+    cancel.uninstall()
+
     # --- STATIC GENERATION ---
-    if "--static" in sys.argv:
+    if args.static:
         try:
             try:
                 from app import static_html_generator
@@ -1208,14 +1564,139 @@ def main():
                 
             print("\n---------------------------------------------------")
             print("Generating Static HTML...")
-            static_html_generator.generate_static_html(theme=args.theme, zen_limit=args.zen_limit)
+            progress.set_stage("static")
+            # Straight from the in-memory results (no reading the lists back from disk).
+            # GoalContent membership comes from the scan targets the files were found in.
+            goal_files = {os.path.basename(path) for path, label, _ in found_files if label == "GoalContent"}
+            report_data = static_html_generator.build_report_data(progressive_rows, priority_rows, file_stats, goal_files)
+            # Built inside the run folder so it is published together with the lists
+            static_html_generator.generate_static_html(theme=args.theme, zen_limit=args.zen_limit, open_browser=False,
+                                                       results_dir=run_dir, language=language, report_data=report_data)
         except Exception as e:
             print(f"Error: Could not generate static HTML: {e}")
 
-    if "--visualize" not in sys.argv and "--static" not in sys.argv:
+    # --- PUBLISH ---
+    # Swap the active result for this language to this run, then apply the retention policy
+    publish_run(RESULTS_DIR, run_dir, language, config_hash)
+    try:
+        print(f"Published results of run {os.path.basename(run_dir)} to {RESULTS_DIR}")
+    except UnicodeEncodeError:
+        print(f"Published results of run {os.path.basename(run_dir)}.")
+    removed = prune_runs(RESULTS_DIR, keep=args.keep_runs)
+    if removed:
+        print(f"Removed {len(removed)} old analysis run(s).")
+
+    published_page = os.path.join(RESULTS_DIR, "reading_list_static.html")
+    if args.static and open_browser and os.path.exists(published_page):
+        static_html_generator.open_in_browser(published_page)
+
+    progress.finish()
+
+    if not args.visualize and not args.static:
         print("\nAnalysis complete.")
-        print("Use '--visualize' to run the interactive server.")
+        print("Use '--visualize' to browse the results through a local server.")
         print("Use '--static' to generate a standalone HTML file.")
 
+
+class SentenceCache:
+    """
+    Tokenized sentences per file, reused across --watch runs while a file's size/mtime are unchanged.
+    Word lists and KnownWord.json only affect counting, so when just those change no file is re-tokenized.
+
+    Memory stays bounded: files that changed, were removed or were not part of the last run are
+    dropped, and beyond max_tokens cached tokens the least recently used files are evicted.
+    """
+    def __init__(self, max_tokens=SENTENCE_CACHE_MAX_TOKENS):
+        self.max_tokens = max_tokens
+        self.entries = OrderedDict()  # path -> (signature, sentences, token count), oldest first
+        self.tokens = 0
+        self.used = set()
+
+    def get(self, file_path, load):
+        try:
+            st = os.stat(file_path)
+            signature = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            signature = None
+        self.used.add(file_path)
+        cached = self.entries.get(file_path)
+        if cached is not None and signature is not None and cached[0] == signature:
+            self.entries.move_to_end(file_path)
+            return cached[1]
+        sentences = list(load())
+        self._remove(file_path)
+        if signature is not None:
+            count = sum(len(tokens) + 1 for _, tokens in sentences)
+            self.entries[file_path] = (signature, sentences, count)
+            self.tokens += count
+            # Least recently used first; the file just loaded is always kept
+            while self.tokens > self.max_tokens and len(self.entries) > 1:
+                self._remove(next(iter(self.entries)))
+        return sentences
+
+    def _remove(self, path):
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.tokens -= entry[2]
+
+    def discard(self, paths):
+        for path in paths:
+            self._remove(path)
+
+    def start_run(self):
+        self.used = set()
+
+    def finish_run(self):
+        """Drops files the run that just finished did not read (moved out, deleted, filtered)."""
+        for path in [p for p in self.entries if p not in self.used]:
+            self._remove(path)
+
+
+def watch_and_analyze(args):
+    """
+    --watch: runs the analysis, then polls data/<lang>, KnownWord.json, the ignore/black/graduated
+    lists and master_manifest.json. After a (debounced) change it re-runs and refreshes
+    reading_list_static.html. Stops on Ctrl+C or when --cancel-file appears.
+    """
+    language = args.language
+    user_files_dir = get_user_files_path(language)
+    watcher = FolderWatcher(
+        folders=[get_data_path(language)],
+        files=[os.path.join(user_files_dir, name) for name in
+               ("KnownWord.json", "IgnoreList.txt", "Blacklist.txt", "GraduatedList.txt", "master_manifest.json")],
+        interval=args.watch_interval,
+        debounce=args.debounce
+    )
+    cancel = CancelMonitor(args.cancel_file)
+    sentence_cache = SentenceCache()
+
+    # The page is always refreshed; the browser only opens after the first run (if asked to)
+    open_browser = args.static
+    args.static = True
+
+    try:
+        snapshot = watcher.snapshot()
+        while True:
+            try:
+                sentence_cache.start_run()
+                run_analysis(args, sentence_cache=sentence_cache, open_browser=open_browser)
+                sentence_cache.finish_run()
+            except SystemExit:
+                raise
+            except Exception as e:
+                print(f"Error during analysis: {e}")
+            open_browser = False
+
+            print(f"\nWatching for changes in {get_data_path(language)} (Ctrl+C to stop)...", flush=True)
+            result = watcher.wait_for_changes(snapshot, should_stop=cancel.requested)
+            if result is None:
+                print("Watch stopped.")
+                return
+            changed, snapshot = result
+            sentence_cache.discard(changed)
+            print(f"\nDetected {len(changed)} changed file(s). Re-analyzing...")
+    except KeyboardInterrupt:
+        print("\nWatch stopped.")
+
 if __name__ == "__main__":
     main()
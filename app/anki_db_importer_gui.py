@@ -2,7 +2,10 @@ import os
 import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import json
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Ensure package root is in sys.path
@@ -10,8 +13,10 @@ if __name__ == "__main__" and __package__ is None:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.path_utils import get_user_file, get_user_files_path, get_icon_path
-from app.anki_utils import load_anki_data, extract_field_text, cleanup_temp_dir
-from app.analyzer import JapaneseTokenizer, ChineseTokenizer
+from app.anki_utils import load_anki_data, extract_field_text, iter_field_text, count_field_notes, close_notes
+from app.file_utils import file_lock
+from app import known_word_store
+from app.analyzer import make_tokenizer
 
 # Colors for Dark Mode (Matching Content Importer)
 BG_COLOR = "#1e1e1e"
@@ -21,6 +26,92 @@ ACCENT_COLOR = "#bb86fc"
 SUCCESS_COLOR = "#03dac6"
 ERROR_COLOR = "#cf6679"
 
+# Unique field values tokenized together per task (joined with newlines, as before)
+BATCH_NOTES = 500
+# Below this many notes a worker pool costs more than it saves
+PARALLEL_MIN_NOTES = 2000
+
+# Tokenizer of this worker process (see _init_tokenizer_worker)
+_worker_tokenizer = None
+
+
+def _init_tokenizer_worker(language):
+    global _worker_tokenizer
+    _worker_tokenizer = make_tokenizer(language)
+
+
+def _known_words_of_batch(text, tokenizer=None):
+    """(lemma, reading) pairs of one batch of field values."""
+    tokenizer = tokenizer or _worker_tokenizer
+    # Basic filtering similar to analyzer; we save as (lemma, reading)
+    return {(lemma, reading) for lemma, reading, _ in tokenizer.tokenize(text) if lemma.strip()}
+
+
+def _iter_unique_batches(values, size, on_read=None):
+    """
+    Batches of `size` values not seen before, built lazily from `values`
+    (only the seen set and the current batch are held). on_read() is called per value read.
+    """
+    seen = set()
+    batch = []
+    for value in values:
+        if on_read:
+            on_read()
+        if value in seen:
+            continue
+        seen.add(value)
+        batch.append(value)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def extract_known_words(notes, model_field_map, field, language='ja', workers=None, progress=None):
+    """
+    The (lemma, reading) set of every word in `field` across the deck.
+
+    Notes are streamed from the collection and identical values (the same sentence on
+    several cards) are tokenized only once. Batches of values go to a process pool for
+    big decks, and each batch's words are merged into the set as soon as it is done.
+    progress(notes_read, notes_total, words_so_far) is called after every batch.
+    """
+    total = count_field_notes(notes, model_field_map, field)
+    read = 0
+
+    def count_read():
+        nonlocal read
+        read += 1
+
+    batches = _iter_unique_batches(iter_field_text(notes, model_field_map, field), BATCH_NOTES, count_read)
+    known = set()
+
+    def merge(words):
+        known.update(words)
+        if progress:
+            progress(read, total, len(known))
+
+    workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+    if workers < 2 or total < PARALLEL_MIN_NOTES:
+        tokenizer = make_tokenizer(language)
+        for batch in batches:
+            merge(_known_words_of_batch("\n".join(batch), tokenizer))
+        return known
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_tokenizer_worker,
+                             initargs=(language,)) as pool:
+        # Only a few batches in flight, merged in submission order
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_known_words_of_batch, "\n".join(batch)))
+            if len(pending) >= workers * 2:
+                merge(pending.popleft().result())
+        while pending:
+            merge(pending.popleft().result())
+    return known
+
+
 class AnkiImporterApp:
     def __init__(self, root, language='ja'):
         self.root = root
@@ -40,7 +131,6 @@ class AnkiImporterApp:
         self.anki_notes = []
         self.anki_fields = []
         self.anki_model_map = {}
-        self.anki_temp_dir = None
         
         # UI State Variables
         self.file_path_var = tk.StringVar()
@@ -49,11 +139,15 @@ class AnkiImporterApp:
 
         # UI Elements (Declared for linter and safety)
         self.file_frame = None
+        self.file_entry = None
+        self.browse_btn = None
         self.anki_options_frame = None
         self.anki_field_combo = None
         self.anki_preview_text = None
         self.extract_btn = None
         self.icon_photo = None
+        # True while a worker thread reads self.anki_notes (see process_extraction)
+        self.extracting = False
         
         # Set Application Icon
         try:
@@ -70,8 +164,8 @@ class AnkiImporterApp:
         self.file_path_var.trace_add("write", self.on_file_change)
 
     def __del__(self):
-        if hasattr(self, 'anki_temp_dir') and self.anki_temp_dir:
-            cleanup_temp_dir(self.anki_temp_dir)
+        if hasattr(self, 'anki_notes'):
+            close_notes(self.anki_notes)
         
     def apply_dark_theme(self):
         self.style.theme_use('clam')
@@ -132,8 +226,10 @@ class AnkiImporterApp:
         file_sel_container = ttk.Frame(self.file_frame)
         file_sel_container.pack(fill=tk.X)
         
-        ttk.Entry(file_sel_container, textvariable=self.file_path_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
-        ttk.Button(file_sel_container, text="Browse...", command=self.browse_file).pack(side=tk.LEFT, padx=(5, 0))
+        self.file_entry = ttk.Entry(file_sel_container, textvariable=self.file_path_var)
+        self.file_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.browse_btn = ttk.Button(file_sel_container, text="Browse...", command=self.browse_file)
+        self.browse_btn.pack(side=tk.LEFT, padx=(5, 0))
 
         # Field Selection (Initially hidden)
         self.anki_options_frame = ttk.LabelFrame(main_frame, text=" 2. Extraction Options ", padding="15")
@@ -167,7 +263,18 @@ class AnkiImporterApp:
         if file_path:
             self.file_path_var.set(file_path)
 
+    def set_inputs_enabled(self, enabled):
+        """Deck and field inputs; locked while an extraction reads the open deck."""
+        state = tk.NORMAL if enabled else tk.DISABLED
+        for widget in (self.file_entry, self.browse_btn, self.extract_btn):
+            if widget: widget.config(state=state)
+        if self.anki_field_combo:
+            self.anki_field_combo.config(state="readonly" if enabled else tk.DISABLED)
+
     def on_file_change(self, *args):
+        # The worker is iterating the current deck's connection; don't close it under it
+        if self.extracting:
+            return
         path = self.file_path_var.get()
         if not path or not os.path.exists(path):
             if self.anki_options_frame: self.anki_options_frame.pack_forget()
@@ -187,10 +294,11 @@ class AnkiImporterApp:
             self.status_var.set("Reading Anki Deck schema...")
             self.root.update_idletasks()
             
-            if self.anki_temp_dir:
-                cleanup_temp_dir(self.anki_temp_dir)
+            # Release the previous deck
+            close_notes(self.anki_notes)
+            self.anki_notes = []
             
-            self.anki_fields, self.anki_notes, self.anki_model_map, self.anki_temp_dir = load_anki_data(path)
+            self.anki_fields, self.anki_notes, self.anki_model_map, _ = load_anki_data(path)
             if self.anki_field_combo:
                 self.anki_field_combo['values'] = self.anki_fields
             
@@ -234,108 +342,76 @@ class AnkiImporterApp:
         if not confirm:
             return
 
+        # Loading another deck would close the connection the worker reads from
+        self.extracting = True
+        self.set_inputs_enabled(False)
+        self.status_var.set("Reading notes...")
+
+        # Tokenizing runs off the Tk thread; it reports back through this queue
+        events = queue.Queue()
+        notes, model_map = self.anki_notes, self.anki_model_map
+
+        def work():
+            try:
+                unique_words = extract_known_words(
+                    notes, model_map, field, self.language,
+                    progress=lambda done, total, words: events.put(("progress", done, total, words)))
+                events.put(("saving", len(unique_words)))
+                self.update_known_words(unique_words)
+                events.put(("done", len(unique_words)))
+            except Exception as e:
+                events.put(("error", e))
+
+        threading.Thread(target=work, daemon=True).start()
+        self.poll_extraction(events)
+
+    def poll_extraction(self, events):
         try:
-            self.status_var.set("Extracting text...")
-            self.root.update_idletasks()
-            
-            full_text = extract_field_text(self.anki_notes, self.anki_model_map, field)
-            
-            self.status_var.set("Tokenizing words...")
-            self.root.update_idletasks()
-            
-            tokenizer = JapaneseTokenizer() if self.language == 'ja' else ChineseTokenizer()
-            # We don't care about sentences here, just the unique lemmas
-            tokens = tokenizer.tokenize(full_text)
-            
-            # Unique known words
-            unique_words = set()
-            for lemma, reading, surface in tokens:
-                # Basic filtering similar to analyzer
-                if not lemma.strip(): continue
-                # We save as (lemma, reading)
-                unique_words.add((lemma, reading))
-
-            self.status_var.set(f"Updating KnownWord.json with {len(unique_words)} words...")
-            self.root.update_idletasks()
-            
-            self.update_known_words(unique_words)
-            
-            self.status_var.set("Success!")
-            messagebox.showinfo("Success", f"Successfully processed {len(unique_words)} unique words from Anki.\nYour KnownWord.json has been updated.")
-            self.root.destroy()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Extraction failed:\n{e}")
-            self.status_var.set("Error")
+            while True:
+                event = events.get_nowait()
+                kind = event[0]
+                if kind == "progress":
+                    _, done, total, words = event
+                    self.status_var.set(f"Tokenizing... {done}/{total} notes ({words} words so far)")
+                elif kind == "saving":
+                    self.status_var.set(f"Updating KnownWord.json with {event[1]} words...")
+                elif kind == "done":
+                    self.extracting = False
+                    self.status_var.set("Success!")
+                    messagebox.showinfo("Success", f"Successfully processed {event[1]} unique words from Anki.\nYour KnownWord.json has been updated.")
+                    self.root.destroy()
+                    return
+                elif kind == "error":
+                    messagebox.showerror("Error", f"Extraction failed:\n{event[1]}")
+                    self.status_var.set("Error")
+                    self.extracting = False
+                    self.set_inputs_enabled(True)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(100, self.poll_extraction, events)
 
     def update_known_words(self, new_known_tuples):
         user_files_dir = get_user_files_path(self.language)
         output_json = os.path.join(user_files_dir, "KnownWord.json")
-        
-        existing_data = {"words": [], "statistics": {}}
-        if os.path.exists(output_json):
-            try:
-                with open(output_json, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            except Exception:
-                pass
-
-        # Handle both list and dict formats for backward compat
-        if isinstance(existing_data, list):
-            existing_words = existing_data
-            existing_data = {"words": existing_words, "statistics": {}}
-        else:
-            existing_words = existing_data.get("words", [])
 
-        # Create a map for quick lookup and to preserve metadata of existing words
-        word_map = {}
-        for w in existing_words:
-            key = (w.get('dictForm'), w.get('secondary', ''))
-            word_map[key] = w
+        # Hold the lock for the whole read-merge-write so concurrent imports don't drop words
+        with file_lock(output_json):
+            self._merge_known_words(output_json, new_known_tuples)
 
-        # Add or update new words
+    def _merge_known_words(self, output_json, new_known_tuples):
+        # Existing words keep their metadata and are marked KNOWN; new ones are added
+        # straight into the indexed store, which re-exports KnownWord.json
         now_str = datetime.now().isoformat()
-        for lemma, reading in new_known_tuples:
-            key = (lemma, reading)
-            if key in word_map:
-                # Keep existing but ensure it's marked KNOWN
-                word_map[key]['knownStatus'] = "KNOWN"
-            else:
-                word_map[key] = {
-                    'dictForm': lemma,
-                    'secondary': reading,
-                    'partOfSpeech': '',
-                    'language': self.language,
-                    'knownStatus': "KNOWN",
-                    'hasCard': 1, # Since it came from Anki
-                    'tracked': 0,
-                    'created': now_str,
-                    'mod': now_str,
-                    'isModern': 1
-                }
-
-        # Rebuild list
-        updated_words = list(word_map.values())
-        
-        # Update Stats
-        stats = {
-            'totalWords': len(updated_words),
-            'knownWords': sum(1 for w in updated_words if w.get('knownStatus') == "KNOWN"),
-            'learningWords': sum(1 for w in updated_words if w.get('knownStatus') == "LEARNING"),
-            'unknownWords': sum(1 for w in updated_words if w.get('knownStatus') == "UNKNOWN"),
-            'ignoredWords': sum(1 for w in updated_words if w.get('knownStatus') == "IGNORED"),
-            'languages': sorted(list(set(w.get('language', self.language) for w in updated_words)))
+        defaults = {
+            'hasCard': 1, # Since it came from Anki
+            'tracked': 0,
+            'created': now_str,
+            'mod': now_str,
+            'isModern': 1
         }
-
-        json_data = {
-            'exportDate': now_str,
-            'source': 'Anki Extraction',
-            'statistics': stats,
-            'words': updated_words
-        }
-
-        with open(output_json, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
+        known_word_store.mark_words_known(output_json, new_known_tuples, self.language, defaults,
+                                          exportDate=now_str, source='Anki Extraction')
 
 def main():
     import argparse
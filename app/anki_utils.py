@@ -6,81 +6,198 @@ import json
 import re
 import shutil
 
+# Anki 2.1+ might use 'collection.anki21' or just 'collection.anki2'
+COLLECTION_NAMES = ("collection.anki21", "collection.anki2")
+
+# Simplified regex for HTML cleaning
+TAG_RE = re.compile(r'<[^<]+?>')
+SOUND_RE = re.compile(r'\[sound:[^\]]+?\]')
+
+
+class AnkiNotes:
+    """
+    The (mid, flds) rows of a loaded collection. Rows are read from the in-memory
+    database with a cursor when iterated, instead of being held as one big list.
+    Supports len(), iteration and slicing (notes[:5]) like the list it replaces.
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self.count = conn.execute('SELECT COUNT(*) FROM notes').fetchone()[0]
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self.select()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.count)
+            if step != 1:
+                return list(self)[key]
+            return list(self.select(limit=max(0, stop - start), offset=start))
+        index = range(self.count)[key]
+        return next(self.select(limit=1, offset=index))
+
+    def select(self, mids=None, limit=None, offset=0):
+        """Cursor over (mid, flds), optionally only for the given note types."""
+        sql = 'SELECT mid, flds FROM notes'
+        params = []
+        if mids is not None:
+            mids = list(mids)
+            sql += f' WHERE mid IN ({",".join("?" * len(mids))})'
+            params.extend(mids)
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params.extend([limit, offset])
+        return self.conn.execute(sql, params)
+
+    def count_of(self, mids):
+        """Number of notes of the given note types."""
+        mids = list(mids)
+        if not mids:
+            return 0
+        sql = f'SELECT COUNT(*) FROM notes WHERE mid IN ({",".join("?" * len(mids))})'
+        return self.conn.execute(sql, mids).fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def _rollback_journal_header(data):
+    """
+    An in-memory database can't use a WAL, and SQLite refuses to read one whose
+    header says WAL mode (file format bytes 18/19 == 2). Such a collection is
+    marked as a rollback-journal database instead; the pages themselves are the same.
+    """
+    if len(data) >= 100 and data[:16] == b"SQLite format 3\x00" and data[18:20] == b"\x02\x02":
+        data = bytearray(data)
+        data[18:20] = b"\x01\x01"
+    return data
+
+
+def _open_collection(z, db_file):
+    """The collection database as an in-memory SQLite connection (nothing written to disk)."""
+    # The GUI may read notes from a worker thread; access is never concurrent
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    if hasattr(conn, "deserialize"):
+        # Python 3.11+: hand the file's bytes to SQLite directly
+        conn.deserialize(_rollback_journal_header(z.read(db_file)))
+        return conn
+
+    # Older Pythons: copy through a temp file that is removed right away
+    fd, temp_path = tempfile.mkstemp(suffix=".anki2")
+    try:
+        with os.fdopen(fd, "wb") as f, z.open(db_file) as src:
+            while True:
+                chunk = src.read(1 << 20)
+                if not chunk:
+                    break
+                f.write(chunk)
+        disk = sqlite3.connect(temp_path)
+        try:
+            disk.backup(conn)
+        finally:
+            disk.close()
+    finally:
+        os.remove(temp_path)
+    return conn
+
+
 def load_anki_data(apkg_path):
     """
-    Extracts collection.anki2 from .apkg and discovers all unique fields across models.
+    Loads collection.anki2 from .apkg into memory and discovers all unique fields across models.
     Returns (sorted_fields, notes, model_field_map, temp_dir)
+    notes is an AnkiNotes (close() it when done); temp_dir is always None now and only kept
+    so existing callers can still unpack four values.
     """
-    temp_dir = tempfile.mkdtemp()
-    db_path = os.path.join(temp_dir, "collection.anki2")
-    
+    with zipfile.ZipFile(apkg_path, 'r') as z:
+        filenames = z.namelist()
+        db_file = next((name for name in COLLECTION_NAMES if name in filenames), None)
+        if db_file is None:
+            # Fallback: look for sqlite header in all files?
+            # Usually it's either anki2 or anki21
+            raise FileNotFoundError("Could not find collection.anki2 or collection.anki21 in .apkg")
+        # Only the collection is read; media files in the package are never touched
+        conn = _open_collection(z, db_file)
+
     try:
-        with zipfile.ZipFile(apkg_path, 'r') as z:
-            # Anki 2.1+ might use 'collection.anki21' or just 'collection.anki2'
-            filenames = z.namelist()
-            db_file = "collection.anki21" if "collection.anki21" in filenames else "collection.anki2"
-            if db_file not in filenames:
-                # Fallback: look for sqlite header in all files? 
-                # Usually it's either anki2 or anki21
-                raise FileNotFoundError("Could not find collection.anki2 or collection.anki21 in .apkg")
-            z.extract(db_file, temp_dir)
-            if db_file != "collection.anki2":
-                os.rename(os.path.join(temp_dir, db_file), db_path)
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
         # 1. Map all available fields across all models
-        cursor.execute('SELECT models FROM col')
-        row = cursor.fetchone()
+        row = conn.execute('SELECT models FROM col').fetchone()
         if not row:
             raise ValueError("Invalid Anki database: 'col' table missing models.")
-            
+
         models = json.loads(row[0])
-        
+
         all_fields = set()
         model_field_map = {}
         for mid, m in models.items():
             fields = [f['name'] for f in m['flds']]
             model_field_map[int(mid)] = fields
             all_fields.update(fields)
-            
-        # 2. Extract notes
-        cursor.execute('SELECT mid, flds FROM notes')
-        notes = cursor.fetchall()
-        
+
+        # 2. Notes stay in the database until they are iterated
+        notes = AnkiNotes(conn)
+        return sorted(list(all_fields)), notes, model_field_map, None
+    except Exception:
         conn.close()
-        return sorted(list(all_fields)), notes, model_field_map, temp_dir
-    except Exception as e:
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-        raise e
+        raise
+
+
+def clean_field_text(raw_text):
+    text = TAG_RE.sub('', raw_text)
+    text = SOUND_RE.sub('', text)
+    text = text.replace('&nbsp;', ' ').replace('&gt;', '>').replace('&lt;', '<').replace('&amp;', '&')
+    return text.strip()
+
+
+def _field_index(model_field_map, target_field):
+    """note type id -> position of target_field, for the note types that have it."""
+    return {mid: fields.index(target_field)
+            for mid, fields in model_field_map.items() if target_field in fields}
+
+
+def count_field_notes(notes, model_field_map, target_field):
+    """Number of notes whose note type has target_field (counted in SQL for a collection)."""
+    field_index = _field_index(model_field_map, target_field)
+    if isinstance(notes, AnkiNotes):
+        return notes.count_of(field_index)
+    return sum(1 for mid, _ in notes if mid in field_index)
+
+
+def iter_field_text(notes, model_field_map, target_field):
+    """Yields the cleaned, non-empty text of target_field note by note."""
+    field_index = _field_index(model_field_map, target_field)
+    if not field_index:
+        return
+
+    # Let SQLite skip the note types that don't have the field
+    rows = notes.select(field_index) if isinstance(notes, AnkiNotes) else notes
+    for mid, flds in rows:
+        idx = field_index.get(mid)
+        if idx is None:
+            continue
+        values = flds.split('\x1f', idx + 1)
+        if idx < len(values):
+            text = clean_field_text(values[idx])
+            if text:
+                yield text
+
 
 def extract_field_text(notes, model_field_map, target_field):
     """
     Extracts cleaned text from target_field across all notes.
     """
-    extracted_lines = []
-    # Simplified regex for HTML cleaning
-    tag_re = re.compile(r'<[^<]+?>')
-    sound_re = re.compile(r'\[sound:[^\]]+?\]')
-    
-    for mid, flds in notes:
-        fields = model_field_map.get(mid, [])
-        if target_field in fields:
-            idx = fields.index(target_field)
-            values = flds.split('\x1f')
-            if idx < len(values):
-                raw_text = values[idx]
-                # Clean text
-                text = tag_re.sub('', raw_text)
-                text = sound_re.sub('', text)
-                text = text.replace('&nbsp;', ' ').replace('&gt;', '>').replace('&lt;', '<').replace('&amp;', '&')
-                if text.strip():
-                    extracted_lines.append(text.strip())
-    
-    return "\n".join(extracted_lines)
+    return "\n".join(iter_field_text(notes, model_field_map, target_field))
+
+
+def close_notes(notes):
+    """Releases the in-memory collection behind an AnkiNotes (anything else is ignored)."""
+    if isinstance(notes, AnkiNotes):
+        notes.close()
+
 
 def cleanup_temp_dir(temp_dir):
+    """Kept for compatibility: loading no longer creates a temp dir (temp_dir is None)."""
     if temp_dir and os.path.exists(temp_dir):
         shutil.rmtree(temp_dir)
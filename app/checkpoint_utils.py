@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import time
+import pickle
+import signal
+import hashlib
+
+from app.file_utils import atomic_write, is_lock_file
+from app.known_word_store import is_store_file
+
+# Bump when the checkpointed state layout changes (old checkpoints are then ignored)
+CHECKPOINT_VERSION = 1
+# Exit code of an analyzer run that stopped early on request (checkpoint kept)
+CANCELLED_EXIT_CODE = 3
+
+DEFAULT_EVERY_FILES = 25
+DEFAULT_EVERY_SECONDS = 60
+
+
+def get_checkpoint_path(results_dir, language, config_hash=None):
+    # Tagged with the config hash so runs with different settings keep separate checkpoints
+    if config_hash:
+        return os.path.join(results_dir, f"analysis_checkpoint_{language}_{config_hash}.pkl")
+    return os.path.join(results_dir, f"analysis_checkpoint_{language}.pkl")
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+        return [path, st.st_size, st.st_mtime_ns]
+    except OSError:
+        return [path, None, None]
+
+
+def compute_fingerprint(found_files, user_files_dir, options):
+    """
+    Identifies everything a checkpoint's state depends on:
+    the ordered file list (with sizes/mtimes), every file directly in User Files/<lang>
+    (KnownWord.json, ignore/black/graduated lists, frequency lists, manifest) and the
+    run options/logic settings. A checkpoint is only resumed if this matches exactly.
+    """
+    user_files = []
+    if os.path.isdir(user_files_dir):
+        for name in sorted(os.listdir(user_files_dir)):
+            # Skip write locks and in-flight temp files of atomic writes
+            if is_lock_file(name) or name.startswith("."):
+                continue
+            # The known-word store is an index of KnownWord.json (already covered)
+            if is_store_file(name):
+                continue
+            path = os.path.join(user_files_dir, name)
+            if os.path.isfile(path):
+                user_files.append(_file_signature(path))
+
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "files": [_file_signature(path) + [label, weight] for path, label, weight in found_files],
+        "user_files": user_files,
+        "options": options,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class AnalysisCheckpoint:
+    """
+    Periodically saves the analyzer's per-file state so an interrupted run can be resumed.
+
+    State is only ever captured at a file boundary, so a resumed run replays exactly the
+    files that were not yet counted and produces the same output as an uninterrupted one.
+    """
+    def __init__(self, path, fingerprint, every_files=DEFAULT_EVERY_FILES,
+                 every_seconds=DEFAULT_EVERY_SECONDS, clock=time.monotonic):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.every_files = every_files
+        self.every_seconds = every_seconds
+        self.clock = clock
+        self._files_since_save = 0
+        self._last_save = clock()
+
+    def load(self):
+        """Returns the saved state dict, or None if missing, unreadable or from a different setup."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read checkpoint ({e}). Starting from the beginning.")
+            return None
+        if not isinstance(state, dict) or state.get("fingerprint") != self.fingerprint:
+            print("Checkpoint does not match the current files/settings. Starting from the beginning.")
+            return None
+        return state
+
+    def file_finished(self, get_state):
+        """Call after each completed file; saves when N files or T seconds have passed."""
+        self._files_since_save += 1
+        due_files = self.every_files > 0 and self._files_since_save >= self.every_files
+        due_time = self.every_seconds > 0 and (self.clock() - self._last_save) >= self.every_seconds
+        if due_files or due_time:
+            self.save(get_state())
+
+    def save(self, state):
+        state = dict(state, fingerprint=self.fingerprint, version=CHECKPOINT_VERSION)
+        try:
+            with atomic_write(self.path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Warning: Could not write checkpoint: {e}")
+        self._files_since_save = 0
+        self._last_save = self.clock()
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class CancelMonitor:
+    """
+    Cooperative cancellation, checked by the analyzer between files.
+
+    Cancellation is requested either by creating the --cancel-file (used by the dashboard,
+    works on Windows where terminate() cannot be intercepted) or by SIGTERM on POSIX.
+    """
+    def __init__(self, cancel_file=None):
+        self.cancel_file = cancel_file
+        self._signalled = False
+        self._previous_handler = None
+
+    def install(self):
+        if sys.platform == "win32":
+            return
+        try:
+            self._previous_handler = signal.signal(signal.SIGTERM, self._on_signal)
+        except ValueError:
+            # Not in the main thread; the cancel file still works
+            self._previous_handler = None
+
+    def uninstall(self):
+        if self._previous_handler is not None:
+            try:
+                signal.signal(signal.SIGTERM, self._previous_handler)
+            except ValueError:
+                pass
+            self._previous_handler = None
+
+    def _on_signal(self, signum, frame):
+        self._signalled = True
+
+    def signalled(self):
+        """True once SIGTERM was received (as opposed to the cancel file appearing)."""
+        return self._signalled
+
+    def requested(self):
+        return self._signalled or bool(self.cancel_file and os.path.exists(self.cancel_file))
@@ -12,6 +12,8 @@ if __name__ == "__main__" and __package__ is None:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.path_utils import get_user_file, ensure_data_setup, get_icon_path, get_data_path, get_user_files_path
+from app.file_utils import atomic_write_json, atomic_append_text, file_lock
+from app.results_utils import get_active_run_dir
 
 # --- Constants & Theme ---
 BG_COLOR = "#1e1e1e"
@@ -346,8 +348,7 @@ class ContentImporterApp:
     def save_manifest(self, data):
         path = self.get_manifest_path()
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            atomic_write_json(path, data, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"Error saving manifest: {e}")
             messagebox.showerror("Error", f"Failed to save manifest:\n{e}")
@@ -415,79 +416,81 @@ class ContentImporterApp:
 
     def add_to_manifest(self, item_path, target_folder_key):
         """Adds file(s) to the manifest. If item_path is a directory, adds all files inside."""
-        manifest = self.load_manifest()
-        schedule = manifest.get("schedule", {})
-        phase_map = {
-            "HighPriority": "PHASE_1_NOW",
-            "LowPriority": "PHASE_2_SOON",
-            "GoalContent": "PHASE_3_LATER"
-        }
-        phase_key = phase_map.get(target_folder_key)
-        if not phase_key: return
+        with file_lock(self.get_manifest_path()):
+            manifest = self.load_manifest()
+            schedule = manifest.get("schedule", {})
+            phase_map = {
+                "HighPriority": "PHASE_1_NOW",
+                "LowPriority": "PHASE_2_SOON",
+                "GoalContent": "PHASE_3_LATER"
+            }
+            phase_key = phase_map.get(target_folder_key)
+            if not phase_key: return
 
-        if phase_key not in schedule:
-            schedule[phase_key] = []
+            if phase_key not in schedule:
+                schedule[phase_key] = []
 
-        files_to_add = []
-        if os.path.isfile(item_path):
-            files_to_add.append(item_path)
-        else:
-            for root, _, files in os.walk(item_path):
-                for f in files:
-                    files_to_add.append(os.path.join(root, f))
+            files_to_add = []
+            if os.path.isfile(item_path):
+                files_to_add.append(item_path)
+            else:
+                for root, _, files in os.walk(item_path):
+                    for f in files:
+                        files_to_add.append(os.path.join(root, f))
 
-        changed = False
-        for fpath in files_to_add:
-            if not self.is_content_file(fpath): continue
+            changed = False
+            for fpath in files_to_add:
+                if not self.is_content_file(fpath): continue
 
-            # Calculate physical_path relative to data_root
-            rel = os.path.relpath(fpath, self.data_root).replace("\\", "/")
+                # Calculate physical_path relative to data_root
+                rel = os.path.relpath(fpath, self.data_root).replace("\\", "/")
             
-            # Check if already exists in target phase
-            if any(e.get("physical_path") == rel for e in schedule[phase_key]):
-                continue
+                # Check if already exists in target phase
+                if any(e.get("physical_path") == rel for e in schedule[phase_key]):
+                    continue
                 
-            parts = rel.split("/")
-            # parent_folder is everything between bucket and file
-            hierarchy = parts[1:-1] if len(parts) > 2 else []
-            buckets = ["HighPriority", "LowPriority", "GoalContent"]
-            if hierarchy and hierarchy[0] in buckets:
-                hierarchy = hierarchy[1:]
-            parent_folder = "/".join(hierarchy)
-
-            entry = {
-                "title": os.path.basename(fpath),
-                "physical_path": rel,
-                "parent_folder": parent_folder,
-                "origin_source": "Manual Import",
-                "type": "File",
-                "status": "New"
-            }
-            schedule[phase_key].append(entry)
-            changed = True
+                parts = rel.split("/")
+                # parent_folder is everything between bucket and file
+                hierarchy = parts[1:-1] if len(parts) > 2 else []
+                buckets = ["HighPriority", "LowPriority", "GoalContent"]
+                if hierarchy and hierarchy[0] in buckets:
+                    hierarchy = hierarchy[1:]
+                parent_folder = "/".join(hierarchy)
+
+                entry = {
+                    "title": os.path.basename(fpath),
+                    "physical_path": rel,
+                    "parent_folder": parent_folder,
+                    "origin_source": "Manual Import",
+                    "type": "File",
+                    "status": "New"
+                }
+                schedule[phase_key].append(entry)
+                changed = True
 
-        if changed:
-            manifest["schedule"] = schedule
-            self.save_manifest(manifest)
+            if changed:
+                manifest["schedule"] = schedule
+                self.save_manifest(manifest)
 
     def remove_from_manifest(self, item_path):
         """Removes an item from all manifest phase lists."""
-        manifest = self.load_manifest()
-        schedule = manifest.get("schedule", {})
-        rel_path = self._normalize_path(item_path)
-        
-        changed = False
-        for phase in ["PHASE_1_NOW", "PHASE_2_SOON", "PHASE_3_LATER"]:
-            if phase in schedule:
-                original_len = len(schedule[phase])
-                schedule[phase] = [e for e in schedule[phase] if e.get("physical_path") != rel_path]
-                if len(schedule[phase]) != original_len:
-                    changed = True
+        with file_lock(self.get_manifest_path()):
+            manifest = self.load_manifest()
+            schedule = manifest.get("schedule", {})
+            rel_path = self._normalize_path(item_path)
+        
+            changed = False
+            for phase in ["PHASE_1_NOW", "PHASE_2_SOON", "PHASE_3_LATER"]:
+                if phase in schedule:
+                    original_len = len(schedule[phase])
+                    schedule[phase] = [e for e in schedule[phase] if e.get("physical_path") != rel_path]
+                    if len(schedule[phase]) != original_len:
+                        changed = True
         
-        if changed:
-            manifest["schedule"] = schedule
-            self.save_manifest(manifest)
-            self.refresh_file_list()
+            if changed:
+                manifest["schedule"] = schedule
+                self.save_manifest(manifest)
+                self.refresh_file_list()
 
     def _get_manifest_indices_for_items(self, schedule_list, items, base_dir=None):
         """Returns a sorted list of manifest indices for given paths or GROUP: names."""
@@ -515,149 +518,151 @@ class ContentImporterApp:
 
     def move_manifest_items_relative(self, items, target_path, position="after"):
         """Moves items to be immediately before or after the target_path in the manifest."""
-        manifest = self.load_manifest()
-        schedule = manifest.get("schedule", {})
+        with file_lock(self.get_manifest_path()):
+            manifest = self.load_manifest()
+            schedule = manifest.get("schedule", {})
         
-        target_folder = self.target_folder_var.get()
-        phase_map = {
-            "HighPriority": "PHASE_1_NOW",
-            "LowPriority": "PHASE_2_SOON",
-            "GoalContent": "PHASE_3_LATER"
-        }
-        phase_key = phase_map.get(target_folder)
-        if not phase_key or phase_key not in schedule: return
+            target_folder = self.target_folder_var.get()
+            phase_map = {
+                "HighPriority": "PHASE_1_NOW",
+                "LowPriority": "PHASE_2_SOON",
+                "GoalContent": "PHASE_3_LATER"
+            }
+            phase_key = phase_map.get(target_folder)
+            if not phase_key or phase_key not in schedule: return
 
-        lst = schedule[phase_key]
+            lst = schedule[phase_key]
         
-        # Resolve indices
-        indices_to_move = self._get_manifest_indices_for_items(lst, items, self.get_current_dir())
-        if not indices_to_move: return
+            # Resolve indices
+            indices_to_move = self._get_manifest_indices_for_items(lst, items, self.get_current_dir())
+            if not indices_to_move: return
         
-        # Resolve Target Index
-        target_rel = self._normalize_path(target_path)
-        target_indices = self._get_manifest_indices_for_items(lst, [target_path], self.get_current_dir())
+            # Resolve Target Index
+            target_rel = self._normalize_path(target_path)
+            target_indices = self._get_manifest_indices_for_items(lst, [target_path], self.get_current_dir())
         
-        if not target_indices: return
-        # Target could be a folder (multiple indices).
-        # If "before", target the first index.
-        # If "after", target the last index.
+            if not target_indices: return
+            # Target could be a folder (multiple indices).
+            # If "before", target the first index.
+            # If "after", target the last index.
         
-        if position == "before":
-            eff_target_idx = target_indices[0]
-        else:
-            eff_target_idx = target_indices[-1]
+            if position == "before":
+                eff_target_idx = target_indices[0]
+            else:
+                eff_target_idx = target_indices[-1]
             
-        # Extract Items
-        moving_items = [lst[i] for i in indices_to_move]
-        
-        # Remove from list (reverse to keep indices valid)
-        # Note: Removing items might shift eff_target_idx!
-        # We must adjust eff_target_idx for every removed item that was *before* it.
-        
-        shift_adj = 0
-        for i in reversed(indices_to_move):
-            if i < eff_target_idx:
-                shift_adj += 1
-            del lst[i]
+            # Extract Items
+            moving_items = [lst[i] for i in indices_to_move]
+        
+            # Remove from list (reverse to keep indices valid)
+            # Note: Removing items might shift eff_target_idx!
+            # We must adjust eff_target_idx for every removed item that was *before* it.
+        
+            shift_adj = 0
+            for i in reversed(indices_to_move):
+                if i < eff_target_idx:
+                    shift_adj += 1
+                del lst[i]
             
-        eff_target_idx -= shift_adj
+            eff_target_idx -= shift_adj
         
-        # Insert
-        if position == "before":
-            insert_idx = eff_target_idx
-        else:
-            insert_idx = eff_target_idx + 1
+            # Insert
+            if position == "before":
+                insert_idx = eff_target_idx
+            else:
+                insert_idx = eff_target_idx + 1
             
-        for item in reversed(moving_items):
-            lst.insert(insert_idx, item)
+            for item in reversed(moving_items):
+                lst.insert(insert_idx, item)
 
-        manifest["schedule"] = schedule
-        self.save_manifest(manifest)
+            manifest["schedule"] = schedule
+            self.save_manifest(manifest)
         self.refresh_file_list()
 
     def move_items_in_manifest(self, items, direction):
         """Moves selected items (files/folders) up or down relative to other visible items in the current folder."""
-        manifest = self.load_manifest()
-        schedule = manifest.get("schedule", {})
+        with file_lock(self.get_manifest_path()):
+            manifest = self.load_manifest()
+            schedule = manifest.get("schedule", {})
         
-        target_folder = self.target_folder_var.get()
-        phase_map = {
-            "HighPriority": "PHASE_1_NOW",
-            "LowPriority": "PHASE_2_SOON",
-            "GoalContent": "PHASE_3_LATER"
-        }
-        phase_key = phase_map.get(target_folder)
-        if not phase_key or phase_key not in schedule: return
-
-        lst = schedule[phase_key]
-        indices_to_move = self._get_manifest_indices_for_items(lst, items, self.get_current_dir())
-        # Identify "visible" indices (items in current bucket)
-        # current_folder is the bucket name (e.g., "HighPriority")
-        current_bucket = self.target_folder_var.get()
-        visible_indices = []
-        for i, entry in enumerate(lst):
-            p = entry.get("physical_path", "")
-            # Items are visible if they are in the current bucket
-            if p.startswith(current_bucket + "/"):
-                visible_indices.append(i)
-        visible_indices.sort()
-        
-        if direction == "up":
-            first_moving = indices_to_move[0]
-            # Find the closest visible index BEFORE our block
-            target_idx = -1
-            for idx in reversed(visible_indices):
-                if idx < first_moving:
-                    target_idx = idx
-                    break
+            target_folder = self.target_folder_var.get()
+            phase_map = {
+                "HighPriority": "PHASE_1_NOW",
+                "LowPriority": "PHASE_2_SOON",
+                "GoalContent": "PHASE_3_LATER"
+            }
+            phase_key = phase_map.get(target_folder)
+            if not phase_key or phase_key not in schedule: return
+
+            lst = schedule[phase_key]
+            indices_to_move = self._get_manifest_indices_for_items(lst, items, self.get_current_dir())
+            # Identify "visible" indices (items in current bucket)
+            # current_folder is the bucket name (e.g., "HighPriority")
+            current_bucket = self.target_folder_var.get()
+            visible_indices = []
+            for i, entry in enumerate(lst):
+                p = entry.get("physical_path", "")
+                # Items are visible if they are in the current bucket
+                if p.startswith(current_bucket + "/"):
+                    visible_indices.append(i)
+            visible_indices.sort()
+        
+            if direction == "up":
+                first_moving = indices_to_move[0]
+                # Find the closest visible index BEFORE our block
+                target_idx = -1
+                for idx in reversed(visible_indices):
+                    if idx < first_moving:
+                        target_idx = idx
+                        break
             
-            if target_idx != -1:
-                # Group-Awareness: Only jump to the boundary if moving BETWEEN groups.
-                # If moving WITHIN the same group, move by one item only.
-                target_parent = lst[target_idx].get("parent_folder", "")
-                moving_parent = lst[indices_to_move[0]].get("parent_folder", "")
+                if target_idx != -1:
+                    # Group-Awareness: Only jump to the boundary if moving BETWEEN groups.
+                    # If moving WITHIN the same group, move by one item only.
+                    target_parent = lst[target_idx].get("parent_folder", "")
+                    moving_parent = lst[indices_to_move[0]].get("parent_folder", "")
                 
-                if target_parent and target_parent != moving_parent:
-                    # Find the START of that target group
-                    while target_idx > 0 and lst[target_idx-1].get("parent_folder") == target_parent:
-                        if target_idx - 1 not in visible_indices: break # Safety
-                        target_idx -= 1
+                    if target_parent and target_parent != moving_parent:
+                        # Find the START of that target group
+                        while target_idx > 0 and lst[target_idx-1].get("parent_folder") == target_parent:
+                            if target_idx - 1 not in visible_indices: break # Safety
+                            target_idx -= 1
                 
-                moving_items = [lst[i] for i in indices_to_move]
-                for i in reversed(indices_to_move): del lst[i]
-                for item in reversed(moving_items): lst.insert(target_idx, item)
+                    moving_items = [lst[i] for i in indices_to_move]
+                    for i in reversed(indices_to_move): del lst[i]
+                    for item in reversed(moving_items): lst.insert(target_idx, item)
                     
-        elif direction == "down":
-            last_moving = indices_to_move[-1]
-            target_idx = -1
-            for idx in visible_indices:
-                if idx > last_moving:
-                    target_idx = idx
-                    break
+            elif direction == "down":
+                last_moving = indices_to_move[-1]
+                target_idx = -1
+                for idx in visible_indices:
+                    if idx > last_moving:
+                        target_idx = idx
+                        break
             
-            if target_idx != -1:
-                # Group-Awareness: Only jump to boundary if moving BETWEEN groups
-                target_parent = lst[target_idx].get("parent_folder", "")
-                moving_parent = lst[indices_to_move[-1]].get("parent_folder", "") # Use last for down
+                if target_idx != -1:
+                    # Group-Awareness: Only jump to boundary if moving BETWEEN groups
+                    target_parent = lst[target_idx].get("parent_folder", "")
+                    moving_parent = lst[indices_to_move[-1]].get("parent_folder", "") # Use last for down
                 
-                if target_parent and target_parent != moving_parent:
-                    # Find the END of that target group
-                    while target_idx < len(lst) - 1 and lst[target_idx+1].get("parent_folder") == target_parent:
-                        if target_idx + 1 not in visible_indices: break
-                        target_idx += 1
+                    if target_parent and target_parent != moving_parent:
+                        # Find the END of that target group
+                        while target_idx < len(lst) - 1 and lst[target_idx+1].get("parent_folder") == target_parent:
+                            if target_idx + 1 not in visible_indices: break
+                            target_idx += 1
                 
-                moving_items = [lst[i] for i in indices_to_move]
-                for i in reversed(indices_to_move): del lst[i]
+                    moving_items = [lst[i] for i in indices_to_move]
+                    for i in reversed(indices_to_move): del lst[i]
                 
-                # new_insertion_point = target_idx - len(indices_to_move) + 1
-                # To be simpler: insert after old target_idx
-                # (which is now target_idx - len(moving) if target was after moving)
-                insert_pos = target_idx - len(moving_items) + 1
-                for item in reversed(moving_items):
-                    lst.insert(insert_pos, item)
-
-        manifest["schedule"] = schedule
-        self.save_manifest(manifest)
+                    # new_insertion_point = target_idx - len(indices_to_move) + 1
+                    # To be simpler: insert after old target_idx
+                    # (which is now target_idx - len(moving) if target was after moving)
+                    insert_pos = target_idx - len(moving_items) + 1
+                    for item in reversed(moving_items):
+                        lst.insert(insert_pos, item)
+
+            manifest["schedule"] = schedule
+            self.save_manifest(manifest)
         self.refresh_file_list()
 
     def refresh_file_list(self):
@@ -744,72 +749,73 @@ class ContentImporterApp:
 
     def _sync_disk_to_manifest(self):
         """Scans the 3 main data folders and ensures any untracked files are added to the manifest."""
-        manifest = self.load_manifest()
-        schedule = manifest.get("schedule", { "PHASE_1_NOW": [], "PHASE_2_SOON": [], "PHASE_3_LATER": [] })
-        
-        # Build lookup set of existing physical paths across all phases
-        existing_paths = set()
-        changed = False
-        for p_key in ["PHASE_1_NOW", "PHASE_2_SOON", "PHASE_3_LATER"]:
-            entries = schedule.get(p_key, [])
-            # Prune obsolete 'Folder' types while we are here
-            clean_entries = [e for e in entries if e.get("type") != "Folder"]
-            if len(clean_entries) != len(entries):
-                schedule[p_key] = clean_entries
-                changed = True
+        with file_lock(self.get_manifest_path()):
+            manifest = self.load_manifest()
+            schedule = manifest.get("schedule", { "PHASE_1_NOW": [], "PHASE_2_SOON": [], "PHASE_3_LATER": [] })
+        
+            # Build lookup set of existing physical paths across all phases
+            existing_paths = set()
+            changed = False
+            for p_key in ["PHASE_1_NOW", "PHASE_2_SOON", "PHASE_3_LATER"]:
+                entries = schedule.get(p_key, [])
+                # Prune obsolete 'Folder' types while we are here
+                clean_entries = [e for e in entries if e.get("type") != "Folder"]
+                if len(clean_entries) != len(entries):
+                    schedule[p_key] = clean_entries
+                    changed = True
                 
-            for entry in clean_entries:
-                p = entry.get("physical_path")
-                if p: existing_paths.add(p)
-        phase_lookup = {
-            "HighPriority": "PHASE_1_NOW",
-            "LowPriority": "PHASE_2_SOON",
-            "GoalContent": "PHASE_3_LATER"
-        }
+                for entry in clean_entries:
+                    p = entry.get("physical_path")
+                    if p: existing_paths.add(p)
+            phase_lookup = {
+                "HighPriority": "PHASE_1_NOW",
+                "LowPriority": "PHASE_2_SOON",
+                "GoalContent": "PHASE_3_LATER"
+            }
         
-        for folder, p_key in phase_lookup.items():
-            abs_dir = os.path.join(self.data_root, folder)
-            if not os.path.exists(abs_dir): continue
+            for folder, p_key in phase_lookup.items():
+                abs_dir = os.path.join(self.data_root, folder)
+                if not os.path.exists(abs_dir): continue
             
-            # Walk disk
-            for root, dirs, files in os.walk(abs_dir):
-                # Filter out manifest and meta files
-                for item in dirs + files:
-                    if item in ["master_manifest.json", "_order.json", "desktop.ini"]:
-                        continue
+                # Walk disk
+                for root, dirs, files in os.walk(abs_dir):
+                    # Filter out manifest and meta files
+                    for item in dirs + files:
+                        if item in ["master_manifest.json", "_order.json", "desktop.ini"]:
+                            continue
                         
-                    fpath = os.path.join(root, item)
-                    rel = os.path.relpath(fpath, self.data_root).replace("\\", "/")
+                        fpath = os.path.join(root, item)
+                        rel = os.path.relpath(fpath, self.data_root).replace("\\", "/")
                     
-                    if rel not in existing_paths:
-                        if os.path.isdir(fpath): continue
-                        if not self.is_content_file(item): continue
-
-                        # New file found! Add to current phase
-                        parts = rel.split("/")
-                        # parent_folder is the hierarchy between bucket and file
-                        hierarchy = parts[1:-1] if len(parts) > 2 else []
-                        buckets = ["HighPriority", "LowPriority", "GoalContent"]
-                        if hierarchy and hierarchy[0] in buckets:
-                            hierarchy = hierarchy[1:]
-                        parent_folder = "/".join(hierarchy)
+                        if rel not in existing_paths:
+                            if os.path.isdir(fpath): continue
+                            if not self.is_content_file(item): continue
+
+                            # New file found! Add to current phase
+                            parts = rel.split("/")
+                            # parent_folder is the hierarchy between bucket and file
+                            hierarchy = parts[1:-1] if len(parts) > 2 else []
+                            buckets = ["HighPriority", "LowPriority", "GoalContent"]
+                            if hierarchy and hierarchy[0] in buckets:
+                                hierarchy = hierarchy[1:]
+                            parent_folder = "/".join(hierarchy)
                         
-                        entry = {
-                            "title": item,
-                            "physical_path": rel,
-                            "parent_folder": parent_folder,
-                            "origin_source": "Disk Sync",
-                            "type": "File",
-                            "status": "New"
-                        }
-                        if p_key not in schedule: schedule[p_key] = []
-                        schedule[p_key].append(entry)
-                        existing_paths.add(rel)
-                        changed = True
-        
-        if changed:
-            manifest["schedule"] = schedule
-            self.save_manifest(manifest)
+                            entry = {
+                                "title": item,
+                                "physical_path": rel,
+                                "parent_folder": parent_folder,
+                                "origin_source": "Disk Sync",
+                                "type": "File",
+                                "status": "New"
+                            }
+                            if p_key not in schedule: schedule[p_key] = []
+                            schedule[p_key].append(entry)
+                            existing_paths.add(rel)
+                            changed = True
+        
+            if changed:
+                manifest["schedule"] = schedule
+                self.save_manifest(manifest)
 
     def get_tree_count(self, parent):
         count = 0
@@ -987,7 +993,8 @@ class ContentImporterApp:
             try:
                 # data_root is data/<lang>
                 project_root = os.path.dirname(os.path.dirname(self.data_root))
-                stats_path = os.path.join(project_root, "results", "word_stats.json")
+                run_dir = get_active_run_dir(os.path.join(project_root, "results"), self.language)
+                stats_path = os.path.join(run_dir, "word_stats.json")
                 if os.path.exists(stats_path):
                     with open(stats_path, 'r', encoding='utf-8') as f:
                         stats = json.load(f)
@@ -1032,10 +1039,9 @@ class ContentImporterApp:
                         
                         rel_path = os.path.relpath(source_path, self.data_root).replace("\\", "/")
                         grad_list_path = os.path.join(user_files_dir, "GraduatedList.txt")
-                        with open(grad_list_path, 'a', encoding='utf-8') as f:
-                            f.write(f"\n# Source: {rel_path} ({len(file_words)} words graduated)\n")
-                            for w in file_words:
-                                f.write(f"{w}\n")
+                        block = f"\n# Source: {rel_path} ({len(file_words)} words graduated)\n"
+                        block += "".join(f"{w}\n" for w in file_words)
+                        atomic_append_text(grad_list_path, block)
                         words_graduated += len(file_words)
 
                 # Calculate relative path within source bucket to preserve hierarchy
@@ -1241,81 +1247,82 @@ class ContentImporterApp:
             
         try:
             # 1. Clear existing manifest schedule but keep metadata
-            manifest = self.load_manifest()
-            manifest["schedule"] = {
-                "PHASE_1_NOW": [],
-                "PHASE_2_SOON": [],
-                "PHASE_3_LATER": []
-            }
+            with file_lock(self.get_manifest_path()):
+                manifest = self.load_manifest()
+                manifest["schedule"] = {
+                    "PHASE_1_NOW": [],
+                    "PHASE_2_SOON": [],
+                    "PHASE_3_LATER": []
+                }
             
-            # 2. Re-scan all folders
-            phase_map = {
-                "HighPriority": "PHASE_1_NOW",
-                "LowPriority": "PHASE_2_SOON",
-                "GoalContent": "PHASE_3_LATER"
-            }
+                # 2. Re-scan all folders
+                phase_map = {
+                    "HighPriority": "PHASE_1_NOW",
+                    "LowPriority": "PHASE_2_SOON",
+                    "GoalContent": "PHASE_3_LATER"
+                }
             
-            for folder, p_key in phase_map.items():
-                abs_dir = os.path.join(self.data_root, folder)
-                if not os.path.exists(abs_dir): continue
+                for folder, p_key in phase_map.items():
+                    abs_dir = os.path.join(self.data_root, folder)
+                    if not os.path.exists(abs_dir): continue
                 
-                # Use a custom sorter to respect any lingering _order.json if possible, 
-                # or just natural alphabetical.
-                def get_ordered_level(directory):
-                    items = os.listdir(directory)
-                    # Filter
-                    items = [i for i in items if i not in ["_order.json", "master_manifest.json", "desktop.ini"]]
+                    # Use a custom sorter to respect any lingering _order.json if possible, 
+                    # or just natural alphabetical.
+                    def get_ordered_level(directory):
+                        items = os.listdir(directory)
+                        # Filter
+                        items = [i for i in items if i not in ["_order.json", "master_manifest.json", "desktop.ini"]]
                     
-                    # Check for _order.json
-                    order_file = os.path.join(directory, "_order.json")
-                    if os.path.exists(order_file):
-                        try:
-                            with open(order_file, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                order = data if isinstance(data, list) else data.get("order", [])
-                                rank_map = {name: i for i, name in enumerate(order)}
-                                items.sort(key=lambda x: (rank_map.get(x, 9999), x.lower()))
-                        except:
+                        # Check for _order.json
+                        order_file = os.path.join(directory, "_order.json")
+                        if os.path.exists(order_file):
+                            try:
+                                with open(order_file, 'r', encoding='utf-8') as f:
+                                    data = json.load(f)
+                                    order = data if isinstance(data, list) else data.get("order", [])
+                                    rank_map = {name: i for i, name in enumerate(order)}
+                                    items.sort(key=lambda x: (rank_map.get(x, 9999), x.lower()))
+                            except:
+                                items.sort(key=lambda x: x.lower())
+                        else:
                             items.sort(key=lambda x: x.lower())
-                    else:
-                        items.sort(key=lambda x: x.lower())
-                    return items
+                        return items
 
-                def walk_and_add(directory):
-                    items = get_ordered_level(directory)
-                    for item in items:
-                        fpath = os.path.join(directory, item)
-                        rel = os.path.relpath(fpath, self.data_root).replace("\\", "/")
+                    def walk_and_add(directory):
+                        items = get_ordered_level(directory)
+                        for item in items:
+                            fpath = os.path.join(directory, item)
+                            rel = os.path.relpath(fpath, self.data_root).replace("\\", "/")
                         
-                        if os.path.isdir(fpath):
-                            walk_and_add(fpath)
-                            continue
+                            if os.path.isdir(fpath):
+                                walk_and_add(fpath)
+                                continue
                             
-                        if not self.is_content_file(item): continue
+                            if not self.is_content_file(item): continue
                         
-                        parts = rel.split("/")
-                        # parent_folder is the hierarchy between bucket and file
-                        hierarchy = parts[1:-1] if len(parts) > 2 else []
-                        buckets = ["HighPriority", "LowPriority", "GoalContent"]
-                        if hierarchy and hierarchy[0] in buckets:
-                            hierarchy = hierarchy[1:]
-                        parent_folder = "/".join(hierarchy)
+                            parts = rel.split("/")
+                            # parent_folder is the hierarchy between bucket and file
+                            hierarchy = parts[1:-1] if len(parts) > 2 else []
+                            buckets = ["HighPriority", "LowPriority", "GoalContent"]
+                            if hierarchy and hierarchy[0] in buckets:
+                                hierarchy = hierarchy[1:]
+                            parent_folder = "/".join(hierarchy)
                         
-                        # Add to manifest
-                        entry = {
-                            "title": item,
-                            "physical_path": rel,
-                            "parent_folder": parent_folder,
-                            "origin_source": "Reset",
-                            "type": "File",
-                            "status": "New"
-                        }
-                        manifest["schedule"][p_key].append(entry)
-
-                walk_and_add(abs_dir)
-
-            # 3. Save and Refresh
-            self.save_manifest(manifest)
+                            # Add to manifest
+                            entry = {
+                                "title": item,
+                                "physical_path": rel,
+                                "parent_folder": parent_folder,
+                                "origin_source": "Reset",
+                                "type": "File",
+                                "status": "New"
+                            }
+                            manifest["schedule"][p_key].append(entry)
+
+                    walk_and_add(abs_dir)
+
+                # 3. Save and Refresh
+                self.save_manifest(manifest)
             self.refresh_file_list()
             messagebox.showinfo("Success", "Library manifest regenerated from disk.")
             
@@ -1354,7 +1361,9 @@ class ContentImporterApp:
         try:
             # project_root is two levels up from data/<lang>
             project_root = os.path.dirname(os.path.dirname(self.data_root))
-            stats_path = os.path.join(project_root, "results", "word_stats.json")
+            # The active result of this language (results/ may hold another language's run)
+            run_dir = get_active_run_dir(os.path.join(project_root, "results"), self.language)
+            stats_path = os.path.join(run_dir, "word_stats.json")
             
             if not os.path.exists(stats_path):
                 self.analyzed_filenames = set()
@@ -0,0 +1,283 @@
+"""
+Builds a frequency list (frequency_list_<lang>_<name>.csv, columns Word,Rank) from a corpus,
+using the analyzer's own tokenizers so the lemmas match what the analyzer looks up.
+
+Corpora can be much larger than memory:
+- Text files are streamed in blocks of ~256k characters (cut after a newline) and tokenized in a process pool.
+- At most --max-terms distinct lemmas are counted in memory; beyond that the partial counts
+  are spilled to disk as term-sorted runs and merged at the end.
+- Ranking sorts the merged counts the same way (spilled runs ordered by count), so the whole
+  vocabulary never has to be in memory at once either.
+
+Usage:
+    python app/corpus_frequency.py --language ja --name Novels "D:/Corpus/Novels" more.txt
+"""
+import os
+import sys
+import csv
+import time
+import heapq
+import argparse
+import itertools
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Ensure package root is in sys.path
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.path_utils import get_user_files_path, SUPPORTED_LANGUAGES
+from app.file_utils import atomic_write
+from app.jieba_utils import split_blocks
+from app.analyzer import make_tokenizer
+
+# Same file types the analyzer picks up from the data folders
+CORPUS_EXTENSIONS = ('.txt', '.srt', '.epub', '.ass', '.html')
+# Read as plain text by the analyzer too, so they can be streamed instead of loaded whole
+STREAMED_EXTENSIONS = ('.txt', '.html')
+# Characters per block handed to a worker. MeCab crashes outright on single inputs of a few MB
+# (about 2.5 MB of UTF-8 here), so blocks stay well below that even with a carried-over line.
+BLOCK_CHARS = 1 << 18
+# Distinct lemmas counted in memory before spilling (roughly 100-150 MB)
+DEFAULT_MAX_TERMS = 1000000
+
+# Tokenizer of this worker process (see _init_worker)
+_tokenizer = None
+
+
+def _init_worker(language, reinforce):
+    global _tokenizer
+    _tokenizer = make_tokenizer(language, reinforce)
+
+
+def count_block(text, tokenizer=None):
+    """Lemma counts of one block of text."""
+    tokenizer = tokenizer or _tokenizer
+    return Counter(lemma for lemma, _, _ in tokenizer.tokenize(text))
+
+
+def find_corpus_files(paths):
+    """Files given directly, plus every corpus file below the given folders (sorted)."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(CORPUS_EXTENSIONS):
+                        found.append(os.path.join(root, name))
+        elif os.path.isfile(path):
+            found.append(path)
+        else:
+            print(f"Warning: Not found: {path}")
+    return found
+
+
+def iter_text_blocks(path, language='ja', block_chars=BLOCK_CHARS):
+    """Yields the text of a file in blocks of about block_chars characters."""
+    if not path.lower().endswith(STREAMED_EXTENSIONS):
+        # Subtitles/EPUBs need the analyzer's extraction (and are small enough to load)
+        from app.analyzer import extract_text
+        text = extract_text(path, language)
+        if text:
+            yield from split_blocks(text, block_chars)
+        return
+
+    carry = ""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            chunk = f.read(block_chars)
+            if not chunk:
+                break
+            text = carry + chunk
+            # Cut after the last newline so no word straddles two blocks
+            # (a block without any newline is cut where it ends)
+            cut = text.rfind("\n") + 1 or len(text)
+            carry = text[cut:]
+            yield text[:cut]
+    if carry:
+        yield carry
+
+
+def _write_run(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(rows)
+
+
+def _read_run(path, parse):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            yield parse(row)
+
+
+def _term_row(row):
+    return row[0], int(row[1])
+
+
+def _rank_row(row):
+    return int(row[0]), row[1]
+
+
+class SpillingCounter:
+    """
+    Counter with a cap on distinct keys: once more than max_terms are held, the counts
+    are written to spill_dir as a term-sorted run and counting starts over.
+    """
+    def __init__(self, spill_dir, max_terms=DEFAULT_MAX_TERMS):
+        self.spill_dir = spill_dir
+        self.max_terms = max(1, max_terms)
+        self.counts = Counter()
+        self.runs = []
+
+    def update(self, counts):
+        self.counts.update(counts)
+        if len(self.counts) > self.max_terms:
+            self.spill()
+
+    def spill(self):
+        path = os.path.join(self.spill_dir, f"counts_{len(self.runs) + 1}.csv")
+        _write_run(path, sorted(self.counts.items()))
+        self.runs.append(path)
+        print(f"  Spilled {len(self.counts)} lemmas to disk (run {len(self.runs)})")
+        self.counts = Counter()
+
+    def items(self):
+        """(term, total count) over everything counted, in term order."""
+        streams = [_read_run(path, _term_row) for path in self.runs]
+        streams.append(iter(sorted(self.counts.items())))
+        merged = heapq.merge(*streams)
+        for term, group in itertools.groupby(merged, key=lambda item: item[0]):
+            yield term, sum(count for _, count in group)
+
+
+def rank_terms(items, spill_dir, max_terms=DEFAULT_MAX_TERMS, min_count=1):
+    """
+    Yields (term, count) from most to least frequent (ties by term), holding at most
+    max_terms of them in memory; larger vocabularies are sorted in spilled runs.
+    """
+    runs = []
+    chunk = []
+    for term, count in items:
+        if count < min_count:
+            continue
+        chunk.append((-count, term))
+        if len(chunk) >= max_terms:
+            chunk.sort()
+            path = os.path.join(spill_dir, f"ranked_{len(runs) + 1}.csv")
+            _write_run(path, chunk)
+            runs.append(path)
+            chunk = []
+    chunk.sort()
+    streams = [_read_run(path, _rank_row) for path in runs] + [iter(chunk)]
+    for neg_count, term in heapq.merge(*streams):
+        yield term, -neg_count
+
+
+def count_corpus(files, language='ja', workers=1, counter=None, reinforce=False, block_chars=BLOCK_CHARS):
+    """
+    Tokenizes every file and adds its lemma counts to `counter` (a SpillingCounter).
+    With workers > 1 blocks are tokenized in a process pool; only a few blocks per
+    worker are in flight, so memory stays flat however large the corpus is.
+    Returns the number of tokens counted.
+    """
+    tokens = 0
+    started = time.monotonic()
+
+    def blocks():
+        for i, path in enumerate(files, start=1):
+            try:
+                print(f"[{i}/{len(files)}] {os.path.basename(path)}")
+            except UnicodeEncodeError:
+                print(f"[{i}/{len(files)}] (name contains non-ASCII characters)")
+            yield from iter_text_blocks(path, language, block_chars)
+
+    def add(counts):
+        nonlocal tokens
+        tokens += sum(counts.values())
+        counter.update(counts)
+
+    if workers < 2:
+        tokenizer = make_tokenizer(language, reinforce)
+        for block in blocks():
+            add(count_block(block, tokenizer))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(language, reinforce)) as pool:
+            pending = deque()
+            for block in blocks():
+                pending.append(pool.submit(count_block, block))
+                if len(pending) >= workers * 2:
+                    add(pending.popleft().result())
+            while pending:
+                add(pending.popleft().result())
+
+    elapsed = max(time.monotonic() - started, 1e-6)
+    print(f"Counted {tokens} tokens in {elapsed:.1f}s ({tokens / elapsed:.0f} tokens/s)")
+    return tokens
+
+
+def write_frequency_list(ranked, output_path):
+    """Writes Word,Rank rows (rank = position in the list); returns the number of words."""
+    written = 0
+    # Plain UTF-8 (no BOM): the analyzer reads the header as "Word"
+    with atomic_write(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Word", "Rank"])
+        for rank, (term, _) in enumerate(ranked, start=1):
+            writer.writerow([term, rank])
+            written = rank
+    return written
+
+
+def build_frequency_list(paths, output_path, language='ja', workers=None, max_terms=DEFAULT_MAX_TERMS,
+                         min_count=1, top=0, reinforce=False, block_chars=BLOCK_CHARS):
+    """Counts the corpus and writes the ranked CSV. Returns the number of words written."""
+    files = find_corpus_files(paths)
+    if not files:
+        raise ValueError("No corpus files found (.txt, .srt, .ass, .epub, .html)")
+    workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+    print(f"Building {language} frequency list from {len(files)} file(s) with {workers} worker(s)...")
+
+    with tempfile.TemporaryDirectory(prefix="surasura_corpus_") as spill_dir:
+        counter = SpillingCounter(spill_dir, max_terms)
+        if not count_corpus(files, language, workers, counter, reinforce, block_chars):
+            raise ValueError("No words found in the corpus files")
+
+        ranked = rank_terms(counter.items(), spill_dir, max_terms, min_count)
+        if top > 0:
+            ranked = itertools.islice(ranked, top)
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        written = write_frequency_list(ranked, output_path)
+
+    print(f"Saved {written} words to {output_path}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a frequency list from a corpus")
+    parser.add_argument("paths", nargs="+", help="Corpus files or folders (searched recursively)")
+    parser.add_argument("--language", default="ja", help="Target language (ja, zh)")
+    parser.add_argument("--name", default="Corpus", help="List name: saved as User Files/<lang>/frequency_list_<lang>_<name>.csv")
+    parser.add_argument("--output", default=None, help="Write the CSV here instead")
+    parser.add_argument("--workers", type=int, default=0, help="Tokenizer processes (default 0 = all cores)")
+    parser.add_argument("--max-terms", type=int, default=DEFAULT_MAX_TERMS, help="Distinct lemmas kept in memory before spilling to disk")
+    parser.add_argument("--min-count", type=int, default=1, help="Leave out lemmas seen fewer times than this")
+    parser.add_argument("--top", type=int, default=0, help="Keep only the N most frequent lemmas (0 = all)")
+    parser.add_argument("--reinforce", action="store_true", help="Chinese: split common collocations (same as the analyzer's --reinforce)")
+    args = parser.parse_args()
+
+    if args.language not in SUPPORTED_LANGUAGES:
+        parser.error(f"Unsupported language: {args.language}")
+    output = args.output or os.path.join(get_user_files_path(args.language),
+                                         f"frequency_list_{args.language}_{args.name}.csv")
+    try:
+        build_frequency_list(args.paths, output, language=args.language, workers=args.workers,
+                             max_terms=args.max_terms, min_count=args.min_count, top=args.top,
+                             reinforce=args.reinforce)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ except ImportError:
     pass
 
 from app.path_utils import get_user_file, get_data_path
-from app.anki_utils import load_anki_data, extract_field_text, cleanup_temp_dir
+from app.anki_utils import load_anki_data, extract_field_text, close_notes
 from app import settings_manager
 
 # --- Configuration ---
@@ -51,7 +51,6 @@ class FileImporterApp:
         self.anki_notes = []
         self.anki_fields = []
         self.anki_model_map = {}
-        self.anki_temp_dir = None
         
         # Set Application Icon
         try:
@@ -76,8 +75,8 @@ class FileImporterApp:
             pass
 
     def __del__(self):
-        if hasattr(self, 'anki_temp_dir') and self.anki_temp_dir:
-            cleanup_temp_dir(self.anki_temp_dir)
+        if hasattr(self, 'anki_notes'):
+            close_notes(self.anki_notes)
         
     def apply_dark_theme(self):
         # Configure general style
@@ -254,9 +253,7 @@ class FileImporterApp:
         self.update_btn_state()
 
     def clear_anki_data(self):
-        if self.anki_temp_dir:
-            cleanup_temp_dir(self.anki_temp_dir)
-            self.anki_temp_dir = None
+        close_notes(self.anki_notes)
         self.anki_notes = []
         self.anki_fields = []
         self.anki_model_map = {}
@@ -273,11 +270,11 @@ class FileImporterApp:
             self.status_var.set("Reading Anki Deck schema...")
             self.root.update_idletasks()
             
-            # Cleanup previous
-            if self.anki_temp_dir:
-                cleanup_temp_dir(self.anki_temp_dir)
+            # Release the previous deck
+            close_notes(self.anki_notes)
+            self.anki_notes = []
             
-            self.anki_fields, self.anki_notes, self.anki_model_map, self.anki_temp_dir = load_anki_data(path)
+            self.anki_fields, self.anki_notes, self.anki_model_map, _ = load_anki_data(path)
             self.anki_field_combo['values'] = self.anki_fields
             
             # Auto-select "Sentence" or "Expression" if they exist
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import time
+import stat
+import errno
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+# How long a writer waits for another process/thread to release a file before giving up
+DEFAULT_LOCK_TIMEOUT = 30.0
+LOCK_POLL_SECONDS = 0.05
+LOCK_SUFFIX = ".lock"
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLockTimeout(TimeoutError):
+    """Raised when a file stays locked by another writer for longer than the timeout."""
+    pass
+
+
+# Lock state within this process: lock path -> {"owner", "depth", "waiters"}
+# OS locks are per process (fcntl) or per handle (msvcrt), so re-entry and
+# thread exclusion within one process are handled here. Waiters are served
+# first-come first-served, so a writer in a tight loop cannot starve the others.
+_local_locks = {}
+_local_guard = threading.Condition()
+
+
+def get_lock_path(path):
+    return os.path.abspath(path) + LOCK_SUFFIX
+
+
+def is_lock_file(name):
+    return name.endswith(LOCK_SUFFIX)
+
+
+def _try_os_lock(handle):
+    try:
+        if sys.platform == "win32":
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError as e:
+        if e.errno in (errno.EACCES, errno.EAGAIN, errno.EDEADLK) or sys.platform == "win32":
+            return False
+        raise
+
+
+def _os_unlock(handle):
+    try:
+        if sys.platform == "win32":
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+
+@contextmanager
+def file_lock(path, timeout=DEFAULT_LOCK_TIMEOUT):
+    """
+    Advisory exclusive lock for `path`, held on a sibling "<path>.lock" file.
+
+    Every Surasura writer (and read-modify-write cycle) of a shared file goes through
+    this, so the analyzer, importers and dashboard never interleave their updates.
+    Re-entrant within a thread. Raises FileLockTimeout after `timeout` seconds.
+    """
+    lock_path = get_lock_path(path)
+    me = threading.get_ident()
+    deadline = time.monotonic() + timeout
+
+    # 1. Exclusion between threads of this process (and re-entry)
+    with _local_guard:
+        state = _local_locks.setdefault(lock_path, {"owner": None, "depth": 0, "waiters": deque()})
+        if state["owner"] == me:
+            state["depth"] += 1
+            reentered = True
+        else:
+            reentered = False
+            state["waiters"].append(me)
+            while state["owner"] is not None or state["waiters"][0] != me:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    state["waiters"].remove(me)
+                    _local_guard.notify_all()
+                    raise FileLockTimeout(f"Timed out waiting for lock on {path}")
+                _local_guard.wait(remaining)
+            state["waiters"].popleft()
+            state["owner"] = me
+            state["depth"] = 1
+
+    def _release_local():
+        with _local_guard:
+            state["depth"] -= 1
+            if state["depth"] == 0:
+                state["owner"] = None
+                if not state["waiters"]:
+                    _local_locks.pop(lock_path, None)
+                _local_guard.notify_all()
+
+    if reentered:
+        try:
+            yield
+        finally:
+            _release_local()
+        return
+
+    # 2. Exclusion between processes
+    handle = None
+    try:
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        handle = open(lock_path, "a+")
+        while not _try_os_lock(handle):
+            if time.monotonic() >= deadline:
+                raise FileLockTimeout(f"Timed out waiting for lock on {path} (held by another program)")
+            time.sleep(LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            _os_unlock(handle)
+    finally:
+        if handle is not None:
+            handle.close()
+        _release_local()
+
+
+def _replace(temp_path, path, deadline):
+    # On Windows a reader holding the target open makes os.replace fail briefly; retry
+    while True:
+        try:
+            os.replace(temp_path, path)
+            return
+        except PermissionError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(LOCK_POLL_SECONDS)
+
+
+@contextmanager
+def atomic_write(path, mode="w", encoding="utf-8", newline=None, timeout=DEFAULT_LOCK_TIMEOUT):
+    """
+    Opens a temp file next to `path` for writing and, if the block succeeds,
+    renames it over `path` (under file_lock). Readers see either the old or the
+    new complete file, never a truncated one. On error the original is untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with file_lock(path, timeout=timeout):
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            if "b" in mode:
+                f = os.fdopen(fd, mode)
+            else:
+                f = os.fdopen(fd, mode, encoding=encoding, newline=newline)
+            with f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates 0600 files; keep the permissions the file had (or normal ones)
+            try:
+                file_mode = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+                os.chmod(temp_path, file_mode)
+            except OSError:
+                pass
+            _replace(temp_path, path, time.monotonic() + timeout)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+def atomic_write_text(path, text, encoding="utf-8", **kwargs):
+    with atomic_write(path, "w", encoding=encoding, **kwargs) as f:
+        f.write(text)
+
+
+def atomic_write_json(path, data, timeout=DEFAULT_LOCK_TIMEOUT, **json_kwargs):
+    with atomic_write(path, "w", encoding="utf-8", timeout=timeout) as f:
+        json.dump(data, f, **json_kwargs)
+
+
+def atomic_write_csv(df, path, encoding="utf-8-sig", **to_csv_kwargs):
+    """DataFrame.to_csv through a temp file (newline='' as pandas expects for open handles)."""
+    with atomic_write(path, "w", encoding=encoding, newline="") as f:
+        df.to_csv(f, **to_csv_kwargs)
+
+
+def atomic_append_text(path, text, encoding="utf-8", timeout=DEFAULT_LOCK_TIMEOUT):
+    """Appends by rewriting the whole file atomically, so readers never see half a line."""
+    with file_lock(path, timeout=timeout):
+        existing = ""
+        if os.path.exists(path):
+            with open(path, "r", encoding=encoding, newline="") as f:
+                existing = f.read()
+        atomic_write_text(path, existing + text, encoding=encoding, newline="", timeout=timeout)
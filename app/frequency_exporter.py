@@ -6,6 +6,17 @@ import re
 import pandas as pd
 from datetime import datetime
 
+# Terms are cut at the first hyphen or whitespace ("アイリス-iris" -> "アイリス"):
+# the sanitized term is what this matches after any leading whitespace
+SANITIZED_TERM_PATTERN = r'^\s*([^-\s]*)'
+_SANITIZED_TERM_RE = re.compile(SANITIZED_TERM_PATTERN)
+# Katakana block (includes the prolonged sound mark \u30FC)
+KATAKANA_PATTERN = '[\u30A0-\u30FF]+'
+# Entries per term_meta_bank_N.json
+DEFAULT_BANK_SIZE = 10000
+# Entries encoded per json call while streaming a bank
+ENCODE_CHUNK = 2000
+
 class FrequencyExporter:
     @staticmethod
     def _sanitize_term(term):
@@ -35,54 +46,74 @@ class FrequencyExporter:
         return all(('\u30A0' <= char <= '\u30FF') or char == '\u30FC' for char in text)
 
     @staticmethod
-    def export_migaku(csv_path, save_path):
+    def _is_text_column(series):
+        # object on older pandas, the string dtype on newer ones
+        return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+    @staticmethod
+    def _load_terms(csv_path):
         """
-        Export as a simple JSON array of words.
-        Format: ["word1", "word2", ...]
+        Shared fast path of the exports: the CSV plus its sanitized terms, computed for the
+        whole column at once (same result as _sanitize_term per row; non-text cells pass through).
         """
         df = pd.read_csv(csv_path)
         if df.empty:
             raise ValueError("The source data is empty. Cannot generate frequency list.")
         if 'Word' not in df.columns:
             raise ValueError("CSV is missing 'Word' column")
-            
-        # Sanitize words
-        word_list = [FrequencyExporter._sanitize_term(w) for w in df['Word'].tolist()]
-        
+
+        # object: the column's own values, and Python's regex semantics whatever the string backend
+        words = df['Word'].astype(object)
+        if not FrequencyExporter._is_text_column(df['Word']):
+            # All numbers (or all missing): nothing to sanitize
+            return df, words
+        match = _SANITIZED_TERM_RE.match
+        sanitized = [match(w).group(1) if type(w) is str else w for w in words.tolist()]
+        return df, pd.Series(sanitized, index=words.index, dtype=object)
+
+    @staticmethod
+    def _katakana_mask(terms):
+        """_is_pure_katakana for a whole column of terms."""
+        if not FrequencyExporter._is_text_column(terms):
+            return pd.Series(False, index=terms.index)
+        return terms.str.fullmatch(KATAKANA_PATTERN).eq(True)
+
+    @staticmethod
+    def export_migaku(csv_path, save_path):
+        """
+        Export as a simple JSON array of words.
+        Format: ["word1", "word2", ...]
+        """
+        _, terms = FrequencyExporter._load_terms(csv_path)
+
+        # Same layout as json.dump(..., indent=2), but through the C encoder (indent forces the
+        # pure-Python one): the newline + indent go into the item separator instead
+        body = json.dumps(terms.tolist(), ensure_ascii=False, separators=(",\n  ", ": "))
         with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(word_list, f, ensure_ascii=False, indent=2)
+            f.write("[\n  " + body[1:-1] + "\n]")
             
     @staticmethod
     def export_word_list(csv_path, save_path):
         """
         Export as a plain text list, one word per line.
         """
-        df = pd.read_csv(csv_path)
-        if df.empty:
-            raise ValueError("The source data is empty. Cannot generate frequency list.")
-        if 'Word' not in df.columns:
-            raise ValueError("CSV is missing 'Word' column")
-            
-        # Sanitize words
-        word_list = [FrequencyExporter._sanitize_term(w) for w in df['Word'].tolist()]
-        
+        _, terms = FrequencyExporter._load_terms(csv_path)
+
         with open(save_path, 'w', encoding='utf-8') as f:
-            for word in word_list:
-                f.write(f"{word}\n")
+            f.write("".join(f"{term}\n" for term in terms))
 
     @staticmethod
-    def export_yomitan(csv_path, save_path, language='ja', title="Custom Freq List"):
+    def export_yomitan(csv_path, save_path, language='ja', title="Custom Freq List", bank_size=DEFAULT_BANK_SIZE):
         """
         Export as a Yomitan-compatible ZIP file.
         Contains:
           - index.json
-          - term_meta_bank_1.json
+          - term_meta_bank_1.json, term_meta_bank_2.json, ... (at most `bank_size` entries each;
+            Yomitan imports several moderate banks much faster than one huge one)
         """
-        df = pd.read_csv(csv_path)
-        if df.empty:
-            raise ValueError("The source data is empty. Cannot generate frequency list.")
-        if 'Word' not in df.columns:
-            raise ValueError("CSV is missing 'Word' column")
+        df, terms = FrequencyExporter._load_terms(csv_path)
+        if bank_size < 1:
+            raise ValueError("bank_size must be at least 1")
             
         # 1. Create index.json
         index_data = {
@@ -94,39 +125,38 @@ class FrequencyExporter:
             "description": f"Generated from Surasura Analysis ({language})"
         }
         
-        # 2. Create term_meta_bank_1.json
-        term_data = []
-        
-        has_reading = 'Reading' in df.columns
-        
-        for idx, row in df.iterrows():
-            rank = idx + 1
-            # Sanitize the term (Fix 1)
-            term = FrequencyExporter._sanitize_term(row['Word'])
-            
-            # Rule B (Simpler/Safer): 
-            # Keep Katakana readings ONLY for words that are actually Katakana.
-            # Otherwise, use integer format.
-            is_katakana_word = FrequencyExporter._is_pure_katakana(term)
-            
-            use_reading_object = (
-                language == 'ja' and 
-                has_reading and 
-                pd.notna(row['Reading']) and 
-                str(row['Reading']).strip() != "" and
-                is_katakana_word
-            )
-            
-            if use_reading_object:
-                reading = str(row['Reading'])
-                term_entry = [term, "freq", { "reading": reading, "frequency": rank }]
-            else:
-                # Simple format: ["term", "freq", rank]
-                term_entry = [term, "freq", rank]
-                
-            term_data.append(term_entry)
-            
-        # 3. Zip them up (Flat compression - Fix 3)
+        # 2. Term entries, decided for the whole column at once
+        # Rule B (Simpler/Safer):
+        # Keep Katakana readings ONLY for words that are actually Katakana.
+        # Otherwise, use integer format: ["term", "freq", rank]
+        ranks = range(1, len(df) + 1)
+        if language == 'ja' and 'Reading' in df.columns:
+            readings = df['Reading']
+            has_reading = readings.notna() & readings.astype(str).str.strip().ne("")
+            use_reading = (has_reading & FrequencyExporter._katakana_mask(terms)).tolist()
+            readings = readings.astype(str).tolist()
+        else:
+            use_reading = None
+
+        def entries(start, stop):
+            if use_reading is None:
+                return [[terms_list[i], "freq", ranks[i]] for i in range(start, stop)]
+            return [[terms_list[i], "freq", {"reading": readings[i], "frequency": ranks[i]}] if use_reading[i]
+                    else [terms_list[i], "freq", ranks[i]] for i in range(start, stop)]
+
+        terms_list = terms.tolist()
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+        # 3. Zip them up (Flat compression - Fix 3), each bank encoded straight into its zip member
         with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zf:
             zf.writestr('index.json', json.dumps(index_data, ensure_ascii=False, indent=2))
-            zf.writestr('term_meta_bank_1.json', json.dumps(term_data, ensure_ascii=False))
+            for bank, start in enumerate(range(0, len(terms_list), bank_size), start=1):
+                stop = min(start + bank_size, len(terms_list))
+                with zf.open(f'term_meta_bank_{bank}.json', 'w') as member:
+                    member.write(b"[")
+                    for chunk in range(start, stop, ENCODE_CHUNK):
+                        if chunk > start:
+                            member.write(b",")
+                        # One encode call per chunk; strip the chunk's own brackets
+                        member.write(encoder.encode(entries(chunk, min(chunk + ENCODE_CHUNK, stop)))[1:-1].encode('utf-8'))
+                    member.write(b"]")
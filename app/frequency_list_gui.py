@@ -12,6 +12,7 @@ if __name__ == "__main__" and __package__ is None:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.path_utils import get_user_file, get_icon_path, get_user_files_path
+from app import yomitan_utils
 
 class FrequencyListGUI:
     def __init__(self, root, language='ja'):
@@ -82,7 +83,8 @@ class FrequencyListGUI:
         instr_frame.pack(fill=tk.X, pady=(0, 15))
 
         instr_text = (
-            "Download a CSV frequency list from here (or several):"
+            "Download a CSV frequency list from here (or several).\n"
+            "Yomitan frequency dictionaries (.zip) can be added as they are:"
         )
         ttk.Label(instr_frame, text=instr_text).pack(anchor="w")
 
@@ -163,15 +165,16 @@ class FrequencyListGUI:
             os.makedirs(target_dir, exist_ok=True)
             
         # Only list files that match the analyzer's expectation
-        files = glob.glob(os.path.join(target_dir, "frequency_list_*.csv"))
+        files = (glob.glob(os.path.join(target_dir, "frequency_list_*.csv")) +
+                 glob.glob(os.path.join(target_dir, "frequency_list_*.zip")))
         
         for f in sorted(files):
             self.file_listbox.insert(tk.END, os.path.basename(f))
 
     def add_files(self):
         file_paths = filedialog.askopenfilenames(
-            title="Select Frequency List CSVs",
-            filetypes=[("CSV Files", "*.csv")]
+            title="Select Frequency Lists",
+            filetypes=[("Frequency Lists", "*.csv *.zip"), ("CSV Files", "*.csv"), ("Yomitan Dictionaries", "*.zip")]
         )
         
         if not file_paths:
@@ -185,6 +188,9 @@ class FrequencyListGUI:
         for src in file_paths:
             try:
                 base_name = os.path.basename(src)
+                if base_name.lower().endswith(".zip"):
+                    # Must contain term_meta_bank_*.json; the analyzer reads the zip itself
+                    yomitan_utils.read_dictionary_info(src)
                 # Automatically add prefix if missing, so analyzer.py detects it
                 # Analyzer expects: frequency_list_{language}_{name}.csv
                 prefix = f"frequency_list_{self.language}_"
@@ -0,0 +1,86 @@
+"""
+IgnoreList.txt helpers, and merging the words ignored in the browser report into it.
+
+The static page (web_app.html) keeps an append-only journal of ignore clicks in the
+browser (IndexedDB). Its "Export Ignored" button saves that journal as:
+
+    {"format": "surasura-ignore-journal", "version": 1, "language": "ja",
+     "exported": "2026-01-01T12:00:00.000Z",
+     "entries": [{"op": "ignore", "word": "猫", "at": 1767268800000},
+                 {"op": "clear", "at": 1767268900000}, ...]}
+
+"clear" is the page's "Un-hide All": only words ignored after the last one count.
+The dashboard's "Merge Report Ignores" adds them to User Files/<lang>/IgnoreList.txt.
+A plain list (one word per line, e.g. from "Copy Ignored Words") is accepted as well.
+"""
+import os
+import json
+
+from app.file_utils import atomic_append_text, file_lock
+
+IGNORE_EXPORT_FORMAT = "surasura-ignore-journal"
+
+
+def read_ignore_entries(path):
+    """Entries of an IgnoreList.txt (comments and blank lines skipped)."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip() and not line.strip().startswith("#")}
+
+
+def replay_journal(entries):
+    """The words an ignore journal ends up with, in the order they were first ignored."""
+    words = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        op = entry.get("op")
+        if op == "clear":
+            words.clear()
+        elif op == "ignore" and isinstance(entry.get("word"), str) and entry["word"].strip():
+            words.setdefault(entry["word"].strip(), None)
+    return list(words)
+
+
+def read_ignore_export(path):
+    """
+    (language, words) of an exported journal, or (None, words) for a plain word list.
+    Raises ValueError for JSON that isn't an ignore journal.
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        text = f.read()
+    if text.lstrip().startswith("{"):
+        data = json.loads(text)
+        if data.get("format") != IGNORE_EXPORT_FORMAT:
+            raise ValueError(f"{os.path.basename(path)} is not a Surasura ignore export")
+        return data.get("language"), replay_journal(data.get("entries", []))
+    words = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and line not in words:
+            words.append(line)
+    return None, words
+
+
+def merge_into_ignore_list(words, ignore_path):
+    """Appends the words that aren't in IgnoreList.txt yet (in one write); returns them."""
+    os.makedirs(os.path.dirname(ignore_path), exist_ok=True)
+    # Held across read + append, so two merges never add the same word twice
+    with file_lock(ignore_path):
+        existing = read_ignore_entries(ignore_path)
+        added = []
+        for word in words:
+            word = word.strip() if isinstance(word, str) else ""
+            if word and not word.startswith("#") and word not in existing and word not in added:
+                added.append(word)
+        if not added:
+            return added
+        prefix = ""
+        if os.path.exists(ignore_path) and os.path.getsize(ignore_path):
+            with open(ignore_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    prefix = "\n"
+        atomic_append_text(ignore_path, prefix + "".join(word + "\n" for word in added))
+    return added
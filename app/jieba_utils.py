@@ -0,0 +1,172 @@
+import os
+import hashlib
+import marshal
+import tempfile
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import jieba
+from jieba import finalseg
+
+from app.path_utils import get_cache_path
+
+# Collocations forced apart by "--reinforce" (e.g. "就把" -> "就", "把")
+REINFORCE_SEGMENTS = [('就', '把'), ('您', '不')]
+
+# Below this many characters the process pool costs more than it saves
+PARALLEL_MIN_CHARS = 200000
+# Approximate size of each paragraph block handed to a worker
+PARALLEL_BLOCK_CHARS = 50000
+
+# Which dictionary variant this process has loaded (None, False=base, True=reinforced)
+_loaded_variant = None
+
+
+def get_dictionary_cache_file(reinforce=False):
+    """
+    Returns the path of the persistent prefix-dict cache for the given variant.
+    The name embeds the jieba version and the tuning segments, so upgrading jieba
+    or changing REINFORCE_SEGMENTS never loads a stale cache.
+    """
+    segments = REINFORCE_SEGMENTS if reinforce else []
+    key = repr((jieba.__version__, segments)).encode('utf-8')
+    digest = hashlib.sha1(key).hexdigest()[:10]
+    variant = "reinforced" if reinforce else "base"
+
+    try:
+        cache_dir = get_cache_path()
+    except OSError:
+        cache_dir = tempfile.gettempdir()
+    return os.path.join(cache_dir, f"jieba_{variant}_{digest}.cache")
+
+
+def _write_dictionary_cache(cache_file, freq, total):
+    """Dump (FREQ, total) the same way jieba does: temp file + rename."""
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+        with os.fdopen(fd, 'wb') as f:
+            marshal.dump((freq, total), f)
+        os.replace(temp_path, cache_file)
+    except Exception as e:
+        print(f"Warning: Could not write jieba dictionary cache: {e}")
+
+
+def _read_dictionary_cache(cache_file):
+    """Returns the cached (FREQ, total) or None if missing/unreadable."""
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            return marshal.load(f)
+    except Exception:
+        return None
+
+
+def load_dictionary(reinforce=False):
+    """
+    Initializes jieba from the persistent cache, applying --reinforce tuning if needed.
+
+    The base variant goes through jieba's own cache mechanism, just redirected into
+    the user data directory. The reinforced variant stores the frequencies *after*
+    suggest_freq, so later runs skip both the dictionary build and the tuning pass.
+    Only the HMM force-split registry lives outside FREQ, and it is replayed here.
+    """
+    global _loaded_variant
+
+    # jieba state is process-global and tuning cannot be undone (see ChineseTokenizer)
+    if _loaded_variant is True or _loaded_variant == reinforce:
+        return
+
+    dt = jieba.dt
+    if reinforce and not dt.initialized:
+        cached = _read_dictionary_cache(get_dictionary_cache_file(reinforce=True))
+        if cached:
+            dt.FREQ, dt.total = cached
+            dt.initialized = True
+            for segment in REINFORCE_SEGMENTS:
+                word = "".join(segment)
+                if dt.FREQ.get(word) == 0:
+                    finalseg.add_force_split(word)
+            _loaded_variant = True
+            return
+
+    if not dt.initialized:
+        base_cache = get_dictionary_cache_file(reinforce=False)
+        dt.tmp_dir = os.path.dirname(base_cache)
+        dt.cache_file = os.path.basename(base_cache)
+        dt.initialize()
+
+    if reinforce:
+        for segment in REINFORCE_SEGMENTS:
+            dt.suggest_freq(segment, tune=True)
+        _write_dictionary_cache(get_dictionary_cache_file(reinforce=True), dt.FREQ, dt.total)
+
+    _loaded_variant = reinforce
+
+
+def split_blocks(text, block_chars=PARALLEL_BLOCK_CHARS):
+    """
+    Splits text into ~block_chars paragraph blocks, always cutting right after a newline.
+    jieba.cut never joins anything across "\\n" (it is yielded as its own token and
+    "\\r\\n" stays in one block), so cutting the blocks separately and concatenating
+    gives exactly the same token stream as cutting the whole text.
+    """
+    blocks = []
+    start = 0
+    length = len(text)
+    while start < length:
+        newline = text.find("\n", start + block_chars)
+        if newline == -1:
+            blocks.append(text[start:])
+            break
+        blocks.append(text[start:newline + 1])
+        start = newline + 1
+    return blocks
+
+
+def _init_worker(reinforce):
+    load_dictionary(reinforce)
+
+
+def _cut_block(block):
+    return list(jieba.cut(block, cut_all=False))
+
+
+class ParallelSegmenter:
+    """
+    Runs jieba.cut over paragraph blocks in a process pool.
+    Each worker loads the (pre-tuned) dictionary cache once; small texts are cut in-process.
+    """
+    def __init__(self, reinforce=False, workers=None):
+        self.reinforce = reinforce
+        self.workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+        self._executor = None
+
+    def cut(self, text):
+        if self.workers < 2 or len(text) < PARALLEL_MIN_CHARS:
+            return jieba.cut(text, cut_all=False)
+
+        # Looked up per call (not as split_blocks' default) so the block size can be tuned at runtime
+        blocks = split_blocks(text, PARALLEL_BLOCK_CHARS)
+        if len(blocks) < 2:
+            return jieba.cut(text, cut_all=False)
+
+        try:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.reinforce,)
+                )
+            return itertools.chain.from_iterable(list(self._executor.map(_cut_block, blocks)))
+        except (BrokenProcessPool, OSError) as e:
+            print(f"Warning: Parallel segmentation unavailable ({e}). Falling back to a single process.")
+            self.close()
+            self.workers = 1
+            return jieba.cut(text, cut_all=False)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
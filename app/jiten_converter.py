@@ -1,5 +1,4 @@
 import json
-from datetime import datetime
 import sys
 import os
 import requests
@@ -9,6 +8,7 @@ if __name__ == "__main__" and __package__ is None:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.path_utils import get_user_file, get_user_files_path
+from app import known_word_store
 
 def fetch_jiten_vocabulary(api_key, output_json=None, language='ja'):
     if not output_json:
@@ -92,34 +92,16 @@ def fetch_jiten_vocabulary(api_key, output_json=None, language='ja'):
         
         print(f"Processed {len(words)} words")
         
-        # Calculate statistics
-        stats = {
-            'totalWords': len(words),
-            'knownWords': sum(1 for w in words if w.get('knownStatus') == "KNOWN"),
-            'learningWords': sum(1 for w in words if w.get('knownStatus') == "LEARNING"),
-            'unknownWords': sum(1 for w in words if w.get('knownStatus') == "UNKNOWN"),
-            'ignoredWords': sum(1 for w in words if w.get('knownStatus') == "IGNORED"),
-            'languages': sorted(list(set(w.get('language', '') for w in words)))
-        }
-        
+        # Bulk write into the indexed store; statistics come from its running counts
+        print(f"\nWriting JSON to: {output_json}")
+        stats = known_word_store.save_words(output_json, words, language, source='Jiten API')
+
         print("\nStatistics:")
         print(f"  Total Words: {stats['totalWords']}")
         print(f"  Known Words: {stats['knownWords']}")
         print(f"  Learning Words: {stats['learningWords']}")
         print(f"  Unknown Words: {stats['unknownWords']}")
         
-        print(f"\nWriting JSON to: {output_json}")
-        
-        json_data = {
-            'exportDate': datetime.now().isoformat(),
-            'source': 'Jiten API',
-            'statistics': stats,
-            'words': words
-        }
-        
-        with open(output_json, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
-        
         print(f"JSON exported: {output_json}")
         print("\nConversion complete!")
         return True
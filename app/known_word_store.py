@@ -0,0 +1,319 @@
+"""
+Indexed known-word store kept next to KnownWord.json (KnownWord.json -> KnownWord.sqlite).
+
+The importers (Migaku, Jiten, Anki) write their words here in bulk, one row per entry (a
+source may list a word more than once, e.g. per part of speech), and a stats table is kept
+up to date by triggers, so nothing has to rebuild the whole list or recount it.
+KnownWord.json is still written after every import as a compatibility export (same entries
+and layout as before, one word per line).
+
+The store remembers the size/mtime of the KnownWord.json it last wrote or read. If the JSON
+was replaced by hand (or by an older version) it is imported again before use, so the JSON
+stays the file users can copy around and the store is just its index.
+"""
+import os
+import json
+import sqlite3
+from datetime import datetime
+
+from app.file_utils import atomic_write, file_lock
+
+STORE_SUFFIX = ".sqlite"
+# Bump when the schema changes; an older store is rebuilt from KnownWord.json
+SCHEMA_VERSION = 2
+# Words encoded per write while exporting KnownWord.json
+EXPORT_CHUNK = 5000
+
+STATUSES = ("KNOWN", "LEARNING", "UNKNOWN", "IGNORED")
+
+# One encoder for every entry (json.dumps with options builds a new one per call)
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    dictForm TEXT NOT NULL,
+    secondary TEXT NOT NULL,
+    language TEXT NOT NULL,
+    knownStatus TEXT NOT NULL,
+    hasCard INTEGER,
+    data TEXT NOT NULL
+);
+-- Anki marks words by (dictForm, secondary)
+CREATE INDEX IF NOT EXISTS words_key ON words (dictForm, secondary);
+-- What the analyzer reads: only the known words, straight from the index
+CREATE INDEX IF NOT EXISTS words_known ON words (dictForm) WHERE knownStatus = 'KNOWN' OR hasCard = 1;
+
+CREATE TABLE IF NOT EXISTS stats (
+    language TEXT NOT NULL,
+    knownStatus TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (language, knownStatus)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS words_insert AFTER INSERT ON words BEGIN
+    INSERT INTO stats VALUES (new.language, new.knownStatus, 1)
+        ON CONFLICT (language, knownStatus) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS words_delete AFTER DELETE ON words BEGIN
+    UPDATE stats SET count = count - 1 WHERE language = old.language AND knownStatus = old.knownStatus;
+END;
+CREATE TRIGGER IF NOT EXISTS words_status AFTER UPDATE OF knownStatus ON words
+WHEN old.knownStatus IS NOT new.knownStatus BEGIN
+    UPDATE stats SET count = count - 1 WHERE language = old.language AND knownStatus = old.knownStatus;
+    INSERT INTO stats VALUES (new.language, new.knownStatus, 1)
+        ON CONFLICT (language, knownStatus) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+"""
+
+_INSERT = """
+INSERT INTO words (dictForm, secondary, language, knownStatus, hasCard, data) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Anki: existing entries of a (dictForm, secondary) keep everything but are marked KNOWN,
+# words not in the list yet are added
+_MARK_KNOWN = """
+UPDATE words SET knownStatus = 'KNOWN' WHERE dictForm = ? AND secondary = ?
+"""
+_ADD_MISSING = """
+INSERT INTO words (dictForm, secondary, language, knownStatus, hasCard, data)
+SELECT ?1, ?2, ?3, 'KNOWN', ?4, ?5 WHERE NOT EXISTS (SELECT 1 FROM words WHERE dictForm = ?1 AND secondary = ?2)
+"""
+
+
+def get_store_path(json_path):
+    return os.path.splitext(json_path)[0] + STORE_SUFFIX
+
+
+def is_store_file(name):
+    """True for a store and SQLite's -journal file next to it."""
+    return name.endswith((STORE_SUFFIX, STORE_SUFFIX + "-journal"))
+
+
+def _json_signature(json_path):
+    try:
+        stat = os.stat(json_path)
+    except OSError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _entry_row(entry):
+    """(dictForm, secondary, language, knownStatus, hasCard, data) of a KnownWord.json entry."""
+    return (str(entry.get('dictForm') or ''), str(entry.get('secondary') or ''),
+            str(entry.get('language') or ''), str(entry.get('knownStatus') or 'UNKNOWN'),
+            entry.get('hasCard'), _encode(entry))
+
+
+def read_json_words(json_path):
+    """The word entries of a KnownWord.json (dict with 'words' or a plain list)."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    # Handle both Dict (list in 'words') and List formats
+    if isinstance(data, dict):
+        words = data.get("words", [])
+    elif isinstance(data, list):
+        words = data
+    else:
+        words = []
+    return [w for w in words if isinstance(w, dict)]
+
+
+class KnownWordStore:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self.conn.executescript("DROP TABLE IF EXISTS words; DROP TABLE IF EXISTS stats; DROP TABLE IF EXISTS meta;")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # --- Writing ---
+
+    def replace_all(self, entries):
+        """Replaces every word with `entries` (a full export, e.g. from Migaku or Jiten), entry by entry."""
+        with self.conn:
+            self.conn.execute("DELETE FROM words")
+            self.conn.execute("DELETE FROM stats")
+            self.conn.executemany(_INSERT, (_entry_row(e) for e in entries))
+            self._set_meta("json_signature", None)
+
+    def mark_known(self, pairs, language, **extra):
+        """
+        Marks (dictForm, secondary) pairs as KNOWN, adding new words with the given
+        extra fields (e.g. hasCard=1 for words that came from Anki cards).
+        """
+        pairs = list(pairs)
+
+        def rows():
+            for dict_form, secondary in pairs:
+                entry = {'dictForm': dict_form, 'secondary': secondary, 'partOfSpeech': '',
+                         'language': language, 'knownStatus': "KNOWN"}
+                entry.update(extra)
+                row = _entry_row(entry)
+                yield row[:3] + row[4:]
+
+        with self.conn:
+            self.conn.executemany(_MARK_KNOWN, ((str(d or ''), str(s or '')) for d, s in pairs))
+            self.conn.executemany(_ADD_MISSING, rows())
+            self._set_meta("json_signature", None)
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    # --- Reading ---
+
+    def statistics(self, default_language=None):
+        """
+        The 'statistics' block of KnownWord.json, from the running counts.
+        Entries without a language count as default_language (the importer's), if given.
+        """
+        counts = dict.fromkeys(STATUSES, 0)
+        languages = set()
+        total = 0
+        for language, status, count in self.conn.execute("SELECT language, knownStatus, count FROM stats WHERE count > 0"):
+            counts[status] = counts.get(status, 0) + count
+            languages.add(language or default_language or '')
+            total += count
+        return {
+            'totalWords': total,
+            'knownWords': counts["KNOWN"],
+            'learningWords': counts["LEARNING"],
+            'unknownWords': counts["UNKNOWN"],
+            'ignoredWords': counts["IGNORED"],
+            'languages': sorted(languages)
+        }
+
+    def known_terms(self):
+        """Distinct dictForms that count as known (KNOWN, or has a card)."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT dictForm FROM words WHERE knownStatus = 'KNOWN' OR hasCard = 1")]
+
+    def iter_encoded_entries(self):
+        """
+        KnownWord.json entries as JSON text, in the order they were first added.
+        Stored entries are passed through as is; only those whose status or card flag
+        was changed by a merge are decoded and updated.
+        """
+        rows = self.conn.execute(
+            "SELECT data, knownStatus, hasCard, "
+            "json_extract(data, '$.knownStatus') IS knownStatus AND json_extract(data, '$.hasCard') IS hasCard "
+            "FROM words ORDER BY id")
+        for data, status, has_card, in_sync in rows:
+            if in_sync:
+                yield data
+                continue
+            entry = json.loads(data)
+            entry['knownStatus'] = status
+            if 'hasCard' in entry or has_card:
+                entry['hasCard'] = has_card
+            yield _encode(entry)
+
+    # --- KnownWord.json ---
+
+    def is_in_sync(self, json_path):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'json_signature'").fetchone()
+        return row is not None and row[0] is not None and row[0] == _json_signature(json_path)
+
+    def import_json(self, json_path):
+        """Rebuilds the store from KnownWord.json."""
+        self.replace_all(read_json_words(json_path))
+        with self.conn:
+            self._set_meta("json_signature", _json_signature(json_path))
+
+    def export_json(self, json_path, default_language=None, **header):
+        """
+        Writes KnownWord.json: header keys (exportDate defaults to now), statistics, words.
+        Words are written one per line straight from the store instead of with indent=2.
+        """
+        header = {'exportDate': header.pop('exportDate', None) or datetime.now().isoformat(), **header,
+                  'statistics': self.statistics(default_language)}
+        with atomic_write(json_path, "w", encoding="utf-8") as f:
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f"  {_encode(key)}: {json.dumps(value, ensure_ascii=False, indent=2).replace(chr(10), chr(10) + '  ')},\n")
+            f.write('  "words": [')
+            first = True
+            chunk = []
+            for data in self.iter_encoded_entries():
+                chunk.append(data)
+                if len(chunk) >= EXPORT_CHUNK:
+                    f.write(("\n    " if first else ",\n    ") + ",\n    ".join(chunk))
+                    first = False
+                    chunk = []
+            if chunk:
+                f.write(("\n    " if first else ",\n    ") + ",\n    ".join(chunk))
+                first = False
+            f.write("\n  ]\n}" if not first else "]\n}")
+
+        with self.conn:
+            self._set_meta("json_signature", _json_signature(json_path))
+        return header['statistics']
+
+
+def open_store(json_path):
+    """
+    The store belonging to KnownWord.json, brought in sync with it first
+    (imported again if the JSON changed since the store last saw it, emptied if it is gone).
+
+    The sync holds the JSON's lock, for readers too: an importer keeps that lock from its
+    upsert until the export has stamped the new JSON, so a reader can never see the store
+    "out of sync" in between and import the old JSON over the new words.
+    """
+    store = KnownWordStore(get_store_path(json_path))
+    try:
+        with file_lock(json_path):
+            if not os.path.exists(json_path):
+                # KnownWord.json was deleted: start over like the JSON-only importers did
+                store.replace_all([])
+            elif not store.is_in_sync(json_path):
+                store.import_json(json_path)
+    except (OSError, ValueError) as e:
+        # Unreadable/broken JSON: keep what the store has, the next export rewrites it
+        print(f"Warning: Could not read {os.path.basename(json_path)} ({e}), using the stored words.")
+    except Exception:
+        store.close()
+        raise
+    return store
+
+
+def save_words(json_path, entries, language=None, **header):
+    """
+    Importer entry point: replaces the words with `entries` (every entry kept, as given)
+    and re-exports KnownWord.json. Returns the statistics, where entries without a
+    language count as `language`.
+    """
+    with file_lock(json_path):
+        with open_store(json_path) as store:
+            store.replace_all(entries)
+            return store.export_json(json_path, language, **header)
+
+
+def mark_words_known(json_path, pairs, language, defaults=None, **header):
+    """
+    Importer entry point for word lists without statuses (Anki): marks the
+    (dictForm, secondary) pairs KNOWN, adds missing ones with `defaults`, and
+    re-exports KnownWord.json. Returns the statistics.
+    """
+    with file_lock(json_path):
+        with open_store(json_path) as store:
+            store.mark_known(pairs, language, **(defaults or {}))
+            return store.export_json(json_path, language, **header)
+
+
+def load_known_terms(json_path):
+    """Distinct known dictForms for the analyzer, through the store (synced with the JSON)."""
+    with open_store(json_path) as store:
+        return store.known_terms()
@@ -0,0 +1,83 @@
+import queue
+import tempfile
+import threading
+from collections import deque
+
+# Lines kept in the dashboard terminal widget (older lines scroll off)
+TERMINAL_MAX_LINES = 5000
+# Lines waiting for the GUI; when full, the reader thread blocks (and so does the subprocess pipe)
+PENDING_MAX_LINES = 2000
+# Lines moved into the widget per GUI tick
+BATCH_MAX_LINES = 500
+# Keep the full log in memory up to this size, then spill it to a temp file
+ARCHIVE_SPOOL_BYTES = 1024 * 1024
+
+
+class LogPipeline:
+    """
+    Bounded, batched log buffer between subprocess reader threads and the Tk terminal.
+
+    - put() is called from worker threads. It blocks while the GUI is behind, which
+      stops reading the pipe and in turn pauses a chatty subprocess (back-pressure).
+    - drain() is called once per GUI tick and returns at most BATCH_MAX_LINES lines,
+      so the widget gets one insert per tick instead of one per line.
+    - Only the last TERMINAL_MAX_LINES lines are kept for display (ring buffer), but
+      every line also goes to an archive so the complete log can still be saved.
+    """
+    def __init__(self, max_lines=TERMINAL_MAX_LINES, max_pending=PENDING_MAX_LINES,
+                 batch_lines=BATCH_MAX_LINES):
+        self.max_lines = max_lines
+        self.batch_lines = batch_lines
+        self.pending = queue.Queue(maxsize=max_pending)
+        # Lines logged from the GUI thread itself must never block (it is the consumer)
+        self.overflow = deque()
+        self.scrollback = deque(maxlen=max_lines)
+        self.archive = tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_BYTES, mode='w+', encoding='utf-8')
+        self.closed = False
+
+    def put(self, message):
+        lines = message.split("\n")
+        if threading.current_thread() is threading.main_thread():
+            self.overflow.extend(lines)
+            return
+        for line in lines:
+            while not self.closed:
+                try:
+                    self.pending.put(line, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def drain(self):
+        """Moves up to one batch of waiting lines into the scrollback/archive and returns them."""
+        batch = []
+        while self.overflow and len(batch) < self.batch_lines:
+            batch.append(self.overflow.popleft())
+        try:
+            while len(batch) < self.batch_lines:
+                batch.append(self.pending.get_nowait())
+        except queue.Empty:
+            pass
+
+        if batch:
+            self.scrollback.extend(batch)
+            self.archive.write("\n".join(batch) + "\n")
+        return batch
+
+    def clear(self):
+        self.scrollback.clear()
+        self.archive.seek(0)
+        self.archive.truncate()
+
+    def save(self, path):
+        """Writes the complete log of the current run (not just the visible scrollback)."""
+        self.archive.flush()
+        self.archive.seek(0)
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in iter(lambda: self.archive.read(64 * 1024), ''):
+                f.write(chunk)
+        self.archive.seek(0, 2)
+
+    def close(self):
+        self.closed = True
+        self.archive.close()
@@ -1,16 +1,22 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import subprocess
 import os
 import sys
 import threading
 import queue
+import tempfile
+import time
 import webbrowser
 import json
 from typing import Optional
 from app import __version__
 from app.update_checker import check_for_updates
 from app import settings_manager
+from app.progress_utils import parse_progress_line, describe_progress, combine_progress
+from app.path_utils import SUPPORTED_LANGUAGES
+from app.log_utils import LogPipeline
+from app.checkpoint_utils import CANCELLED_EXIT_CODE
 
 # Windows Taskbar Icon Fix (Set AppUserModelID)
 if sys.platform == "win32":
@@ -29,6 +35,9 @@ ACCENT_COLOR = "#bb86fc"
 SECONDARY_COLOR = "#03dac6"
 ERROR_COLOR = "#cf6679"
 
+# Seconds to wait for the analyzer to checkpoint and exit when the dashboard closes
+CANCEL_GRACE_SECONDS = 5
+
 class ToolTip:
     def __init__(self, widget, text):
         self.widget = widget
@@ -144,12 +153,16 @@ class MasterDashboardApp:
         self.onboarding_completed = tk.BooleanVar(value=False)
         self.var_open_count = tk.IntVar(value=0)
         self.var_hide_satoru = tk.BooleanVar(value=False)
+        self.var_watch = tk.BooleanVar(value=False) # Background re-analysis on content changes
+        self.watch_cancel_file = None
+        self.stop_button_owner = None
         self._lock_ui_updates = False
         
         # Initialize status var early to satisfy linter
         self.status_var = tk.StringVar(value="Ready")
         self.terminal: Optional[tk.Text] = None
         self.spinner: Optional[ttk.Progressbar] = None
+        self.btn_stop: Optional[ttk.Button] = None
         self.settings_window: Optional[tk.Toplevel] = None
         self.btn_satori: Optional[ttk.Button] = None
         
@@ -158,10 +171,14 @@ class MasterDashboardApp:
         
         # Queue for thread-safe GUI updates
         self.gui_queue = queue.Queue()
+        # Subprocess output is batched separately (bounded, with back-pressure)
+        self.log_pipeline = LogPipeline()
         self.check_queue()
 
         # Track active child processes
         self.active_processes = []
+        # Cooperative stop: process -> cancel flag file it polls between files
+        self.cancel_files = {}
 
         # Set Application Icon
         try:
@@ -233,7 +250,25 @@ class MasterDashboardApp:
         except queue.Empty:
             pass
         finally:
-            self.root.after(100, self.check_queue)
+            try:
+                self.flush_log()
+            finally:
+                self.root.after(100, self.check_queue)
+
+    def flush_log(self):
+        """Moves one batch of pending log lines into the terminal with a single insert"""
+        batch = self.log_pipeline.drain()
+        if not batch or not self.terminal:
+            return
+        self.terminal.config(state=tk.NORMAL)
+        self.terminal.insert(tk.END, "\n".join(batch) + "\n")
+        # Cap scrollback: drop the oldest lines beyond the ring buffer size
+        line_count = int(self.terminal.index('end-1c').split('.')[0]) - 1
+        excess = line_count - self.log_pipeline.max_lines
+        if excess > 0:
+            self.terminal.delete('1.0', f'{excess + 1}.0')
+        self.terminal.see(tk.END)
+        self.terminal.config(state=tk.DISABLED)
         
     def apply_dark_theme(self):
         self.style.theme_use('default')
@@ -417,6 +452,11 @@ class MasterDashboardApp:
         btn_ignore.pack(side=tk.LEFT, expand=True, fill=tk.X)
         ToolTip(btn_ignore, "Open your IgnoreList.txt to manually edit excluded words.")
 
+        btn_merge_ignores = ttk.Button(vocab_row, text="Merge Report Ignores",
+                     command=self.merge_report_ignores)
+        btn_merge_ignores.pack(side=tk.LEFT, padx=(5, 0))
+        ToolTip(btn_merge_ignores, "Add the words you ignored in the HTML report ('Export Ignored' file) to IgnoreList.txt.")
+
         # 2. Library Tools
         lib_frame = ttk.LabelFrame(main_frame, text=" 📦 Library Content", padding="10")
         lib_frame.pack(fill=tk.X, pady=(0, 5)) # Reduced pady 10 -> 5
@@ -476,8 +516,21 @@ class MasterDashboardApp:
         btn_analyze.pack(anchor=tk.W, fill=tk.X)
         ToolTip(btn_analyze, "Analyze text files and generate readability report. Auto-launches static page.")
 
+        btn_analyze_all = ttk.Button(analyze_frame, text="Analyze all languages",
+                                     command=lambda: self.run_analyzer(all_languages=True))
+        btn_analyze_all.pack(anchor=tk.W, fill=tk.X, pady=(5, 0))
+        ToolTip(btn_analyze_all, "Refresh the Japanese and Chinese libraries at the same time (each language runs in parallel with its own results).")
+
+        # Watch Mode Toggle
+        chk_watch = ttk.Checkbutton(analyze_frame, text="Auto-refresh when content changes", variable=self.var_watch, command=self.toggle_watch)
+        chk_watch.pack(anchor=tk.W, pady=(5, 0))
+        ToolTip(chk_watch, "Keep watching your content folders, KnownWord.json and word lists. The reading list is re-analyzed and refreshed a few seconds after anything changes.")
+
         # Spinner (Initially hidden)
         self.spinner = ttk.Progressbar(analyze_frame, mode='indeterminate', style="TProgressbar")
+        self.btn_stop = ttk.Button(analyze_frame, text="Stop (resume later)",
+                                   command=lambda: self.request_cancel(only=self.stop_button_owner))
+        ToolTip(self.btn_stop, "Stop after the current file. Progress is kept and the next run continues from there.")
         
         # 4. Results Viewer
         view_frame = ttk.LabelFrame(main_frame, text=" 📊 Results Viewer", padding="10")
@@ -650,10 +703,18 @@ class MasterDashboardApp:
         btn_export_freq.pack(side=tk.LEFT, padx=(10, 0))
         ToolTip(btn_export_freq, "Export a frequency list of all words from your analyzed content. Format: JSON array of strings. You can add this to Migaku or Yomitan.")
 
+        btn_corpus_freq = ttk.Button(freq_btn_row, text="Build Freq List from Corpus", command=self.build_corpus_frequency_list)
+        btn_corpus_freq.pack(side=tk.LEFT, padx=(10, 0))
+        ToolTip(btn_corpus_freq, "Count every word in a folder of texts (any size) and save it as a frequency list the analyzer uses for tiers.")
+
         # Logs
         log_frame = ttk.LabelFrame(self.settings_window, text=" Processing Log", padding="10")
         log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
+        btn_save_log = ttk.Button(log_frame, text="Save Log...", command=self.save_log)
+        btn_save_log.pack(side=tk.BOTTOM, anchor=tk.E, pady=(5, 0))
+        ToolTip(btn_save_log, "Save the full log of the last run to a file (the view keeps only the most recent lines).")
+
         self.terminal = tk.Text(log_frame, height=10, bg=SURFACE_COLOR, fg=TEXT_COLOR, 
                                 insertbackground=TEXT_COLOR, font=("Consolas", 9),
                                 relief=tk.FLAT, borderwidth=0, state=tk.DISABLED,
@@ -663,6 +724,13 @@ class MasterDashboardApp:
         scrollbar = ttk.Scrollbar(log_frame, command=self.terminal.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.terminal.config(yscrollcommand=scrollbar.set)
+
+        # Show what was logged before the window existed (bounded scrollback)
+        if self.log_pipeline.scrollback:
+            self.terminal.config(state=tk.NORMAL)
+            self.terminal.insert(tk.END, "\n".join(self.log_pipeline.scrollback) + "\n")
+            self.terminal.see(tk.END)
+            self.terminal.config(state=tk.DISABLED)
         
     def toggle_settings_window(self):
         if self.settings_window is None or not self.settings_window.winfo_exists():
@@ -707,14 +775,25 @@ class MasterDashboardApp:
             print(f"Update check failed: {e}")
 
     def log_to_terminal(self, message):
-        """Appends text to the terminal widget safely via queue"""
-        def _update():
-            if self.terminal:
-                self.terminal.config(state=tk.NORMAL)
-                self.terminal.insert(tk.END, message + "\n")
-                self.terminal.see(tk.END)
-                self.terminal.config(state=tk.DISABLED)
-        self.gui_queue.put(_update)
+        """Appends text to the terminal widget safely via the batched log pipeline"""
+        self.log_pipeline.put(message)
+
+    def save_log(self):
+        """Saves the complete log of the last run (including lines scrolled out of the terminal)"""
+        path = filedialog.asksaveasfilename(
+            parent=self.settings_window,
+            title="Save Processing Log",
+            defaultextension=".txt",
+            initialfile="surasura_log.txt",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            self.log_pipeline.save(path)
+            self.status_var.set("Log saved.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save log:\n{e}")
 
     def update_satori_visibility(self):
         """Hides or shows the Satori button based on settings and module availability"""
@@ -863,29 +942,72 @@ class MasterDashboardApp:
         except Exception as e:
             messagebox.showerror("Error", f"Could not open ignore list: {e}")
 
+    def merge_report_ignores(self):
+        """Adds the words ignored in the browser report (its 'Export Ignored' file) to IgnoreList.txt."""
+        paths = filedialog.askopenfilenames(
+            title="Select exported ignore lists",
+            filetypes=[("Surasura Ignore Export", "*.json"), ("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        if not paths:
+            return
+        from app.ignore_utils import read_ignore_export, merge_into_ignore_list
+        from app.path_utils import get_user_files_path, SUPPORTED_LANGUAGES
+
+        added = {}
+        try:
+            for path in paths:
+                language, words = read_ignore_export(path)
+                # Plain word lists belong to the language selected in the dashboard
+                language = language or self.var_language.get()
+                if language not in SUPPORTED_LANGUAGES:
+                    raise ValueError(f"{os.path.basename(path)}: unsupported language '{language}'")
+                ignore_path = os.path.join(get_user_files_path(language), "IgnoreList.txt")
+                added[language] = added.get(language, 0) + len(merge_into_ignore_list(words, ignore_path))
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not merge ignored words:\n{e}")
+            return
+
+        summary = ", ".join(f"{count} new ({language})" for language, count in added.items())
+        self.status_var.set(f"Ignore list updated: {summary}")
+        messagebox.showinfo("Ignore List Updated",
+                            f"Merged ignored words into IgnoreList.txt: {summary}.\n"
+                            "The next analysis leaves them out.")
+
     def open_tutorial(self):
         try:
             webbrowser.open("https://github.com/SonicSandbox/surasura/blob/main/docs/Tutorial.md")
         except Exception as e:
             messagebox.showerror("Error", f"Could not open tutorial: {e}")
             
-    def run_command_async(self, cmd, desc, capture_output=False, show_spinner=False):
-        """Runs a command with optional output redirection to the terminal"""
+    def run_command_async(self, cmd, desc, capture_output=False, show_spinner=False, cancel_file=None, on_exit=None):
+        """
+        Runs a command with optional output redirection to the terminal.
+        If cancel_file is given, the command supports cooperative stopping via that flag file.
+        on_exit (optional) is called on the GUI thread once the command has finished.
+        """
         
         # UI updates must be queued
         def _start_loading():
             self.status_var.set(f"Running {desc}...")
             
             # Show spinner only if requested
+            # (Indeterminate until the first progress event switches it to a real bar)
             if show_spinner and self.spinner:
+                self.spinner.config(mode='indeterminate', value=0)
                 self.spinner.pack(fill=tk.X, pady=(5, 0))
                 self.spinner.start(10)
-
-            # Clear terminal only if it exists
-            if capture_output and self.terminal:
-                self.terminal.config(state=tk.NORMAL)
-                self.terminal.delete(1.0, tk.END)
-                self.terminal.config(state=tk.DISABLED)
+                if cancel_file and self.btn_stop:
+                    self.stop_button_owner = cancel_file
+                    self.btn_stop.config(state=tk.NORMAL)
+                    self.btn_stop.pack(fill=tk.X, pady=(5, 0))
+
+            # Clear terminal (and its scrollback/full log) for the new run
+            if capture_output:
+                self.log_pipeline.clear()
+                if self.terminal:
+                    self.terminal.config(state=tk.NORMAL)
+                    self.terminal.delete(1.0, tk.END)
+                    self.terminal.config(state=tk.DISABLED)
         
         self.gui_queue.put(_start_loading)
 
@@ -900,7 +1022,8 @@ class MasterDashboardApp:
                 'static_html_generator.py': 'static_generator',
                 'migaku_converter.py': 'convert_db',
                 'anki_db_importer_gui.py': 'anki_importer',
-                'frequency_list_gui.py': 'frequency_list_manager'
+                'frequency_list_gui.py': 'frequency_list_manager',
+                'corpus_frequency.py': 'corpus_frequency'
             }
             
             try:
@@ -948,16 +1071,30 @@ class MasterDashboardApp:
                 
                 # Register process for coordinated shutdown
                 self.active_processes.append(process)
+                if cancel_file:
+                    self.cancel_files[process] = cancel_file
                 
                 if capture_output and process.stdout:
+                    # Latest event per language of a multi-language run (shown as one bar)
+                    language_events = {}
                     for line in process.stdout:
+                        # Progress events drive the progress bar instead of the log
+                        event = parse_progress_line(line)
+                        if event is not None:
+                            if event.get("language"):
+                                language_events[event["language"]] = event
+                                event = combine_progress(language_events.values())
+                            self.update_progress(desc, event)
+                            continue
                         # Log line safely
                         self.log_to_terminal(line.strip())
                     process.wait()
                 else:
                     process.wait()
                 
-                if process.returncode != 0:
+                if process.returncode == CANCELLED_EXIT_CODE and cancel_file:
+                     self.log_to_terminal(f"\n[INFO] {desc} stopped. Progress was saved; the next run continues from there.")
+                elif process.returncode != 0:
                      self.log_to_terminal(f"\n[ERROR] {desc} exited with code {process.returncode}")
                 
                 self.gui_queue.put(lambda: self.status_var.set("Ready"))
@@ -974,24 +1111,82 @@ class MasterDashboardApp:
                      self.status_var.set("Error")
                 self.gui_queue.put(_show_error)
             finally:
+                if cancel_file:
+                    self.cancel_files = {p: f for p, f in self.cancel_files.items() if f != cancel_file}
+                    try:
+                        os.remove(cancel_file)
+                    except OSError:
+                        pass
+
                 def _stop_loading():
-                    if capture_output and self.spinner:
+                    if show_spinner and self.spinner:
                         self.spinner.stop()
+                        self.spinner.config(mode='indeterminate', value=0)
                         self.spinner.pack_forget()
+                    if cancel_file and self.btn_stop and self.stop_button_owner == cancel_file:
+                        self.stop_button_owner = None
+                        self.btn_stop.pack_forget()
+                    if on_exit:
+                        on_exit()
                 self.gui_queue.put(_stop_loading)
                     
         threading.Thread(target=task, daemon=True).start()
 
+    def update_progress(self, desc, event):
+        """Turns an analyzer progress event into a determinate progress bar + status text"""
+        def _update():
+            if self.spinner:
+                if str(self.spinner.cget('mode')) != 'determinate':
+                    self.spinner.stop()
+                    self.spinner.config(mode='determinate', maximum=100)
+                self.spinner.config(value=event.get("percent", 0))
+            self.status_var.set(f"{desc}: {describe_progress(event)}")
+        self.gui_queue.put(_update)
+
+    def request_cancel(self, only=None):
+        """
+        Asks cancellable runs (the analyzer) to stop at the next file boundary.
+        only: restrict to the run using this cancel file (default: the Stop button's run, or all on close).
+        """
+        requested = False
+        for proc, flag_path in list(self.cancel_files.items()):
+            if only and flag_path != only:
+                continue
+            if proc.poll() is None:
+                try:
+                    with open(flag_path, "w", encoding="utf-8") as f:
+                        f.write("cancel\n")
+                    requested = True
+                except OSError as e:
+                    print(f"Warning: Could not request stop: {e}")
+        if requested:
+            self.status_var.set("Stopping after the current file...")
+            if self.btn_stop:
+                self.btn_stop.config(state=tk.DISABLED)
+        return requested
+
     def on_closing(self):
-        """Coordinated shutdown: terminate all active sub-processes"""
+        """Coordinated shutdown: stop the analyzer cleanly, terminate all other sub-processes"""
         if self.active_processes:
             self.status_var.set("Closing sub-windows...")
+
+            # Give cancellable runs a moment to save their checkpoint at a file boundary
+            if self.request_cancel():
+                self.root.update_idletasks()
+                deadline = time.monotonic() + CANCEL_GRACE_SECONDS
+                for proc in list(self.cancel_files):
+                    try:
+                        proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+                    except Exception:
+                        pass
+
             for proc in self.active_processes:
                 try:
                     if proc.poll() is None: # Still running
                         proc.terminate()
                 except Exception:
                     pass
+        self.log_pipeline.close()
         self.root.destroy()
 
     def run_migaku_importer(self):
@@ -1012,9 +1207,16 @@ class MasterDashboardApp:
     def run_frequency_list_manager(self):
         self.run_command_async(['frequency_list_gui.py', '--language', self.var_language.get()], "Frequency List Manager")
 
-    def run_analyzer(self):
-        from app.path_utils import ensure_data_setup
-        ensure_data_setup(self.var_language.get())
+    def new_cancel_file(self):
+        """Unique flag file path used to ask a child run to stop cleanly"""
+        return os.path.join(tempfile.gettempdir(), f"surasura_cancel_{os.getpid()}_{int(time.time() * 1000)}.flag")
+
+    def build_analyzer_args(self, languages=None):
+        """
+        Analyzer arguments from the current dashboard settings (shared by one-off and watch runs).
+        languages: analyze these side by side instead of the selected language.
+        """
+        languages = languages or [self.var_language.get()]
         args = ['analyzer.py']
         if not self.var_exclude_single.get():
             args.append('--include-single-chars')
@@ -1028,16 +1230,17 @@ class MasterDashboardApp:
                 args.append(f'--min-freq={min_freq}')
         
         args.append('--static')
+        args.append('--progress-format=json')
         
-        # Add Language
-        args.append(f'--language={self.var_language.get()}')
+        # Add Language(s)
+        args.append(f'--language={",".join(languages)}')
         
         # Add Sanitization Flag if applicable (only for Japanese)
-        if self.var_language.get() == 'ja' and self.var_sanitize_ja.get():
+        if 'ja' in languages and self.var_sanitize_ja.get():
             args.append('--sanitize')
         
         # Add Reinforce Flag if applicable
-        if self.var_language.get() == 'zh' and self.var_reinforce.get():
+        if 'zh' in languages and self.var_reinforce.get():
             args.append('--reinforce')
         
         # Add theme argument
@@ -1060,7 +1263,41 @@ class MasterDashboardApp:
         if zen_limit > 0:
             args.append(f'--zen-limit={zen_limit}')
 
-        self.run_command_async(args, "Analyzer", capture_output=True, show_spinner=True)
+        return args
+
+    def run_analyzer(self, all_languages=False):
+        from app.path_utils import ensure_data_setup
+        languages = list(SUPPORTED_LANGUAGES) if all_languages else [self.var_language.get()]
+        for lang in languages:
+            ensure_data_setup(lang)
+        args = self.build_analyzer_args(languages)
+
+        # Pick up an interrupted run if nothing changed since (ignored otherwise)
+        args.append('--resume')
+        cancel_file = self.new_cancel_file()
+        args.append(f'--cancel-file={cancel_file}')
+
+        self.run_command_async(args, "Analyzer", capture_output=True, show_spinner=True, cancel_file=cancel_file)
+
+    def toggle_watch(self):
+        """Starts/stops a background 'analyzer.py --watch' that refreshes the page when content changes"""
+        if self.var_watch.get():
+            if self.watch_cancel_file:
+                return
+            from app.path_utils import ensure_data_setup
+            ensure_data_setup(self.var_language.get())
+            args = self.build_analyzer_args()
+            self.watch_cancel_file = self.new_cancel_file()
+            args += ['--watch', f'--cancel-file={self.watch_cancel_file}']
+
+            def _watch_ended():
+                self.watch_cancel_file = None
+                self.var_watch.set(False)
+
+            self.run_command_async(args, "Auto-refresh", capture_output=True,
+                                   cancel_file=self.watch_cancel_file, on_exit=_watch_ended)
+        elif self.watch_cancel_file:
+            self.request_cancel(only=self.watch_cancel_file)
 
     def run_static_page(self):
         # Add theme argument for static page generation only
@@ -1075,6 +1312,7 @@ class MasterDashboardApp:
         selected_theme = self.combo_theme.get()
         theme_arg = theme_map.get(selected_theme, 'default')
         args.append(f'--theme={theme_arg}')
+        args.append(f'--language={self.var_language.get()}')
 
         if self.var_open_app_mode.get():
             args.append('--app-mode')
@@ -1090,7 +1328,10 @@ class MasterDashboardApp:
         """Show dialog to choose export format"""
         from app.path_utils import get_user_file
         
-        results_dir = get_user_file("results")
+        from app.results_utils import get_active_run_dir
+        
+        # The active result of the selected language (another language may have run last)
+        results_dir = get_active_run_dir(get_user_file("results"), self.var_language.get())
         priority_csv = os.path.join(results_dir, "priority_learning_list.csv")
 
         if not os.path.exists(priority_csv) or os.path.getsize(priority_csv) == 0:
@@ -1131,6 +1372,15 @@ class MasterDashboardApp:
         btn_txt.pack(fill=tk.X, pady=5)
         ToolTip(btn_txt, "Export as a plain text file (one word per line).")
 
+    def build_corpus_frequency_list(self):
+        """Builds frequency_list_<lang>_<folder name>.csv from a corpus folder (see corpus_frequency.py)."""
+        folder = filedialog.askdirectory(title="Select a corpus folder (.txt, .srt, .ass, .epub)")
+        if not folder:
+            return
+        name = os.path.basename(os.path.normpath(folder)) or "Corpus"
+        self.run_command_async(['corpus_frequency.py', '--language', self.var_language.get(), '--name', name, folder],
+                               "Corpus Frequency List", capture_output=True, show_spinner=True)
+
     def export_wrapper(self, dialog, format_type, csv_path):
         from tkinter import filedialog
         from app.frequency_exporter import FrequencyExporter
@@ -1,7 +1,6 @@
 import os
 import sqlite3
 import json
-from datetime import datetime
 import sys
 
 # Ensure package root is in sys.path
@@ -9,6 +8,7 @@ if __name__ == "__main__" and __package__ is None:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.path_utils import get_user_file, get_user_files_path
+from app import known_word_store
 
 def convert_db_to_json(db_path, output_json=None, language=None):
     if not output_json:
@@ -66,15 +66,9 @@ def convert_db_to_json(db_path, output_json=None, language=None):
 
         print(f"Found {len(words)} words")
 
-        # Calculate statistics
-        stats = {
-            'totalWords': len(words),
-            'knownWords': sum(1 for w in words if w['knownStatus'] == "KNOWN"),
-            'unknownWords': sum(1 for w in words if w['knownStatus'] == "UNKNOWN"),
-            'ignoredWords': sum(1 for w in words if w['knownStatus'] == "IGNORED"),
-            'learningWords': sum(1 for w in words if w['knownStatus'] == "LEARNING"),
-            'languages': sorted(list(set(w['language'] for w in words)))
-        }
+        # Bulk write into the indexed store; statistics come from its running counts
+        print(f"\nWriting JSON to: {output_json}")
+        stats = known_word_store.save_words(output_json, words, language, databaseFile=str(db_path))
 
         print("\nStatistics:")
         print(f"  Total Words: {stats['totalWords']}")
@@ -87,17 +81,6 @@ def convert_db_to_json(db_path, output_json=None, language=None):
         languages_str = ", ".join([str(l) for l in languages_list])
         print(f"  Languages: {languages_str}")
 
-        print(f"\nWriting JSON to: {output_json}")
-        json_data = {
-            'exportDate': datetime.now().isoformat(),
-            'databaseFile': str(db_path),
-            'statistics': stats,
-            'words': words
-        }
-
-        with open(output_json, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
-
         print(f"JSON exported: {output_json}")
 
         conn.close()
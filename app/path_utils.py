@@ -1,7 +1,11 @@
 import os
 import sys
+import json
 import shutil
 
+# Target languages with a tokenizer and their own data/<lang> and User Files/<lang> folders
+SUPPORTED_LANGUAGES = ("ja", "zh")
+
 def is_frozen():
     """Check if the application is running in a frozen (packaged) environment."""
     return getattr(sys, 'frozen', False)
@@ -59,6 +63,16 @@ def get_persistent_user_data_path():
         
     return path
 
+def get_cache_path():
+    """
+    Get the directory for rebuildable caches (e.g. the pre-built jieba dictionary).
+    Lives under the persistent user data path so it survives application updates.
+    """
+    path = os.path.join(get_persistent_user_data_path(), "cache")
+    if not os.path.exists(path):
+        os.makedirs(path, exist_ok=True)
+    return path
+
 def get_resource(path):
     """Resolve a resource path relative to the bundle."""
     return os.path.join(get_base_path(), path)
@@ -95,6 +109,47 @@ def get_ico_path():
     """Returns the path to the application .ico file (Windows)."""
     return get_resource(os.path.join("app", "assets", "images", "app_icon.ico"))
 
+def get_manifest_path(language):
+    """User Files/<language>/master_manifest.json (Immersion Architect's schedule)."""
+    return os.path.join(get_user_files_path(language), "master_manifest.json")
+
+# Schedule phases in reading order, and the scan target each origin maps back to
+MANIFEST_PHASES = ("PHASE_1_NOW", "PHASE_2_SOON", "PHASE_3_LATER")
+MANIFEST_ORIGIN_LABELS = {"01_NOW": "HighPriority", "02_SOON": "LowPriority", "03_LATER": "GoalContent"}
+
+def read_manifest_files(manifest_path, data_dir, warn=True):
+    """
+    (abs_path, phase, label) of every scheduled file that exists, in schedule order, each
+    path once. label is the scan target of the item's origin ("GoalContent" by default).
+    Shared by the analyzer and the page, so both agree on what is GoalContent.
+    Raises OSError/ValueError if the manifest can't be read.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    schedule = manifest.get("schedule", {})
+    files = []
+    seen_paths = set()
+    for phase_key in MANIFEST_PHASES:
+        for item in schedule.get(phase_key, []):
+            # Immersion Architect stores os.path.relpath(file, data_root), sometimes as "./..."
+            rel_path = item.get("physical_path", "")
+            if rel_path.startswith("./"):
+                rel_path = rel_path[2:]
+            abs_path = os.path.join(data_dir, rel_path)
+
+            if not os.path.exists(abs_path):
+                if warn:
+                    print(f"Warning: Manifest file not found: {abs_path}")
+                continue
+            if abs_path in seen_paths:
+                continue
+            seen_paths.add(abs_path)
+
+            label = MANIFEST_ORIGIN_LABELS.get(item.get("origin_source", "03_LATER"), "GoalContent")
+            files.append((abs_path, phase_key, label))
+    return files
+
 def ensure_data_setup(language=None):
     """
     Ensures that the data folders exist and copies samples into them if they are empty.
@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+
+# Every event line starts with this exact text, so the dashboard can tell
+# progress events apart from regular log output without parsing every line.
+PROGRESS_EVENT_PREFIX = '{"event": "progress"'
+
+STAGE_LABELS = {
+    "scan": "Scanning",
+    "aggregate": "Analyzing",
+    "progressive": "Building journey",
+    "write": "Saving results",
+    "static": "Generating page",
+    "done": "Done",
+}
+
+
+class ProgressReporter:
+    """
+    Emits machine-readable progress events for long analyzer runs.
+
+    With format "json" every event is one JSON object per line on stdout:
+        {"event": "progress", "stage": "aggregate", "files_done": 3, "files_total": 10,
+         "percent": 15.0, "tokens_per_sec": 5230.1, "bytes_per_sec": 81234.5, "eta_seconds": 42.0}
+
+    Work is measured in bytes of input files. The analyzer reads every file once per
+    pass (aggregation + progressive report), so the run's total work is passes * total_bytes.
+    With format "text" (default) nothing extra is printed.
+    In a multi-language run (--language ja,zh) each language's events carry a "language" key.
+    """
+    def __init__(self, progress_format="text", passes=2, stream=None, clock=time.monotonic, language=None):
+        self.enabled = progress_format == "json"
+        self.passes = passes
+        self.language = language
+        self.stream = stream
+        self.clock = clock
+
+        self.file_sizes = {}
+        self.files_total = 0
+        self.total_bytes = 0
+        self.stage = "scan"
+        self.files_done = 0
+        self.bytes_done = 0
+        # Bytes counted as done without being processed now (resumed from a checkpoint)
+        self.bytes_skipped = 0
+        self.tokens_done = 0
+        self.started = clock()
+
+    def begin(self, file_paths):
+        """Records the input sizes up front so ETA and percentage are known from the first file."""
+        self.file_sizes = {}
+        for path in file_paths:
+            try:
+                self.file_sizes[path] = os.path.getsize(path)
+            except OSError:
+                self.file_sizes[path] = 0
+        self.files_total = len(file_paths)
+        self.total_bytes = sum(self.file_sizes.values())
+        self.started = self.clock()
+        self.set_stage("scan")
+
+    def set_stage(self, stage):
+        self.stage = stage
+        self.files_done = 0
+        self.emit()
+
+    def file_done(self, file_path, tokens=0):
+        self.files_done += 1
+        self.bytes_done += self.file_sizes.get(file_path, 0)
+        self.tokens_done += tokens
+        self.emit()
+
+    def file_skipped(self, file_path):
+        """A file already covered by a checkpoint: counts toward percent but not toward rates."""
+        size = self.file_sizes.get(file_path, 0)
+        self.files_done += 1
+        self.bytes_done += size
+        self.bytes_skipped += size
+
+    def finish(self):
+        self.stage = "done"
+        self.files_done = self.files_total
+        self.bytes_done = self.passes * self.total_bytes
+        self.emit()
+
+    def snapshot(self):
+        elapsed = max(self.clock() - self.started, 1e-6)
+        total_work = self.passes * self.total_bytes
+        bytes_per_sec = (self.bytes_done - self.bytes_skipped) / elapsed
+
+        if total_work > 0:
+            fraction = min(self.bytes_done / total_work, 1.0)
+        elif self.files_total > 0:
+            # Only empty files: fall back to counting files over both passes
+            fraction = min(self.files_done / (self.passes * self.files_total), 1.0)
+        else:
+            fraction = 1.0 if self.stage == "done" else 0.0
+
+        eta = None
+        if self.stage == "done":
+            eta = 0.0
+        elif bytes_per_sec > 0 and total_work > 0:
+            eta = round((total_work - self.bytes_done) / bytes_per_sec, 1)
+
+        event = {
+            "event": "progress",
+            "stage": self.stage,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "percent": round(fraction * 100, 1),
+            "tokens_per_sec": round(self.tokens_done / elapsed, 1),
+            "bytes_per_sec": round(bytes_per_sec, 1),
+            "eta_seconds": eta,
+        }
+        if self.language:
+            event["language"] = self.language
+        return event
+
+    def emit(self):
+        if not self.enabled:
+            return
+        stream = self.stream or sys.stdout
+        try:
+            # Flush immediately: stdout is a pipe when launched from the dashboard
+            stream.write(json.dumps(self.snapshot()) + "\n")
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def parse_progress_line(line):
+    """Returns the event dict if the line is a progress event, otherwise None."""
+    line = line.strip()
+    if not line.startswith(PROGRESS_EVENT_PREFIX):
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def combine_progress(events):
+    """
+    One overall event from the latest event of each language of a multi-language run.
+    Languages run side by side, so the run is as far along as the languages' mean
+    (weighted by file count) and finishes when the slowest one does.
+    """
+    events = list(events)
+    if not events:
+        return None
+    weights = [max(e.get("files_total", 0), 1) for e in events]
+    percent = sum(w * e.get("percent", 0) for w, e in zip(weights, events)) / sum(weights)
+    etas = [e.get("eta_seconds") for e in events if e.get("stage") != "done"]
+    slowest = min(events, key=lambda e: e.get("percent", 0))
+    return {
+        "event": "progress",
+        "stage": "done" if all(e.get("stage") == "done" for e in events) else slowest.get("stage"),
+        "files_done": sum(e.get("files_done", 0) for e in events),
+        "files_total": sum(e.get("files_total", 0) for e in events),
+        "percent": round(percent, 1),
+        "tokens_per_sec": round(sum(e.get("tokens_per_sec", 0) for e in events), 1),
+        "bytes_per_sec": round(sum(e.get("bytes_per_sec", 0) for e in events), 1),
+        "eta_seconds": None if None in etas else max(etas, default=0.0),
+        "languages": sorted(e.get("language", "") for e in events),
+    }
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def format_rate(bytes_per_sec):
+    if bytes_per_sec < 1024:
+        return f"{int(bytes_per_sec)} B/s"
+    if bytes_per_sec < 1024 * 1024:
+        return f"{bytes_per_sec / 1024:.1f} KB/s"
+    return f"{bytes_per_sec / (1024 * 1024):.1f} MB/s"
+
+
+def describe_progress(event):
+    """Human-readable one-liner for the dashboard status bar."""
+    label = STAGE_LABELS.get(event.get("stage"), event.get("stage", ""))
+    if event.get("languages"):
+        label = f"{label} ({', '.join(event['languages'])})"
+    parts = [label]
+    if event.get("files_total") and event.get("stage") in ("aggregate", "progressive"):
+        parts.append(f"{event.get('files_done', 0)}/{event['files_total']} files")
+    if event.get("stage") != "done":
+        if event.get("bytes_per_sec"):
+            parts.append(format_rate(event["bytes_per_sec"]))
+        parts.append(f"ETA {format_eta(event.get('eta_seconds'))}")
+    return " · ".join(parts)
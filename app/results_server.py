@@ -0,0 +1,459 @@
+"""
+Local results server (analyzer --visualize).
+
+The static page has to embed every word list, which gets slow for very large libraries.
+This serves the same template with only a small index, and the page fetches the words it
+is about to show from a JSON API:
+
+  GET  /                     web_app.html with the index (files, counts, growth bars);
+                             also for Zen Mode, whose zen_app.html needs embedded lists
+  GET  /api/index            the same index as JSON
+  GET  /api/words            a page of a list: list=progressive&file=<name> or list=priority,
+                             optional tier=<source:tier or source> and q=<term>,
+                             offset/limit -> {"total", "offset", "rows"}
+  GET  /api/search?q=        matches across all lists (same ranking as the page's search box)
+  POST /api/ignore           {"words": [...]} -> appended to User Files/<lang>/IgnoreList.txt
+
+Standard library only, bound to localhost. Results are re-read when the active run or the
+ignore list changes, so it can keep running next to --watch. Responses carry an ETag
+(derived from the data version, so unchanged pages are answered with 304 without being
+built) and are gzipped when the browser accepts it.
+"""
+import os
+import sys
+import json
+import gzip
+import time
+import bisect
+import hashlib
+import threading
+import webbrowser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from app.path_utils import get_user_file, get_user_files_path
+from app.results_utils import get_active_run_dir, get_active_pointer_path
+from app.ignore_utils import read_ignore_entries, merge_into_ignore_list
+from app.search_utils import build_search_index, search, CONTEXT_FIELDS
+from app import static_html_generator
+from app.static_html_generator import StringTable, load_report_data, _json_for_script, _json_value
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+SEARCH_LIMIT = 200
+# Smaller bodies aren't worth compressing
+GZIP_MIN_BYTES = 1024
+# Filtered lists (tier / search term) kept per data version
+FILTER_CACHE_SIZE = 32
+
+RESULT_FILES = ("progressive_learning_list.csv", "priority_learning_list.csv", "file_statistics.json")
+
+
+def _stat_signature(path):
+    try:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    except OSError:
+        return None
+
+
+def file_growth(words):
+    """The comprehension bar of a file (same numbers as calculateFileStats in the page)."""
+    if not words:
+        return None
+    first, last = words[0], words[-1]
+
+    def number(value):
+        value = _json_value(value)
+        try:
+            return float(value) if value is not None else 0
+        except (TypeError, ValueError):
+            return 0
+
+    return {
+        "baseline": number(first.get("Baseline %")),
+        "start": number(first.get("Current %")),
+        "target": number(last.get("New %")),
+        "known": _json_value(last.get("Known Count")) or 0,
+        "total": _json_value(last.get("Total Count")) or 0,
+    }
+
+
+def matches_tier(row, tier):
+    """tier: a full "source:tier" entry ("global:1"), a source name ("global") or "Outside"."""
+    value = row.get("Tier")
+    if not isinstance(value, str):
+        return False
+    for part in value.split(";"):
+        if part == tier or part.split(":", 1)[0] == tier:
+            return True
+    return False
+
+
+def matches_term(row, term):
+    """term (lowercase): prefix of the Word or Reading, or part of one of the contexts."""
+    for field in ("Word", "Reading"):
+        value = row.get(field)
+        if isinstance(value, str) and value.lower().startswith(term):
+            return True
+    return any(isinstance(row.get(field), str) and term in row[field].lower() for field in CONTEXT_FIELDS)
+
+
+def load_served_page_settings(theme, language):
+    """
+    load_page_settings() for a served page. Only web_app.html loads its lists from the API
+    (zen_app.html needs them embedded), so Zen Mode is served with the standard page.
+    """
+    page = static_html_generator.load_page_settings(theme, language)
+    if os.path.basename(page["template"]) != "web_app.html" or page["theme"] == "Zen Mode":
+        page = dict(page, template=static_html_generator.get_resource(os.path.join("templates", "web_app.html")),
+                    theme="default")
+    return page
+
+
+class ResultsView:
+    """
+    One version of the results: the report data of the active run with the ignore list
+    applied. Immutable once built, so request threads share it without locking.
+    """
+    def __init__(self, data, ignored, version):
+        self.version = version
+        self.ignored = ignored
+
+        def visible(rows):
+            return [row for row in rows if row.get("Word") not in ignored] if ignored else list(rows)
+
+        self.files = {}
+        self.file_names = []
+        for entry in data["progressive"]:
+            self.files[entry["filename"]] = visible(entry["words"])
+            self.file_names.append(entry["filename"])
+        self.priority = visible(data["priority"])
+
+        self.index = {
+            # Relative, so the page also works behind a path prefix
+            "api": "api",
+            "progressive": [
+                {
+                    "filename": entry["filename"],
+                    "word_count": len(self.files[entry["filename"]]),
+                    "total_words": entry["total_words"],
+                    "is_goal_content": entry["is_goal_content"],
+                    "growth": file_growth(entry["words"]),
+                }
+                for entry in data["progressive"]
+            ],
+            "completed_files": data["completed_files"],
+            "file_order": data["file_order"],
+            "priority_count": len(self.priority),
+        }
+        self._lock = threading.Lock()
+        self._filtered = {}
+        self._search = None
+
+    def rows_of(self, list_name, filename=None):
+        if list_name == "priority":
+            return self.priority
+        return self.files.get(filename)
+
+    def filtered(self, list_name, filename=None, tier=None, term=None):
+        """A list with the tier/search filters applied (None if there is no such list)."""
+        rows = self.rows_of(list_name, filename)
+        if rows is None or not (tier or term):
+            return rows
+        key = (list_name, filename, tier, term)
+        with self._lock:
+            cached = self._filtered.get(key)
+        if cached is not None:
+            return cached
+        if tier:
+            rows = [row for row in rows if matches_tier(row, tier)]
+        if term:
+            rows = [row for row in rows if matches_term(row, term)]
+        with self._lock:
+            if len(self._filtered) >= FILTER_CACHE_SIZE:
+                self._filtered.pop(next(iter(self._filtered)))
+            self._filtered[key] = rows
+        return rows
+
+    def _search_index(self):
+        """search_utils' index over every list, built on the first search."""
+        with self._lock:
+            if self._search is None:
+                lists = [(i, self.files[name]) for i, name in enumerate(self.file_names)]
+                lists.append((-1, self.priority))
+                strings = StringTable()
+                for _, rows in lists:
+                    for row in rows:
+                        for field in CONTEXT_FIELDS:
+                            if isinstance(row.get(field), str) and row[field]:
+                                strings.code(row[field])
+                index = build_search_index(lists, strings)
+                starts = [first for _, first in index["lists"]]
+                self._search = (index, strings.values, lists, starts)
+            return self._search
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Matches as the page's search worker reports them, plus the position in their list."""
+        index, strings, lists, starts = self._search_index()
+        q = query.strip().lower()
+        results = []
+        for entry in search(index, strings, query, limit):
+            k = bisect.bisect_right(starts, entry) - 1
+            list_id, rows = lists[k]
+            position = entry - starts[k]
+            row = rows[position]
+            word = row.get("Word") or ""
+            reading = row.get("Reading") if isinstance(row.get("Reading"), str) else ""
+            terms = [str(word).lower(), reading.lower()]
+            sentence = None
+            if q in terms:
+                rank = 0
+            elif any(term.startswith(q) for term in terms if term):
+                rank = 1
+            else:
+                rank = 2
+                sentence = next((row[field] for field in CONTEXT_FIELDS
+                                 if isinstance(row.get(field), str) and q in row[field].lower()), None)
+            results.append({"list": list_id, "index": position, "word": word, "reading": reading,
+                            "rank": rank, "sentence": sentence})
+        return results
+
+
+class ResultsStore:
+    """The current ResultsView of a language, rebuilt when the active run or the ignore list changes."""
+    def __init__(self, language, results_dir=None):
+        self.language = language
+        self.results_dir = results_dir or get_user_file("results")
+        self.ignore_path = os.path.join(get_user_files_path(language), "IgnoreList.txt")
+        self._lock = threading.Lock()
+        self._data = None
+        self._data_signature = None
+        self._view = None
+        self._view_signature = None
+
+    def _run_dir(self):
+        return get_active_run_dir(self.results_dir, self.language)
+
+    def current(self):
+        run_dir = self._run_dir()
+        data_signature = (run_dir, _stat_signature(get_active_pointer_path(self.results_dir)),
+                          tuple(_stat_signature(os.path.join(run_dir, name)) for name in RESULT_FILES))
+        ignore_signature = _stat_signature(self.ignore_path)
+        with self._lock:
+            if data_signature != self._data_signature:
+                paths = [os.path.join(run_dir, name) for name in RESULT_FILES]
+                self._data = load_report_data(*paths, self.language)
+                self._data_signature = data_signature
+            signature = (data_signature, ignore_signature)
+            if signature != self._view_signature:
+                version = hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:16]
+                self._view = ResultsView(self._data, read_ignore_entries(self.ignore_path), version)
+                self._view_signature = signature
+            return self._view
+
+    def add_ignored(self, words):
+        """Appends the words that aren't in IgnoreList.txt yet; returns them."""
+        with self._lock:
+            return merge_into_ignore_list(words, self.ignore_path)
+
+
+def _int_param(params, name, default, minimum=0, maximum=None):
+    try:
+        value = int(params.get(name, [default])[0])
+    except (TypeError, ValueError):
+        value = default
+    value = max(minimum, value)
+    return min(value, maximum) if maximum is not None else value
+
+
+class ResultsRequestHandler(BaseHTTPRequestHandler):
+    server_version = "SurasuraResults/1"
+
+    def log_message(self, format, *args):
+        # Every word page is a request; only errors are worth printing
+        pass
+
+    # --- Responses ---
+    def send_body(self, body, content_type, etag=None, status=200):
+        if etag and etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        if callable(body):
+            body = body()
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        use_gzip = len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", "")
+        if use_gzip:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if etag:
+            self.send_header("ETag", etag)
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def send_json(self, value, etag=None, status=200):
+        self.send_body(lambda: json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str),
+                       "application/json; charset=utf-8", etag, status)
+
+    def send_error_json(self, status, message):
+        self.send_json({"error": message}, status=status)
+
+    # --- GET ---
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        try:
+            view = self.server.store.current()
+        except Exception as e:
+            self.send_error_json(500, f"Could not load results: {e}")
+            return
+        # Same data version + same request -> same body
+        etag = '"%s-%s"' % (view.version, hashlib.sha1(self.path.encode("utf-8")).hexdigest()[:12])
+
+        if url.path in ("/", "/index.html"):
+            page = load_served_page_settings(self.server.theme, self.server.store.language)
+            html_content = static_html_generator.render_page(page, _json_for_script(view.index))
+            # Depends on the template and settings too, so tagged by content
+            self.send_body(html_content, "text/html; charset=utf-8",
+                           '"%s"' % hashlib.sha1(html_content.encode("utf-8")).hexdigest()[:16])
+        elif url.path == "/api/index":
+            self.send_json(view.index, etag)
+        elif url.path == "/api/words":
+            self.get_words(view, params, etag)
+        elif url.path == "/api/search":
+            query = params.get("q", [""])[0]
+            limit = _int_param(params, "limit", SEARCH_LIMIT, 1, SEARCH_LIMIT)
+
+            def body():
+                started = time.perf_counter()
+                results = view.search(query, limit) if query.strip() else []
+                ms = round((time.perf_counter() - started) * 1000)
+                return json.dumps({"query": query, "results": results, "ms": ms}, ensure_ascii=False, default=str)
+            self.send_body(body, "application/json; charset=utf-8", etag)
+        else:
+            self.send_error_json(404, "Not found")
+
+    def get_words(self, view, params, etag):
+        list_name = params.get("list", ["progressive"])[0]
+        filename = params.get("file", [None])[0]
+        if list_name not in ("progressive", "priority") or (list_name == "progressive" and filename is None):
+            self.send_error_json(400, "Use list=priority or list=progressive&file=<name>")
+            return
+        tier = params.get("tier", [""])[0].strip() or None
+        term = params.get("q", [""])[0].strip().lower() or None
+        offset = _int_param(params, "offset", 0)
+        limit = _int_param(params, "limit", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+
+        rows = view.filtered(list_name, filename, tier, term)
+        if rows is None:
+            self.send_error_json(404, f"No word list for file '{filename}'")
+            return
+        self.send_json({
+            "total": len(rows),
+            "offset": offset,
+            "rows": [{key: _json_value(value) for key, value in row.items()} for row in rows[offset:offset + limit]],
+        }, etag)
+
+    # --- POST ---
+    def do_POST(self):
+        if urlsplit(self.path).path != "/api/ignore":
+            self.send_error_json(404, "Not found")
+            return
+        # Only JSON bodies: a page on another site can't send those to us without a preflight we never allow
+        if not self.headers.get("Content-Type", "").startswith("application/json"):
+            self.send_error_json(415, "Expected application/json")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length).decode("utf-8")) if length else {}
+        except (ValueError, UnicodeDecodeError):
+            self.send_error_json(400, "Invalid JSON")
+            return
+        if not isinstance(payload, dict):
+            self.send_error_json(400, "Expected a JSON object")
+            return
+        words = payload.get("words")
+        if words is None:
+            words = [payload.get("word")]
+        if not isinstance(words, list):
+            self.send_error_json(400, "'words' must be a list")
+            return
+        try:
+            added = self.server.store.add_ignored(words)
+        except Exception as e:
+            self.send_error_json(500, f"Could not update IgnoreList.txt: {e}")
+            return
+        self.send_json({"added": added})
+
+
+def make_server(language, host=DEFAULT_HOST, port=DEFAULT_PORT, results_dir=None, theme="default"):
+    """A ready (not yet serving) results server; port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), ResultsRequestHandler)
+    server.daemon_threads = True
+    server.store = ResultsStore(language, results_dir)
+    server.theme = theme
+    return server
+
+
+def start_in_background(language, host=DEFAULT_HOST, port=DEFAULT_PORT, results_dir=None, theme="default"):
+    """Serves from a daemon thread (e.g. next to --watch); returns the server."""
+    server = make_server(language, host, port, results_dir, theme)
+    threading.Thread(target=server.serve_forever, name="results-server", daemon=True).start()
+    return server
+
+
+def server_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/"
+
+
+def serve_results(language, host=DEFAULT_HOST, port=DEFAULT_PORT, results_dir=None, theme="default", open_browser=True):
+    """Serves the results until Ctrl+C."""
+    try:
+        server = make_server(language, host, port, results_dir, theme)
+    except OSError as e:
+        print(f"Error: Could not start the results server on {host}:{port}: {e}")
+        return
+    url = server_url(server)
+    print(f"Serving {language} results at {url} (Ctrl+C to stop)")
+    if open_browser:
+        webbrowser.open(url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nResults server stopped.")
+    finally:
+        server.server_close()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the analysis results locally")
+    parser.add_argument("--language", default="ja", help="Language whose results to serve")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--theme", default="default")
+    parser.add_argument("--no-browser", action="store_true", help="Don't open the page")
+    args = parser.parse_args()
+    serve_results(args.language, args.host, args.port, theme=args.theme, open_browser=not args.no_browser)
+
+
+if __name__ == "__main__":
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+    main()
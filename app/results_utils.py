@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from datetime import datetime
+
+from app.file_utils import atomic_write, atomic_write_json, file_lock
+
+# Every analysis run writes into its own folder under results/runs/, so runs for
+# different languages or settings never overwrite each other's files while they work.
+# Finished runs are "published": results/active.json is atomically swapped to point at
+# the run, and its files are mirrored into results/ for older tools and bookmarks.
+#
+# Only active.json is a consistent view. The mirror is replaced file by file, so a reader
+# of results/*.csv/json that takes no lock can see one run's word_stats.json next to
+# another run's lists. Everything in Surasura reads through get_active_run_dir(); the
+# mirrored files are each complete, just not guaranteed to belong together.
+RUNS_DIR_NAME = "runs"
+ACTIVE_POINTER_NAME = "active.json"
+RUN_INFO_NAME = "run.json"
+
+# Outputs that are mirrored into results/ when a run is published
+PUBLISHED_FILES = (
+    "priority_learning_list.csv",
+    "progressive_learning_list.csv",
+    "file_statistics.txt",
+    "file_statistics.json",
+    "word_stats.json",
+    "reading_list_static.html",
+)
+
+# Finished runs kept per language (the active ones are never pruned)
+DEFAULT_KEEP_RUNS = 3
+# Unfinished run folders older than this are assumed to be from a crashed run
+STALE_RUN_SECONDS = 24 * 60 * 60
+
+
+def compute_config_hash(options):
+    """Short, stable hash of the run options (language, filters, logic settings)."""
+    raw = json.dumps(options, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:10]
+
+
+def get_runs_dir(results_dir):
+    return os.path.join(results_dir, RUNS_DIR_NAME)
+
+
+def get_active_pointer_path(results_dir):
+    return os.path.join(results_dir, ACTIVE_POINTER_NAME)
+
+
+def create_run_dir(results_dir, language, config_hash):
+    """
+    Creates results/runs/<lang>_<config>_<timestamp>_<pid>/ and returns its path.
+    The pid keeps two runs with the same settings started in the same second apart
+    (a counter is added for back-to-back runs of one process, e.g. --watch).
+    """
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(get_runs_dir(results_dir), f"{language}_{config_hash}_{stamp}_{os.getpid()}")
+    os.makedirs(get_runs_dir(results_dir), exist_ok=True)
+    path, counter = base, 1
+    while True:
+        try:
+            os.mkdir(path)
+            return path
+        except FileExistsError:
+            counter += 1
+            path = f"{base}-{counter}"
+
+
+def read_run_info(run_dir):
+    """The run.json of a finished run, or None for a run that is still going (or crashed)."""
+    try:
+        with open(os.path.join(run_dir, RUN_INFO_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_active_pointer(results_dir):
+    try:
+        with open(get_active_pointer_path(results_dir), 'r', encoding='utf-8') as f:
+            pointer = json.load(f)
+        return pointer if isinstance(pointer, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def get_active_run_dir(results_dir, language=None):
+    """
+    Folder holding the active result for `language` (or the most recently published run).
+    Falls back to results/ itself, which also covers results written by older versions.
+    """
+    pointer = read_active_pointer(results_dir)
+    entry = pointer.get("languages", {}).get(language) if language else pointer.get("latest")
+    if entry:
+        run_dir = os.path.join(get_runs_dir(results_dir), entry["run"])
+        if os.path.isdir(run_dir):
+            return run_dir
+    return results_dir
+
+
+def _copy_atomic(source, target):
+    with open(source, 'rb') as src, atomic_write(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+
+
+def publish_run(results_dir, run_dir, language, config_hash):
+    """
+    Marks run_dir as finished and makes it the active result for its language.
+
+    Under the pointer's lock: the run's outputs are mirrored into results/ (each file
+    replaced atomically) and then active.json is swapped to point at the run. Runs that
+    finish at the same time publish one after the other, never interleaved.
+
+    The swap of active.json is the only atomic step: readers that don't take the lock
+    must go through get_active_run_dir() to get all files of one run; the legacy copies
+    in results/ can mix files of two runs while a publish is in progress.
+    """
+    run_name = os.path.basename(run_dir)
+    entry = {
+        "run": run_name,
+        "language": language,
+        "config": config_hash,
+        "published": datetime.now().isoformat(timespec="seconds"),
+    }
+    atomic_write_json(os.path.join(run_dir, RUN_INFO_NAME), entry, indent=2, ensure_ascii=False)
+
+    pointer_path = get_active_pointer_path(results_dir)
+    with file_lock(pointer_path):
+        for name in PUBLISHED_FILES:
+            source = os.path.join(run_dir, name)
+            target = os.path.join(results_dir, name)
+            if os.path.exists(source):
+                _copy_atomic(source, target)
+            elif os.path.exists(target):
+                # e.g. no progressive list this time: don't leave the previous run's file around
+                os.remove(target)
+
+        pointer = read_active_pointer(results_dir)
+        pointer.setdefault("languages", {})[language] = entry
+        pointer["latest"] = entry
+        atomic_write_json(pointer_path, pointer, indent=2, ensure_ascii=False)
+
+
+def prune_runs(results_dir, keep=DEFAULT_KEEP_RUNS, now=None):
+    """
+    Retention: keeps the `keep` newest finished runs of each language plus every active run,
+    and removes unfinished run folders once they are older than STALE_RUN_SECONDS.
+    Returns the names of the removed runs.
+    """
+    runs_dir = get_runs_dir(results_dir)
+    if not os.path.isdir(runs_dir):
+        return []
+    now = time.time() if now is None else now
+
+    pointer = read_active_pointer(results_dir)
+    active_by_language = pointer.get("languages", {})
+    protected = {entry["run"] for entry in active_by_language.values()}
+    if pointer.get("latest"):
+        protected.add(pointer["latest"]["run"])
+
+    finished = {}
+    removed = []
+    for name in sorted(os.listdir(runs_dir)):
+        path = os.path.join(runs_dir, name)
+        if not os.path.isdir(path) or name in protected:
+            continue
+        info = read_run_info(path)
+        if info is None:
+            if now - os.path.getmtime(path) > STALE_RUN_SECONDS:
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(name)
+            continue
+        finished.setdefault(info.get("language"), []).append((info.get("published", ""), name))
+
+    for language, runs in finished.items():
+        runs.sort(reverse=True)
+        # The active run counts towards `keep`
+        keep_others = max(keep - (1 if language in active_by_language else 0), 0)
+        for _, name in runs[keep_others:]:
+            shutil.rmtree(os.path.join(runs_dir, name), ignore_errors=True)
+            removed.append(name)
+    return removed
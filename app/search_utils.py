@@ -0,0 +1,163 @@
+"""
+Search index for the static page (web_app.html).
+
+Built once by static_html_generator and embedded as its own data block; the page hands it
+to a Web Worker that answers queries without touching the word lists or the DOM.
+
+  Word / Reading:  terms sorted case-insensitively, with the entries they belong to
+                   -> prefix search by binary search on the terms
+  Contexts:        character bigrams -> sentences containing them; a query intersects the
+                   postings of its bigrams, then confirms the candidates with a substring test
+
+Sentences are not repeated here: they are referenced by their code in the page's shared
+string table (contexts are always dictionary-encoded there).
+"""
+
+# Posting lists (sorted ids) are written as delta varints in base 32: digits of a number
+# that are followed by more use the first alphabet, its last digit the second. Every
+# character is plain ASCII that needs no escaping in JSON or HTML.
+POSTING_DIGITS = "0123456789abcdefghijklmnopqrstuv"
+POSTING_LAST_DIGITS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ@$%&*+"
+
+NGRAM_SIZE = 2
+CONTEXT_FIELDS = ("Context 1", "Context 2", "Context 3")
+
+
+def encode_varints(numbers):
+    out = []
+    for n in numbers:
+        while n >= 32:
+            out.append(POSTING_DIGITS[n & 31])
+            n >>= 5
+        out.append(POSTING_LAST_DIGITS[n])
+    return "".join(out)
+
+
+def decode_varints(text):
+    numbers = []
+    value = shift = 0
+    for char in text:
+        digit = POSTING_DIGITS.find(char)
+        if digit >= 0:
+            value |= digit << shift
+            shift += 5
+            continue
+        numbers.append(value | POSTING_LAST_DIGITS.index(char) << shift)
+        value = shift = 0
+    return numbers
+
+
+def encode_postings(ids):
+    """Sorted ids as the varints of their gaps (small numbers -> mostly one character each)."""
+    ids = sorted(set(ids))
+    return encode_varints(n - previous for previous, n in zip([0] + ids, ids))
+
+
+def decode_postings(text):
+    ids = []
+    previous = 0
+    for delta in decode_varints(text):
+        previous += delta
+        ids.append(previous)
+    return ids
+
+
+def _js_order(text):
+    """Sort key matching JavaScript's string comparison (UTF-16 code units)."""
+    return text.encode("utf-16-be")
+
+
+def ngrams(text, size=NGRAM_SIZE):
+    text = text.lower()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def build_search_index(lists, strings):
+    """
+    lists: [(list_id, rows)] with list_id = position of the file in the index's
+    "progressive" list, or -1 for the priority list. strings: the page's StringTable,
+    which already holds every context (see CONTEXT_FIELDS).
+
+    Entries are numbered in the order of `lists` ("lists" holds [list_id, first entry]);
+    for each the index keeps its Word and Reading as positions in "terms", which is all
+    the page needs to show a match and jump to it.
+    """
+    list_starts = []
+    entry_terms = []  # (word, reading) per entry
+    sentence_entries = {}
+
+    for list_id, rows in lists:
+        list_starts.append([list_id, len(entry_terms)])
+        for row in rows:
+            entry = len(entry_terms)
+            word = row.get("Word")
+            reading = row.get("Reading")
+            entry_terms.append(("" if word is None else str(word), reading if isinstance(reading, str) else ""))
+            for field in CONTEXT_FIELDS:
+                context = row.get(field)
+                if isinstance(context, str) and context:
+                    sentence_entries.setdefault(strings.code(context), []).append(entry)
+
+    # Words and readings share one list of terms, sorted case-insensitively for prefix search
+    term_entries = {}
+    for entry, (word, reading) in enumerate(entry_terms):
+        for term in (word, reading):
+            if term:
+                term_entries.setdefault(term, []).append(entry)
+    terms = sorted(term_entries, key=lambda term: (_js_order(term.lower()), _js_order(term)))
+    term_ids = {term: i for i, term in enumerate(terms)}
+
+    sentences = sorted(sentence_entries)
+    grams = {}
+    for position, code in enumerate(sentences):
+        for gram in ngrams(strings.values[code]):
+            grams.setdefault(gram, []).append(position)
+
+    return {
+        "ngram": NGRAM_SIZE,
+        "lists": list_starts,
+        # Term position + 1 per entry (0: no reading)
+        "entry_words": encode_varints(term_ids[word] + 1 if word else 0 for word, _ in entry_terms),
+        "entry_readings": encode_varints(term_ids[reading] + 1 if reading else 0 for _, reading in entry_terms),
+        "terms": terms,
+        "term_entries": [encode_postings(term_entries[term]) for term in terms],
+        "sentences": sentences,
+        "sentence_entries": [encode_postings(sentence_entries[code]) for code in sentences],
+        "grams": {gram: encode_postings(positions) for gram, positions in grams.items()},
+    }
+
+
+def search(index, strings, query, limit=200):
+    """
+    Reference implementation of the page's search worker: entry ids matching `query`,
+    exact Word/Reading matches first, then prefix matches, then context matches.
+    """
+    import bisect
+    q = query.strip().lower()
+    if not q:
+        return []
+    hits = {}
+
+    terms = index["terms"]
+    lowered = [_js_order(term.lower()) for term in terms]
+    k = bisect.bisect_left(lowered, _js_order(q))
+    while k < len(terms) and terms[k].lower().startswith(q) and len(hits) < limit:
+        for entry in decode_postings(index["term_entries"][k]):
+            hits.setdefault(entry, 0 if terms[k].lower() == q else 1)
+        k += 1
+
+    grams = ngrams(q, index["ngram"])
+    if grams and len(hits) < limit:
+        candidates = None
+        for gram in grams:
+            positions = set(decode_postings(index["grams"].get(gram, "")))
+            candidates = positions if candidates is None else candidates & positions
+        for position in sorted(candidates):
+            if q not in strings[index["sentences"][position]].lower():
+                continue
+            for entry in decode_postings(index["sentence_entries"][position]):
+                hits.setdefault(entry, 2)
+            if len(hits) >= limit:
+                break
+
+    return sorted(hits, key=lambda entry: (hits[entry], entry))[:limit]
@@ -1,11 +1,16 @@
 import os
+import re
 import sys
 import json
+import hashlib
 import pandas as pd
 import webbrowser
 
-from app.path_utils import get_user_file, get_resource
+from app.path_utils import get_user_file, get_resource, get_data_path, get_manifest_path, read_manifest_files
 from app import settings_manager
+from app.file_utils import atomic_write_text
+from app.search_utils import build_search_index, CONTEXT_FIELDS
+from app.results_utils import get_active_run_dir
 
 # Configuration
 RESULTS_DIR = get_user_file("results")
@@ -15,6 +20,155 @@ OUTPUT_FILE = os.path.join(RESULTS_DIR, "reading_list_static.html")
 # Resources (Templates)
 WEB_APP_FILE = get_resource(os.path.join("templates", "web_app.html"))
 
+# Word lists are embedded as separate <script type="application/json"> blocks with these ids,
+# so the page only has to parse the small index up front and decodes a file's words when shown
+DATA_BLOCK_PREFIX = "surasura-data-"
+PRIORITY_BLOCK_ID = DATA_BLOCK_PREFIX + "priority"
+STRINGS_BLOCK_ID = DATA_BLOCK_PREFIX + "strings"
+SEARCH_BLOCK_ID = DATA_BLOCK_PREFIX + "search"
+# Bumped when the embedded data changes shape, so pages from older versions aren't reused
+DATA_FORMAT_VERSION = 2
+
+# Inputs of the last build, stamped into the page: <meta name="surasura-build" content="<page> <data>">
+BUILD_STAMP_NAME = "surasura-build"
+BUILD_STAMP_RE = re.compile(r'<meta name="%s" content="(\w+) (\w+)">' % BUILD_STAMP_NAME)
+# The index literal is compact JSON, so it never spans lines
+GLOBAL_DATA_RE = re.compile(r"let globalData = ([^\n]*);\n")
+
+# Text columns with at most this share of distinct values are stored as codes into the
+# shared string table (tiers, file names, sources); unique text (words, contexts) stays inline
+DICTIONARY_MAX_DISTINCT_RATIO = 0.5
+
+def _json_for_script(value):
+    """
+    Compact UTF-8 JSON that is safe inside a <script> element
+    ("</script>" or "<!--" can't appear in it).
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+
+def _json_value(v):
+    """
+    pandas' NaN (missing cell) -> None (JSON.parse has no NaN); 3.0 -> 3 (columns with gaps are float).
+    "" -> None as well, so in-memory rows and rows read back from the CSVs encode the same.
+    """
+    if v == "":
+        return None
+    if isinstance(v, float):
+        if v != v:
+            return None
+        if v.is_integer():
+            return int(v)
+    return v
+
+class StringTable:
+    """Distinct strings shared by every data block; columns refer to them by position."""
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        if value is None:
+            return None
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+def encode_columns(rows, strings, dictionary_fields=()):
+    """
+    Columnar form of a list of row dicts: {"n": row_count, "cols": {field: column}}.
+
+    Instead of repeating every key in every row, each field is one of:
+      [v0, v1, ...]      plain array (numbers stay numbers)
+      {"c": v}           the same value for every row (e.g. "Source File" within a file)
+      {"s": [codes]}     repetitive text, as positions in the shared StringTable
+    dictionary_fields are always stored as codes (contexts: shared by the lists and the search index).
+    """
+    fields = []
+    for row in rows:
+        for key in row:
+            if key not in fields:
+                fields.append(key)
+
+    cols = {}
+    for field in fields:
+        values = [_json_value(row.get(field)) for row in rows]
+        distinct = set(values)
+        if len(distinct) == 1 and len(values) > 1:
+            cols[field] = {"c": values[0]}
+        elif all(v is None or isinstance(v, str) for v in distinct) and (
+                field in dictionary_fields
+                or (len(values) > 1 and len(distinct) <= len(values) * DICTIONARY_MAX_DISTINCT_RATIO)):
+            cols[field] = {"s": [strings.code(v) for v in values]}
+        else:
+            cols[field] = values
+    return {"n": len(rows), "cols": cols}
+
+def split_data_blocks(data, search=True):
+    """
+    Returns (index, blocks): `data` with every progressive file's "words" and the "priority"
+    list replaced by a block id + row count, and the list of (block_id, payload) taken out.
+    Payloads are columnar (see encode_columns), followed by the search index (search_utils,
+    unless search=False) and the shared string table as the last block.
+    """
+    strings = StringTable()
+    index = dict(data)
+    blocks = []
+    index["progressive"] = []
+    for i, item in enumerate(data.get("progressive", [])):
+        entry = {k: v for k, v in item.items() if k != "words"}
+        entry["block"] = f"{DATA_BLOCK_PREFIX}file-{i}"
+        entry["word_count"] = len(item.get("words", []))
+        blocks.append((entry["block"], encode_columns(item.get("words", []), strings, CONTEXT_FIELDS)))
+        index["progressive"].append(entry)
+
+    priority = index.pop("priority", [])
+    index["priority_block"] = PRIORITY_BLOCK_ID
+    index["priority_count"] = len(priority)
+    blocks.append((PRIORITY_BLOCK_ID, encode_columns(priority, strings, CONTEXT_FIELDS)))
+
+    if search:
+        # Entries point back at their list: a file's position in "progressive", or -1 for priority
+        search_lists = [(i, item.get("words", [])) for i, item in enumerate(data.get("progressive", []))]
+        search_lists.append((-1, priority))
+        index["search_block"] = SEARCH_BLOCK_ID
+        blocks.append((SEARCH_BLOCK_ID, build_search_index(search_lists, strings)))
+
+    index["strings_block"] = STRINGS_BLOCK_ID
+    blocks.append((STRINGS_BLOCK_ID, strings.values))
+    return index, blocks
+
+def decode_columns(payload, strings):
+    """Row dicts back from an encode_columns() payload (what the page does lazily, per field)."""
+    rows = [{} for _ in range(payload["n"])]
+    for field, col in payload["cols"].items():
+        if isinstance(col, list):
+            values = col
+        elif "c" in col:
+            values = [col["c"]] * payload["n"]
+        else:
+            values = [None if code is None else strings[code] for code in col["s"]]
+        for row, value in zip(rows, values):
+            row[field] = value
+    return rows
+
+def render_data_blocks(blocks):
+    return "\n".join(
+        f'<script type="application/json" id="{block_id}">{_json_for_script(payload)}</script>'
+        for block_id, payload in blocks
+    )
+
+def embed_data_blocks(html_content, blocks):
+    """Places the data blocks at the end of <body>, after the page's own scripts and markup."""
+    return _embed_blocks_html(html_content, render_data_blocks(blocks))
+
+def _embed_blocks_html(html_content, blocks_html):
+    head, sep, tail = html_content.rpartition("</body>")
+    if not sep:
+        return html_content + "\n" + blocks_html
+    return f"{head}{blocks_html}\n{sep}{tail}"
+
 def open_as_app(file_path):
     """
     Attempts to open the HTML file in a 'tightened' browser window (App Mode).
@@ -42,178 +196,197 @@ def open_as_app(file_path):
     # Fallback to standard browser behavior
     webbrowser.open(url)
 
-def generate_static_html(theme="default", app_mode=False, zen_limit=0):
-    print(f"Generating static HTML (Theme: {theme})...")
-    
-    # Pre-load settings
-    try:
-        settings = settings_manager.load_settings()
-        target_lang = settings.get("target_language", "ja")
-    except Exception:
-        settings = {}
-        target_lang = "ja"
-    data = {
-        "progressive": [],
-        "priority": []
-    }
+def open_in_browser(file_path, app_mode=False):
+    if app_mode:
+        open_as_app(file_path)
+    else:
+        url = f"file://{os.path.abspath(file_path)}"
+        webbrowser.open(url)
 
-    # Load File Statistics
-    STATS_JSON = os.path.join(RESULTS_DIR, "file_statistics.json")
-    stats_map = {}
-    if os.path.exists(STATS_JSON):
+def get_goal_files(language):
+    """
+    Names of the GoalContent files, from the same source the analyzer scheduled them from:
+    master_manifest.json when it lists any file, else the data/<lang>/GoalContent folder.
+    The lists name files by their base name ("Source File"), so that is what is collected.
+    """
+    manifest_path = get_manifest_path(language)
+    if os.path.exists(manifest_path):
         try:
-            with open(STATS_JSON, 'r', encoding='utf-8') as f:
-                stats = json.load(f)
-                for s in stats:
-                    stats_map[s["File"]] = s
+            scheduled = read_manifest_files(manifest_path, get_data_path(language), warn=False)
         except Exception as e:
-            print(f"Error loading stats JSON: {e}")
+            print(f"Warning: Could not read manifest for GoalContent: {e}")
+            scheduled = []
+        if scheduled:
+            return {os.path.basename(path) for path, _, label in scheduled if label == "GoalContent"}
+
+    goal_files = set()
+    for _, _, files in os.walk(os.path.join(get_data_path(language), "GoalContent")):
+        goal_files.update(files)
+    return goal_files
+
+def build_report_data(progressive_rows, priority_rows, file_stats, goal_files=()):
+    """
+    The page's data from the analysis results: progressive rows grouped per file (in
+    sequence order), files without new words as "completed_files", and the priority list.
+    Takes the analyzer's in-memory rows directly, or the rows read back from the CSVs.
+    """
+    stats_map = {s["File"]: s for s in file_stats}
 
+    # Rows come out of the progressive pass file by file; group in one pass, keeping the order
+    files = {}
+    first_seq = {}
+    for row in progressive_rows:
+        filename = row["Source File"]
+        if filename not in files:
+            files[filename] = []
+            first_seq[filename] = row["Sequence"]
+        files[filename].append(row)
+    files_order = sorted(files, key=lambda name: first_seq[name])
+
+    data = {
+        "progressive": [
+            {
+                "filename": filename,
+                "words": files[filename],
+                "total_words": stats_map.get(filename, {}).get("Total Words", 0),
+                "is_goal_content": filename in goal_files
+            }
+            for filename in files_order
+        ],
+        "priority": list(priority_rows),
+    }
+    # Files in stats but not in progressive
+    data["completed_files"] = [
+        {"filename": fname, "stats": fstat}
+        for fname, fstat in stats_map.items() if fname not in files
+    ]
     # Track overall order from statistics
-    all_files_order = []
-    if os.path.exists(STATS_JSON):
+    data["file_order"] = [s["File"] for s in file_stats]
+    return data
+
+def load_report_data(progressive_csv, priority_csv, stats_json, language):
+    """build_report_data() from the files of a finished analysis (--static-only, or the GUI's rebuild)."""
+    file_stats = []
+    if os.path.exists(stats_json):
         try:
-            with open(STATS_JSON, 'r', encoding='utf-8') as f:
-                stats = json.load(f)
-                all_files_order = [s["File"] for s in stats]
-        except: pass
+            with open(stats_json, 'r', encoding='utf-8') as f:
+                file_stats = json.load(f)
+        except Exception as e:
+            print(f"Error loading stats JSON: {e}")
 
-    # Load Progressive
-    if os.path.exists(PROGRESSIVE_CSV):
+    progressive_rows = []
+    if os.path.exists(progressive_csv):
         try:
-            df = pd.read_csv(PROGRESSIVE_CSV)
-            # Group by Source File
-            files_order = df.groupby("Source File")["Sequence"].min().sort_values().index.tolist()
-            
-                
-            grouped = df.groupby("Source File")
-            for filename in files_order:
-                group = grouped.get_group(filename)
-                words = group.to_dict(orient="records")
-                
-                # Get total words from stats if available
-                total_words = stats_map.get(filename, {}).get("Total Words", 0)
-                
-                # Determine if Goal Content
-                is_goal_content = False
-                try:
-                    from app.path_utils import get_user_files_path
-                    # GoalContent is in User Files/<lang>/GoalContent
-                    goal_dir = os.path.join(get_user_files_path(target_lang), "GoalContent")
-                    
-                    # Check if file exists in GoalContent
-                    if os.path.exists(os.path.join(goal_dir, filename)):
-                        is_goal_content = True
-                except Exception:
-                    pass
-
-                data["progressive"].append({
-                    "filename": filename,
-                    "words": words,
-                    "total_words": total_words,
-                    "is_goal_content": is_goal_content
-                })
+            progressive_rows = pd.read_csv(progressive_csv).to_dict(orient="records")
         except Exception as e:
             print(f"Error loading progressive CSV: {e}")
 
-    data["completed_files"] = []
-    
-    # specific progressive files
-    prog_filenames = {item["filename"] for item in data["progressive"]}
-    
-    # Find files in stats but not in progressive
-    for fname, fstat in stats_map.items():
-        if fname not in prog_filenames:
-            data["completed_files"].append({
-                "filename": fname,
-                "stats": fstat
-            })
-
-    # Load Priority
-    if os.path.exists(PRIORITY_CSV):
+    priority_rows = []
+    if os.path.exists(priority_csv):
         try:
-            df = pd.read_csv(PRIORITY_CSV)
-            data["priority"] = df.to_dict(orient="records")
+            priority_rows = pd.read_csv(priority_csv).to_dict(orient="records")
         except Exception as e:
             print(f"Error loading priority CSV: {e}")
 
-    data["file_order"] = all_files_order
+    return build_report_data(progressive_rows, priority_rows, file_stats, get_goal_files(language))
 
-    # Zen Mode Limit (Slicing)
-    if theme == "Zen Mode" and zen_limit > 0:
-        print(f"Applying Zen Mode Limit: {zen_limit} words")
-        count = 0
-        new_progressive = []
-        for item in data["progressive"]:
-            if count >= zen_limit:
-                break
-            
-            words = item["words"]
-            needed = zen_limit - count
-            
-            if len(words) > needed:
-                item["words"] = words[:needed]
-                new_progressive.append(item)
-                count += needed
-                break
-            else:
-                new_progressive.append(item)
-                count += len(words)
-        
-        data["progressive"] = new_progressive
+def _file_digest(path):
+    """sha1 of a file's content ("missing" if it doesn't exist)."""
+    if not os.path.exists(path):
+        return "missing"
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-    # 2. Read Template
-    if theme == "Zen Mode":
-        WEB_APP_FILE = get_resource(os.path.join("templates", "zen_app.html"))
-    else:
-        WEB_APP_FILE = get_resource(os.path.join("templates", "web_app.html"))
+def _fingerprint(parts):
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
 
-    if not os.path.exists(WEB_APP_FILE):
-        print(f"Error: Template file {WEB_APP_FILE} not found.")
-        return
+def read_build_stamp(file_path):
+    """
+    (page_fingerprint, data_fingerprint) stamped into a page we generated, or None.
+    The stamp is a <meta> at the top of <head>, so only the start of the file is read.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            head = f.read(4096)
+    except (OSError, UnicodeDecodeError):
+        return None
+    match = BUILD_STAMP_RE.search(head)
+    return (match.group(1), match.group(2)) if match else None
 
-    with open(WEB_APP_FILE, "r", encoding="utf-8") as f:
-        html_content = f.read()
+def read_embedded_data(file_path):
+    """
+    The already serialized data of a page we generated: (globalData literal, data blocks html).
+    None if the page doesn't have them in the expected place.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            html_content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    literal = GLOBAL_DATA_RE.search(html_content)
+    blocks_start = html_content.find(f'<script type="application/json" id="{DATA_BLOCK_PREFIX}')
+    blocks_end = html_content.rfind("</body>")
+    if not literal or blocks_start < 0 or blocks_end < blocks_start:
+        return None
+    return literal.group(1), html_content[blocks_start:blocks_end].rstrip("\n")
 
-    # 3. Inject Data, Theme, and Favicon
-    import base64
-    from app.path_utils import get_icon_path
-    
-    # Load Logic Settings for injection
-    logic_settings = {}
-    target_lang = "ja" # Default
-    applied_theme = theme
+def load_page_settings(theme="default", language=None):
+    """
+    Everything besides the data that shapes the page: template, theme (the GUI's theme name
+    mapped to the page's), language, logic settings and the icon. Used by the static page
+    and by results_server, which serves the same templates.
+    """
     try:
         settings = settings_manager.load_settings()
-        logic_settings = settings.get("logic", {})
-        target_lang = settings.get("target_language", "ja")
-        
-        # If theme is 'default', try to load from settings and MAP it
-        if applied_theme == "default":
-            raw_theme = settings.get("theme", "default")
-            theme_map = {
-                'Default (Dark)': 'default',
-                'Dark Flow': 'world-class',
-                'Midnight (Vibrant)': 'midnight-vibrant',
-                'Modern Light': 'modern-light',
-                'Zen Mode': 'Zen Mode'
-            }
-            applied_theme = theme_map.get(raw_theme, 'default')
     except Exception as e:
         print(f"Warning: Could not load logic settings for HTML injection: {e}")
+        settings = {}
+
+    applied_theme = theme
+    # If theme is 'default', try to load from settings and MAP it
+    if applied_theme == "default":
+        raw_theme = settings.get("theme", "default")
+        theme_map = {
+            'Default (Dark)': 'default',
+            'Dark Flow': 'world-class',
+            'Midnight (Vibrant)': 'midnight-vibrant',
+            'Modern Light': 'modern-light',
+            'Zen Mode': 'Zen Mode'
+        }
+        applied_theme = theme_map.get(raw_theme, 'default')
+
+    from app.path_utils import get_icon_path
+    template = "zen_app.html" if theme == "Zen Mode" else "web_app.html"
+    return {
+        "template": get_resource(os.path.join("templates", template)),
+        "icon": get_icon_path(),
+        "theme": applied_theme,
+        "language": language or settings.get("target_language", "ja"),
+        # Logic settings for injection
+        "logic": settings.get("logic", {}),
+        "words_per_day": settings.get("words_per_day", 5),
+        "show_words_per_day": settings.get("show_words_per_day", True),
+    }
+
+def render_page(page, json_str, blocks_html=""):
+    """The template of load_page_settings() with the data, theme and favicon injected."""
+    with open(page["template"], "r", encoding="utf-8") as f:
+        html_content = f.read()
 
-    json_str = json.dumps(data)
-    logic_json_str = json.dumps(logic_settings)
-    words_per_day = settings.get("words_per_day", 5) if 'settings' in locals() else 5
-    show_words_per_day = settings.get("show_words_per_day", True) if 'settings' in locals() else True
+    import base64
+    logic_json_str = json.dumps(page["logic"])
 
     html_content = html_content.replace(
         "let globalData = null;", 
-        f"let globalData = {json_str};\n        let globalTheme = '{applied_theme}';\n        let globalLogic = {logic_json_str};\n        let globalLanguage = '{target_lang}';\n        let globalWordsPerDay = {words_per_day};\n        let globalShowWordsPerDay = {'true' if show_words_per_day else 'false'};"
+        f"let globalData = {json_str};\n        let globalTheme = '{page['theme']}';\n        let globalLogic = {logic_json_str};\n        let globalLanguage = '{page['language']}';\n        let globalWordsPerDay = {page['words_per_day']};\n        let globalShowWordsPerDay = {'true' if page['show_words_per_day'] else 'false'};"
     )
 
     # Embed Icon as Favicon and Header Logo
-    icon_path = get_icon_path()
+    icon_path = page["icon"]
     if os.path.exists(icon_path):
         try:
             with open(icon_path, "rb") as icon_file:
@@ -230,16 +403,133 @@ def generate_static_html(theme="default", app_mode=False, zen_limit=0):
         except Exception as e:
             print(f"Warning: Could not embed icon in HTML: {e}")
 
-    # 4. Write Output
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    if blocks_html:
+        html_content = _embed_blocks_html(html_content, blocks_html)
+    return html_content
 
-    print(f"Static HTML generated at: {OUTPUT_FILE}")
-    if app_mode:
-        open_as_app(OUTPUT_FILE)
+def generate_static_html(theme="default", app_mode=False, zen_limit=0, open_browser=True,
+                         results_dir=None, language=None, output_file=None, report_data=None):
+    """
+    Builds reading_list_static.html from the analysis outputs.
+    results_dir/language: read from (and by default write into) a specific analysis run
+    folder, for that run's language. Without it the active run (results/active.json) is
+    read, never the mirrored files in results/, which may be mid-publish; the page is
+    still written to results/.
+    report_data: build_report_data() output handed over by the analyzer, so the lists it
+    just wrote don't have to be read back from disk.
+
+    The page is stamped with fingerprints of its inputs. If nothing changed since the
+    existing page was built it is just opened again; if only the look changed (theme,
+    template, settings) the already serialized word lists are taken over from it.
+    """
+    if not results_dir:
+        active_dir = get_active_run_dir(RESULTS_DIR, language)
+        if active_dir != RESULTS_DIR:
+            results_dir = active_dir
+            output_file = output_file or OUTPUT_FILE
+    if results_dir:
+        progressive_csv = os.path.join(results_dir, os.path.basename(PROGRESSIVE_CSV))
+        priority_csv = os.path.join(results_dir, os.path.basename(PRIORITY_CSV))
+        output_file = output_file or os.path.join(results_dir, os.path.basename(OUTPUT_FILE))
     else:
-        url = f"file://{os.path.abspath(OUTPUT_FILE)}"
-        webbrowser.open(url)
+        results_dir = RESULTS_DIR
+        progressive_csv, priority_csv = PROGRESSIVE_CSV, PRIORITY_CSV
+        output_file = output_file or OUTPUT_FILE
+    stats_json = os.path.join(results_dir, "file_statistics.json")
+    
+    page = load_page_settings(theme, language)
+    target_lang = page["language"]
+    WEB_APP_FILE = page["template"]
+    if not os.path.exists(WEB_APP_FILE):
+        print(f"Error: Template file {WEB_APP_FILE} not found.")
+        return
+
+    # 1. Fingerprint the inputs
+    # data: what ends up in the word lists; page: everything else that shapes the file
+    previous = read_build_stamp(output_file)
+    if previous is None and report_data is not None:
+        # First page of a fresh analyzer run: nothing to compare against and the CSVs
+        # aren't read, so don't hash them either. Rebuilds of it then can't skip once.
+        results = "unhashed"
+    else:
+        results = [_file_digest(path) for path in (progressive_csv, priority_csv, stats_json)]
+    zen_words = zen_limit if theme == "Zen Mode" else 0
+    data_fingerprint = _fingerprint({
+        "results": results,
+        "goal_files": sorted(get_goal_files(target_lang)),
+        "zen_limit": zen_words,
+        "search": theme != "Zen Mode",  # zen_app.html has no search box
+        "format": DATA_FORMAT_VERSION,
+    })
+    page_fingerprint = _fingerprint({
+        "data": data_fingerprint,
+        "template": _file_digest(WEB_APP_FILE),
+        "icon": _file_digest(page["icon"]),
+        "theme": page["theme"],
+        "language": target_lang,
+        "settings": [page["logic"], page["words_per_day"], page["show_words_per_day"]],
+    })
+
+    if previous and previous[0] == page_fingerprint:
+        print(f"Static HTML is up to date: {output_file}")
+        if open_browser:
+            open_in_browser(output_file, app_mode)
+        return
+
+    print(f"Generating static HTML (Theme: {theme})...")
+
+    # 2. Data: reuse the serialized lists of the existing page when only the look changed
+    embedded = read_embedded_data(output_file) if previous and previous[1] == data_fingerprint else None
+    if embedded:
+        print("Results unchanged, reusing the word lists of the existing page.")
+        json_str, blocks_html = embedded
+    else:
+        if report_data is None:
+            data = load_report_data(progressive_csv, priority_csv, stats_json, target_lang)
+        else:
+            data = dict(report_data)
+
+        # Zen Mode Limit (Slicing)
+        if zen_words > 0:
+            print(f"Applying Zen Mode Limit: {zen_limit} words")
+            count = 0
+            new_progressive = []
+            for item in data["progressive"]:
+                if count >= zen_limit:
+                    break
+                
+                words = item["words"]
+                needed = zen_limit - count
+                
+                if len(words) > needed:
+                    # Copy: the entry may belong to the caller's in-memory results
+                    new_progressive.append(dict(item, words=words[:needed]))
+                    count += needed
+                    break
+                else:
+                    new_progressive.append(item)
+                    count += len(words)
+            
+            data["progressive"] = new_progressive
+
+        # Only the small index is a script literal; word lists become lazily decoded data blocks
+        index, blocks = split_data_blocks(data, search=theme != "Zen Mode")
+        json_str = _json_for_script(index)
+        blocks_html = render_data_blocks(blocks)
+
+    # 3. Template with the data, theme and favicon injected
+    html_content = render_page(page, json_str, blocks_html)
+    # Build stamp first in <head>, ahead of the (large) favicon, so it is cheap to read back
+    stamp = f'<meta name="{BUILD_STAMP_NAME}" content="{page_fingerprint} {data_fingerprint}">'
+    html_content = html_content.replace("<head>", f"<head>\n    {stamp}", 1)
+
+    # 4. Write Output
+    # Atomic: a browser refresh (or --watch) never sees a half-written page
+    atomic_write_text(output_file, html_content)
+
+    print(f"Static HTML generated at: {output_file}")
+    if open_browser:
+        open_in_browser(output_file, app_mode)
 
 def main():
     import argparse
@@ -247,8 +537,12 @@ def main():
     parser.add_argument("--theme", default="default", help="Theme name")
     parser.add_argument("--app-mode", action="store_true", help="Launch in professional app mode")
     parser.add_argument("--zen-limit", type=int, default=0, help="Limit words for Zen Mode")
+    parser.add_argument("--language", default=None, help="Build from the active analysis result of this language")
     args = parser.parse_args()
-    generate_static_html(theme=args.theme, app_mode=args.app_mode, zen_limit=args.zen_limit)
+    # Reads the active run of the language (or the latest one); the page itself always
+    # goes to results/ so the browser tab keeps the same address
+    generate_static_html(theme=args.theme, app_mode=args.app_mode, zen_limit=args.zen_limit,
+                         language=args.language, output_file=OUTPUT_FILE)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,77 @@
+import os
+import time
+
+DEFAULT_POLL_SECONDS = 2.0
+DEFAULT_DEBOUNCE_SECONDS = 3.0
+
+
+class FolderWatcher:
+    """
+    Polling watcher for content folders and individual user files.
+
+    Polling (size + mtime snapshots) works the same on Windows, macOS, Linux and
+    network drives, needs no extra dependency, and is cheap at the sizes we deal with.
+    Bursts of changes (e.g. copying a season of subtitles) are debounced: we only
+    report once nothing has changed for `debounce` seconds.
+    """
+    def __init__(self, folders, files, interval=DEFAULT_POLL_SECONDS, debounce=DEFAULT_DEBOUNCE_SECONDS,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.folders = list(folders)
+        self.files = list(files)
+        self.interval = interval
+        self.debounce = debounce
+        self.clock = clock
+        self.sleep = sleep
+
+    def snapshot(self):
+        """Returns {path: (size, mtime_ns)} for every watched file that currently exists."""
+        state = {}
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                continue
+            for root, dirs, files in os.walk(folder):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    state[path] = (st.st_size, st.st_mtime_ns)
+        for path in self.files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state[path] = (st.st_size, st.st_mtime_ns)
+        return state
+
+    @staticmethod
+    def changed_paths(before, after):
+        """Paths that were added, removed or modified between two snapshots."""
+        return {p for p in before.keys() | after.keys() if before.get(p) != after.get(p)}
+
+    def wait_for_changes(self, since, should_stop=lambda: False):
+        """
+        Blocks until the watched files differ from the `since` snapshot and have then
+        been quiet for the debounce period. Returns (changed_paths, new_snapshot),
+        or None if should_stop() became true first.
+        """
+        while True:
+            self.sleep(self.interval)
+            if should_stop():
+                return None
+            latest = self.snapshot()
+            if latest != since:
+                break
+
+        last_change = self.clock()
+        while self.clock() - last_change < self.debounce:
+            self.sleep(self.interval)
+            if should_stop():
+                return None
+            current = self.snapshot()
+            if current != latest:
+                latest = current
+                last_change = self.clock()
+
+        return self.changed_paths(since, latest), latest
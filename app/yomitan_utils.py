@@ -0,0 +1,202 @@
+"""
+Reading Yomitan frequency dictionaries (.zip) without converting them to CSV first.
+
+A frequency dictionary is a zip with an index.json and term_meta_bank_1.json, _2.json, ...
+Each bank is a JSON array of entries like:
+
+    ["の", "freq", 1]
+    ["猫", "freq", {"value": 1500, "displayValue": "1500㋕"}]
+    ["猫", "freq", {"reading": "ねこ", "frequency": 1500}]
+    ["猫", "freq", {"reading": "ねこ", "frequency": {"value": 1500, "displayValue": "1500"}}]
+
+The banks are parsed entry by entry straight from the archive, and the resulting
+word -> rank index is cached (marshal) so later analyzer runs skip the zip entirely.
+"""
+import os
+import re
+import io
+import json
+import marshal
+import hashlib
+import tempfile
+import zipfile
+
+from app.path_utils import get_cache_path
+from app.file_utils import atomic_write
+
+TERM_META_BANK_PATTERN = re.compile(r'(?:^|/)term_meta_bank_(\d+)\.json$')
+# Characters read from a bank per step while parsing
+READ_CHUNK = 1 << 16
+# Bump when the compiled index changes shape, so old caches are ignored
+INDEX_VERSION = 1
+
+_SEPARATORS = re.compile(r'[\s,]*')
+_LEADING_NUMBER = re.compile(r'\s*(\d+)')
+
+
+def list_term_meta_banks(zf):
+    """term_meta_bank_N.json members of an open zip, in bank order."""
+    banks = []
+    for name in zf.namelist():
+        match = TERM_META_BANK_PATTERN.search(name)
+        if match:
+            banks.append((int(match.group(1)), name))
+    return [name for _, name in sorted(banks)]
+
+
+def read_dictionary_info(zip_path):
+    """
+    index.json of a Yomitan frequency dictionary.
+    Raises ValueError if the zip has no term_meta_bank_*.json (e.g. a normal term dictionary).
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        if not list_term_meta_banks(zf):
+            raise ValueError(f"{os.path.basename(zip_path)} is not a Yomitan frequency dictionary")
+        try:
+            with zf.open("index.json") as f:
+                info = json.loads(f.read().decode("utf-8-sig"))
+        except (KeyError, ValueError):
+            info = {}
+    return info if isinstance(info, dict) else {}
+
+
+def iter_json_array(stream):
+    """
+    Yields the elements of a top-level JSON array from a text stream one at a time,
+    so a bank never has to be decoded (or held) as a whole.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos = "", 0
+    started = eof = False
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # A value running up to the end of the buffer may still be cut off (e.g. a number)
+            if end is not None and (end < len(buf) or eof):
+                yield value
+                pos = end
+                continue
+        elif eof:
+            if started:
+                raise ValueError("Unexpected end of JSON array")
+            return
+        chunk = stream.read(READ_CHUNK)
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+
+
+def parse_frequency(data):
+    """
+    (reading, value) of a "freq" entry's data; value is None if there is no usable number.
+    displayValue-only entries use the number it starts with ("1500㋕" -> 1500).
+    """
+    reading = None
+    if isinstance(data, dict) and "frequency" in data:
+        reading = data.get("reading")
+        data = data["frequency"]
+    if isinstance(data, dict):
+        data = data.get("value", data.get("displayValue"))
+
+    if isinstance(data, bool):
+        return reading, None
+    if isinstance(data, (int, float)):
+        value = int(data)
+    elif isinstance(data, str):
+        match = _LEADING_NUMBER.match(data)
+        value = int(match.group(1)) if match else None
+    else:
+        value = None
+    return reading, value if value is not None and value > 0 else None
+
+
+def iter_frequency_entries(zip_path):
+    """Yields (term, reading, value) for every "freq" entry, bank by bank."""
+    with zipfile.ZipFile(zip_path) as zf:
+        for name in list_term_meta_banks(zf):
+            with zf.open(name) as raw:
+                stream = io.TextIOWrapper(raw, encoding="utf-8-sig")
+                for entry in iter_json_array(stream):
+                    # Pitch/IPA entries share the term_meta banks; only "freq" matters here
+                    if not isinstance(entry, list) or len(entry) < 3 or entry[1] != "freq":
+                        continue
+                    term = entry[0]
+                    if not isinstance(term, str) or not term:
+                        continue
+                    reading, value = parse_frequency(entry[2])
+                    if value is not None:
+                        yield term, reading, value
+
+
+def compile_rank_index(zip_path, normalize=None):
+    """
+    word -> rank (int) for a frequency dictionary, the same shape the CSV loader returns.
+    A word listed several times (one entry per reading) keeps its best rank.
+    Occurrence-based dictionaries (higher = more common) are turned into ranks,
+    with equal counts sharing a rank.
+    """
+    info = read_dictionary_info(zip_path)
+    occurrence_based = info.get("frequencyMode") == "occurrence-based"
+
+    index = {}
+    for term, _, value in iter_frequency_entries(zip_path):
+        if normalize is not None:
+            term = normalize(term)
+            if not term:
+                continue
+        best = index.get(term)
+        if best is None or (value > best if occurrence_based else value < best):
+            index[term] = value
+
+    if occurrence_based:
+        ranks = {}
+        for count in sorted(set(index.values()), reverse=True):
+            ranks[count] = len(ranks) + 1
+        index = {term: ranks[count] for term, count in index.items()}
+    return index
+
+
+def get_rank_index_cache_file(zip_path, normalized=False):
+    """Cache path for a zip's compiled index; any change to the zip gives a new name."""
+    stat = os.stat(zip_path)
+    key = repr((INDEX_VERSION, os.path.abspath(zip_path), stat.st_size, stat.st_mtime_ns, normalized))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    try:
+        cache_dir = get_cache_path()
+    except OSError:
+        cache_dir = tempfile.gettempdir()
+    return os.path.join(cache_dir, f"yomitan_freq_{digest}.cache")
+
+
+def load_rank_index(zip_path, normalize=None):
+    """compile_rank_index, served from the persistent cache when the zip is unchanged."""
+    cache_file = get_rank_index_cache_file(zip_path, normalized=normalize is not None)
+    if os.path.isfile(cache_file):
+        try:
+            # One read + loads is several times faster than marshal.load on the file object
+            with open(cache_file, "rb") as f:
+                return marshal.loads(f.read())
+        except Exception:
+            pass
+
+    index = compile_rank_index(zip_path, normalize)
+    try:
+        with atomic_write(cache_file, "wb") as f:
+            marshal.dump(index, f)
+    except Exception as e:
+        print(f"Warning: Could not cache frequency index for {os.path.basename(zip_path)}: {e}")
+    return index
@@ -109,6 +109,12 @@ def main():
                 frequency_list_gui.main()
                 return
 
+            elif command == 'corpus_frequency':
+                from app import corpus_frequency
+                sys.argv = [sys.argv[0]] + sys.argv[2:]
+                corpus_frequency.main()
+                return
+
             elif command == 'anki_importer':
                 from app import anki_db_importer_gui
                 sys.argv = [sys.argv[0]] + sys.argv[2:]
@@ -3,46 +3,79 @@ import base64
 import os
 import sys
 
+TIERS = ["global:1", "global:2;anime:1", "global:3", "global:4;anime:3", "Outside"]
+
 # Mock Data Generator
+# Rows carry every column the analyzer writes, so payload sizes are realistic
 def generate_mock_data(file_count=5, words_per_file=5000):
     progressive = []
-    
+    priority = []
+
     for i in range(file_count):
         filename = f"Massive_File_{i+1}.txt"
         words = []
         for j in range(words_per_file):
             words.append({
-                "Word": f"Word_{i}_{j}",
-                "Reading": "Reading",
-                "Context 1": f"This is context sentence {j} for word {i}-{j}.",
-                "Occurrences (Global)": 10,
-                "Baseline %": 0, "Current %": 0, "New %": 0,
-                "Known Count": 0, "Total Count": words_per_file
+                "Sequence": i + 1,
+                "Source File": filename,
+                "Word": f"単語{i}_{j}",
+                "Reading": f"タンゴ{j}",
+                "Tier": TIERS[j % len(TIERS)],
+                "Score": 10 + j % 40,
+                "Occurrences (Global)": 1 + j % 25,
+                "Occurrences (File)": 1 + j % 7,
+                "Count (High)": j % 5, "Count (Low)": j % 3, "Count (Goal)": 0,
+                "Context 1": f"これは単語{i}_{j}のための例文です。",
+                "Context 2": f"二つ目の例文{j}はもっと長い文になります。" if j % 2 else None,
+                "Context 3": None,
+                "Baseline %": 62.5, "Current %": round(62.5 + j * 0.001, 2), "New %": round(62.5 + (j + 1) * 0.001, 2),
+                "Known Count": 5000 + j, "Total Count": 8000
+            })
+            priority.append({
+                "Word": f"単語{i}_{j}", "Reading": f"タンゴ{j}", "Tier": TIERS[j % len(TIERS)],
+                "Score": 10 + j % 40, "Occurrences": 1 + j % 25,
+                "Count (High)": j % 5, "Count (Low)": j % 3, "Count (Goal)": 0,
+                "Sources": filename, "Context 1": f"これは単語{i}_{j}のための例文です。",
+                "Context 2": None, "Context 3": None
             })
-            
+
         progressive.append({
             "filename": filename,
             "words": words,
             "total_words": words_per_file,
             "is_goal_content": (i % 2 == 0) # Alternate Goal Content
         })
-        
-    return {"progressive": progressive, "priority": [], "completed_files": []}
+
+    return {"progressive": progressive, "priority": priority, "completed_files": []}
+
+def print_payload_comparison(data):
+    """Size of the old inline row-per-dict payload vs the columnar data blocks."""
+    from app.static_html_generator import split_data_blocks, render_data_blocks, _json_for_script
+    legacy = json.dumps(data)
+    index, blocks = split_data_blocks(data)
+    columnar = _json_for_script(index) + render_data_blocks(blocks)
+    print(f"Inline rows:   {len(legacy.encode('utf-8')) / 1e6:.2f} MB")
+    print(f"Columnar:      {len(columnar.encode('utf-8')) / 1e6:.2f} MB")
+    print(f"  index only:  {len(_json_for_script(index).encode('utf-8')) / 1e3:.1f} KB")
 
 def create_test_html():
     # Read template
     with open("templates/web_app.html", "r", encoding="utf-8") as f:
         html = f.read()
-        
+
     data = generate_mock_data()
-    json_str = json.dumps(data)
-    
-    # Inject
-    html = html.replace("let globalData = null;", f"let globalData = {json_str};")
-    
+
+    # Inject the same way the generator does: small index + per-file data blocks
+    sys.path.insert(0, os.getcwd())
+    from app.static_html_generator import split_data_blocks, embed_data_blocks, _json_for_script
+    print_payload_comparison(data)
+    index, blocks = split_data_blocks(data)
+    html = html.replace("let globalData = null;", f"let globalData = {_json_for_script(index)};")
+    html = embed_data_blocks(html, blocks)
+
     with open("debug/perf_test.html", "w", encoding="utf-8") as f:
         f.write(html)
-        
+
     print("Created debug/perf_test.html with ~25,000 words.")
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import pytest
 import os
 import json
 import shutil
+import time
 from app.anki_utils import load_anki_data, extract_field_text, cleanup_temp_dir
 from app.analyzer import JapaneseTokenizer, ChineseTokenizer
 from app.path_utils import get_user_files_path, ensure_data_setup
@@ -74,3 +75,106 @@ def test_anki_knownword_json_update(ja_resources_dir, tmp_path, monkeypatch):
         assert data['statistics']['knownWords'] == 2
 
     root.destroy()
+
+
+def test_extract_known_words_streams_unique_notes(tmp_path, monkeypatch):
+    from tests.test_anki_loader import make_apkg
+    from app import anki_db_importer_gui
+    from app.anki_db_importer_gui import extract_known_words
+
+    sentences = ["猫が好きです。", "犬を飼っています。", "鳥が飛んでいる。"]
+    notes = [(1, f"{sentences[i % 3]}\x1fmeaning") for i in range(30)] + [(2, "別の\x1f型")]
+    apkg_path = tmp_path / "sentences.apkg"
+    make_apkg(apkg_path, notes)
+    _, loaded, model_field_map, _ = load_anki_data(str(apkg_path))
+    try:
+        expected = {(lemma, reading) for lemma, reading, _ in JapaneseTokenizer().tokenize("\n".join(sentences))
+                    if lemma.strip()}
+
+        monkeypatch.setattr(anki_db_importer_gui, "BATCH_NOTES", 2)
+        batches = []
+        known_words_of_batch = anki_db_importer_gui._known_words_of_batch
+
+        def recording(text, tokenizer=None):
+            batches.append(text.split("\n"))
+            return known_words_of_batch(text, tokenizer)
+
+        monkeypatch.setattr(anki_db_importer_gui, "_known_words_of_batch", recording)
+        events = []
+        words = extract_known_words(loaded, model_field_map, "Expression", "ja", workers=1,
+                                    progress=lambda *event: events.append(event))
+        assert words == expected
+        # 30 notes, 3 distinct sentences -> tokenized once each, in two batches
+        assert batches == [sentences[:2], sentences[2:]]
+        assert [(done, total) for done, total, _ in events] == [(2, 30), (30, 30)]
+        assert events[-1][2] == len(expected)
+
+        # Same result through the worker pool
+        monkeypatch.setattr(anki_db_importer_gui, "_known_words_of_batch", known_words_of_batch)
+        monkeypatch.setattr(anki_db_importer_gui, "PARALLEL_MIN_NOTES", 0)
+        assert extract_known_words(loaded, model_field_map, "Expression", "ja", workers=2) == expected
+    finally:
+        loaded.close()
+
+
+def test_deck_inputs_are_locked_during_extraction(monkeypatch):
+    """Picking another deck mid-run must not close the connection the worker is reading."""
+    import threading
+    from types import SimpleNamespace, MethodType
+    from app import anki_db_importer_gui
+    from app.anki_db_importer_gui import AnkiImporterApp
+
+    class Widget:
+        def __init__(self):
+            self.state = "normal"
+
+        def config(self, state):
+            self.state = state
+
+    class Var:
+        def __init__(self, value):
+            self.value = value
+
+        def get(self):
+            return self.value
+
+        def set(self, value):
+            self.value = value
+
+    started, release = threading.Event(), threading.Event()
+
+    def slow_extract(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return {("猫", "ねこ")}
+
+    monkeypatch.setattr(anki_db_importer_gui, "extract_known_words", slow_extract)
+    monkeypatch.setattr(anki_db_importer_gui.messagebox, "askyesno", lambda *a, **k: True)
+    monkeypatch.setattr(anki_db_importer_gui.messagebox, "showinfo", lambda *a, **k: None)
+    monkeypatch.setattr(anki_db_importer_gui.os.path, "exists", lambda path: True)
+
+    after = []
+    loaded = []
+    app = SimpleNamespace(
+        language="ja", extracting=False, anki_notes=[(1, "猫")], anki_model_map={1: ["Expression"]},
+        file_path_var=Var("deck.apkg"), anki_field_var=Var("Expression"), status_var=Var(""),
+        file_entry=Widget(), browse_btn=Widget(), extract_btn=Widget(), anki_field_combo=Widget(),
+        anki_options_frame=None, update_known_words=lambda words: None,
+        load_anki_schema=loaded.append,
+        root=SimpleNamespace(after=lambda ms, callback, *args: after.append(args), destroy=lambda: None))
+    for name in ("set_inputs_enabled", "on_file_change", "process_extraction", "poll_extraction"):
+        setattr(app, name, MethodType(getattr(AnkiImporterApp, name), app))
+
+    app.process_extraction()
+    assert started.wait(5)
+    assert {w.state for w in (app.file_entry, app.browse_btn, app.extract_btn, app.anki_field_combo)} == {"disabled"}
+
+    app.file_path_var.set("other.apkg")
+    app.on_file_change()
+    assert loaded == []
+
+    release.set()
+    while after:
+        time.sleep(0.01)
+        app.poll_extraction(*after.pop())
+    assert app.status_var.get() == "Success!" and not app.extracting
@@ -1,6 +1,7 @@
 
 import pytest
 import os
+import zipfile
 import shutil
 from app.anki_utils import load_anki_data, extract_field_text, cleanup_temp_dir
 
@@ -48,3 +49,64 @@ def test_anki_loader_fields(ja_resources_dir):
         
     finally:
         cleanup_temp_dir(temp_dir)
+
+def make_apkg(path, notes, db_name="collection.anki2", journal_mode=None):
+    """Builds a minimal .apkg: a col table with two note types, the notes, and a media file."""
+    import json
+    import sqlite3
+    import zipfile
+    db_path = str(path) + ".db"
+    conn = sqlite3.connect(db_path)
+    if journal_mode:
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    models = {"1": {"flds": [{"name": "Expression"}, {"name": "Meaning"}]},
+              "2": {"flds": [{"name": "Front"}, {"name": "Back"}]}}
+    conn.execute("CREATE TABLE col (models TEXT)")
+    conn.execute("INSERT INTO col VALUES (?)", (json.dumps(models),))
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, mid INTEGER, flds TEXT)")
+    conn.executemany("INSERT INTO notes (mid, flds) VALUES (?, ?)", notes)
+    conn.commit()
+    conn.close()
+    with zipfile.ZipFile(path, "w") as z:
+        z.write(db_path, db_name)
+        z.writestr("0", b"\x00" * 1024)  # media
+    os.remove(db_path)
+
+
+def test_anki_loader_in_memory(tmp_path):
+    from unittest.mock import patch
+    apkg_path = tmp_path / "deck.apkg"
+    notes = [(1, "<div>猫</div>[sound:neko.mp3]\x1fcat"), (2, "犬\x1fdog"), (1, "&nbsp;\x1fempty"), (1, "鳥&amp;魚\x1fbird")]
+    make_apkg(apkg_path, notes, db_name="collection.anki21")
+
+    # Nothing is extracted to disk any more
+    with patch("tempfile.mkdtemp", side_effect=AssertionError("temp dir created")):
+        all_fields, loaded, model_field_map, temp_dir = load_anki_data(str(apkg_path))
+    try:
+        assert temp_dir is None
+        assert all_fields == ["Back", "Expression", "Front", "Meaning"]
+        assert len(loaded) == 4
+        assert loaded[1:3] == notes[1:3]
+        assert loaded[-1] == notes[-1]
+
+        assert extract_field_text(loaded, model_field_map, "Expression") == "猫\n鳥&魚"
+        assert extract_field_text(loaded[:2], model_field_map, "Back") == "dog"
+        assert extract_field_text(loaded, model_field_map, "Missing") == ""
+    finally:
+        loaded.close()
+
+
+def test_anki_loader_wal_collection(tmp_path):
+    # Collections saved in WAL mode keep that flag in their header
+    apkg_path = tmp_path / "wal.apkg"
+    notes = [(1, "猫\x1fcat"), (2, "犬\x1fdog")]
+    make_apkg(apkg_path, notes, journal_mode="wal")
+    with zipfile.ZipFile(apkg_path) as z:
+        assert z.read("collection.anki2")[18:20] == b"\x02\x02"
+
+    all_fields, loaded, model_field_map, _ = load_anki_data(str(apkg_path))
+    try:
+        assert list(loaded) == notes
+        assert extract_field_text(loaded, model_field_map, "Expression") == "猫"
+    finally:
+        loaded.close()
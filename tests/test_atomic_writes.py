@@ -0,0 +1,181 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import threading
+import pytest
+from types import MethodType, SimpleNamespace
+from unittest.mock import patch
+
+from app import analyzer
+from app.file_utils import (atomic_write, atomic_write_json, atomic_append_text,
+                            file_lock, FileLockTimeout)
+
+
+def test_failed_write_keeps_original(tmp_path):
+    target = tmp_path / "word_stats.json"
+    atomic_write_json(str(target), {"old": 1})
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(target)) as f:
+            f.write('{"new": ')
+            raise RuntimeError("crash mid-write")
+
+    assert json.loads(target.read_text(encoding="utf-8")) == {"old": 1}
+    # No temp files left behind
+    assert sorted(os.listdir(tmp_path)) == ["word_stats.json", "word_stats.json.lock"]
+
+
+def test_lock_times_out_and_is_reentrant(tmp_path):
+    target = str(tmp_path / "master_manifest.json")
+    held = threading.Event()
+    release = threading.Event()
+
+    def holder():
+        with file_lock(target):
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    held.wait(5)
+    try:
+        with pytest.raises(FileLockTimeout):
+            with file_lock(target, timeout=0.2):
+                pass
+    finally:
+        release.set()
+        thread.join()
+
+    with file_lock(target, timeout=1):
+        # The same thread can write while holding the lock for a read-modify-write
+        atomic_write_json(target, {"schedule": {}}, timeout=1)
+
+
+def test_appends_from_several_processes_are_not_lost(tmp_path, project_root):
+    target = tmp_path / "GraduatedList.txt"
+    script = (
+        "import sys\n"
+        "from app.file_utils import atomic_append_text\n"
+        "for i in range(40):\n"
+        "    atomic_append_text(sys.argv[1], f'{sys.argv[2]}-{i}\\n')\n"
+    )
+    env = dict(os.environ, PYTHONPATH=project_root)
+    procs = [subprocess.Popen([sys.executable, "-c", script, str(target), f"p{n}"], env=env) for n in range(4)]
+    for proc in procs:
+        assert proc.wait(timeout=120) == 0
+
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert sorted(lines) == sorted(f"p{n}-{i}" for n in range(4) for i in range(40))
+
+
+def test_analyzer_and_importers_write_concurrently(tmp_path, project_root):
+    """
+    Stress: the analyzer rewrites results/ while the content importer saves the manifest and two
+    Anki imports merge into KnownWord.json. Readers must never see a truncated file and no
+    imported word may be lost.
+    """
+    from app.content_importer_gui import ContentImporterApp
+    from app.anki_db_importer_gui import AnkiImporterApp
+
+    user_files = tmp_path / "User Files" / "ja"
+    high = tmp_path / "data" / "ja" / "HighPriority"
+    results_dir = tmp_path / "results"
+    user_files.mkdir(parents=True)
+    results_dir.mkdir()
+    shutil.copytree(os.path.join(project_root, "samples", "ja", "HighPriority"), high)
+    known_words = [{"dictForm": "猫", "secondary": "ねこ", "knownStatus": "KNOWN", "language": "ja"}] * 200
+    (user_files / "KnownWord.json").write_text(json.dumps({"words": known_words}, ensure_ascii=False), encoding="utf-8")
+    manifest_path = user_files / "master_manifest.json"
+    known_path = user_files / "KnownWord.json"
+
+    importer = SimpleNamespace(get_manifest_path=lambda: str(manifest_path))
+    anki = SimpleNamespace(language="ja")
+    anki._merge_known_words = MethodType(AnkiImporterApp._merge_known_words, anki)
+
+    errors = []
+    stop = threading.Event()
+
+    def guard(fn):
+        def run():
+            try:
+                fn()
+            except Exception as e:
+                errors.append(repr(e))
+        return run
+
+    def run_analyzer():
+        for _ in range(2):
+            analyzer.main()
+
+    def save_manifests():
+        for i in range(60):
+            ContentImporterApp.save_manifest(importer, {"schedule": {"PHASE_3_LATER": []}, "items": ["x" * 50] * i})
+
+    def anki_import(tag):
+        def run():
+            for i in range(5):
+                AnkiImporterApp.update_known_words(anki, {(f"{tag}語{i}", f"{tag}ご{i}")})
+        return run
+
+    def read_everything():
+        while not stop.is_set():
+            for path in (manifest_path, known_path, results_dir / "word_stats.json", results_dir / "file_statistics.json"):
+                if path.exists():
+                    with open(path, encoding="utf-8") as f:
+                        json.load(f)  # raises on a truncated file
+
+    writers = [guard(run_analyzer), guard(save_manifests), guard(anki_import("甲")), guard(anki_import("乙"))]
+
+    with patch("app.path_utils.get_user_file", side_effect=lambda p: str(tmp_path / p)), \
+         patch("app.path_utils.get_data_path", side_effect=lambda lang=None: str(tmp_path / "data" / lang) if lang else str(tmp_path / "data")), \
+         patch("app.path_utils.get_user_files_path", side_effect=lambda lang=None: str(tmp_path / "User Files" / lang) if lang else str(tmp_path / "User Files")), \
+         patch("app.anki_db_importer_gui.get_user_files_path", side_effect=lambda lang: str(user_files)), \
+         patch("app.analyzer.RESULTS_DIR", str(results_dir)), \
+         patch("app.analyzer.OUTPUT_CSV", str(results_dir / "priority_learning_list.csv")), \
+         patch("app.analyzer.OUTPUT_STATS", str(results_dir / "file_statistics.txt")), \
+         patch("app.analyzer.OUTPUT_PROGRESSIVE", str(results_dir / "progressive_learning_list.csv")), \
+         patch("sys.argv", ["analyzer.py", "--language", "ja"]):
+        readers = [threading.Thread(target=guard(read_everything)) for _ in range(2)]
+        threads = [threading.Thread(target=w) for w in writers]
+        for t in readers + threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stop.set()
+        for t in readers:
+            t.join()
+
+    assert errors == []
+    with open(known_path, encoding="utf-8") as f:
+        forms = {w["dictForm"] for w in json.load(f)["words"]}
+    assert {f"{tag}語{i}" for tag in ("甲", "乙") for i in range(5)} <= forms
+    assert len(json.loads(manifest_path.read_text(encoding="utf-8"))["items"]) == 59
+
+
+def test_concurrent_manifest_edits_keep_every_entry(tmp_path):
+    """Two importers adding files at once: each load-modify-save holds the manifest lock."""
+    from app.content_importer_gui import ContentImporterApp
+
+    data_root = tmp_path / "data"
+    (data_root / "HighPriority").mkdir(parents=True)
+    manifest_path = tmp_path / "master_manifest.json"
+    importer = SimpleNamespace(data_root=str(data_root), get_manifest_path=lambda: str(manifest_path))
+    for name in ("load_manifest", "save_manifest", "is_content_file", "add_to_manifest"):
+        setattr(importer, name, MethodType(getattr(ContentImporterApp, name), importer))
+
+    def add_files(tag):
+        for i in range(30):
+            path = data_root / "HighPriority" / f"{tag}{i}.txt"
+            path.write_text("本", encoding="utf-8")
+            importer.add_to_manifest(str(path), "HighPriority")
+
+    threads = [threading.Thread(target=add_files, args=(tag,)) for tag in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    entries = json.loads(manifest_path.read_text(encoding="utf-8"))["schedule"]["PHASE_1_NOW"]
+    assert sorted(e["title"] for e in entries) == sorted(f"{tag}{i}.txt" for tag in ("a", "b") for i in range(30))
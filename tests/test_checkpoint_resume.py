@@ -0,0 +1,114 @@
+import os
+import glob
+import json
+import shutil
+import pytest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from app import analyzer
+from app.checkpoint_utils import CANCELLED_EXIT_CODE, get_checkpoint_path
+
+
+@pytest.fixture
+def resume_env(tmp_path, ja_resources_dir, project_root):
+    """A small ja library (5 files over two priorities) with a KnownWord.json."""
+    user_files_ja = tmp_path / "User Files" / "ja"
+    data_ja = tmp_path / "data" / "ja"
+    user_files_ja.mkdir(parents=True)
+    (tmp_path / "results").mkdir()
+
+    shutil.copy(os.path.join(ja_resources_dir, "KnownWord.json"), user_files_ja / "KnownWord.json")
+    for folder in ("HighPriority", "LowPriority"):
+        shutil.copytree(os.path.join(project_root, "samples", "ja", folder), data_ja / folder)
+    shutil.copy(os.path.join(ja_resources_dir, "context_test.txt"), data_ja / "HighPriority" / "context_test.txt")
+    return tmp_path
+
+
+@contextmanager
+def analyzer_env(root, results_dir):
+    with patch("app.path_utils.get_user_file", side_effect=lambda p: str(root / p)), \
+         patch("app.path_utils.get_data_path", side_effect=lambda lang=None: str(root / "data" / lang) if lang else str(root / "data")), \
+         patch("app.path_utils.get_user_files_path", side_effect=lambda lang=None: str(root / "User Files" / lang) if lang else str(root / "User Files")), \
+         patch("app.analyzer.RESULTS_DIR", str(results_dir)), \
+         patch("app.analyzer.OUTPUT_CSV", str(results_dir / "priority_learning_list.csv")), \
+         patch("app.analyzer.OUTPUT_STATS", str(results_dir / "file_statistics.txt")), \
+         patch("app.analyzer.OUTPUT_PROGRESSIVE", str(results_dir / "progressive_learning_list.csv")):
+        yield
+
+
+def run_analyzer(root, results_dir, *extra):
+    results_dir.mkdir(exist_ok=True)
+    with analyzer_env(root, results_dir), \
+         patch("sys.argv", ["analyzer.py", "--language", "ja", "--checkpoint-every", "1", *extra]):
+        analyzer.main()
+
+
+def read_outputs(results_dir):
+    outputs = {}
+    for name in ("priority_learning_list.csv", "progressive_learning_list.csv", "file_statistics.json"):
+        with open(results_dir / name, encoding="utf-8-sig") as f:
+            outputs[name] = f.read()
+    with open(results_dir / "word_stats.json", encoding="utf-8") as f:
+        stats = json.load(f)
+    for entry in stats.values():
+        entry["sources"] = sorted(entry["sources"])  # set order is not stable across runs
+    outputs["word_stats.json"] = stats
+    return outputs
+
+
+# 5 files: stop after 1 or 3 files of the aggregation pass, or 2 files into the progressive pass
+@pytest.mark.parametrize("stop_after", [1, 3, 7])
+def test_cancel_and_resume_matches_full_run(resume_env, stop_after):
+    root = resume_env
+    run_analyzer(root, root / "full")
+    expected = read_outputs(root / "full")
+
+    results_dir = root / "resumed"
+    cancel_file = root / "cancel.flag"
+    real_extract = analyzer.extract_text
+    calls = []
+
+    def extract_then_cancel(*a, **kw):
+        calls.append(a[0])
+        if len(calls) == stop_after:
+            cancel_file.write_text("cancel")
+        return real_extract(*a, **kw)
+
+    with patch("app.analyzer.extract_text", side_effect=extract_then_cancel):
+        with pytest.raises(SystemExit) as exc:
+            run_analyzer(root, results_dir, "--cancel-file", str(cancel_file))
+    assert exc.value.code == CANCELLED_EXIT_CODE
+
+    # Tagged with the run's config hash
+    checkpoints = glob.glob(get_checkpoint_path(str(results_dir), "ja", "*"))
+    assert len(checkpoints) == 1
+    checkpoint_path = checkpoints[0]
+
+    cancel_file.unlink()
+    with patch("app.analyzer.extract_text", side_effect=extract_then_cancel):
+        calls.clear()
+        run_analyzer(root, results_dir, "--resume")
+
+    # Only the files not covered by the checkpoint were read again
+    assert len(calls) == 10 - stop_after
+    assert read_outputs(results_dir) == expected
+    assert not os.path.exists(checkpoint_path)
+
+
+def test_stale_checkpoint_is_ignored(resume_env):
+    root = resume_env
+    results_dir = root / "results"
+    cancel_file = root / "cancel.flag"
+    cancel_file.write_text("cancel")
+    with pytest.raises(SystemExit):
+        run_analyzer(root, results_dir, "--cancel-file", str(cancel_file))
+    cancel_file.unlink()
+
+    # Any change to the inputs invalidates the checkpoint
+    with open(root / "data" / "ja" / "HighPriority" / "context_test.txt", "a", encoding="utf-8") as f:
+        f.write("\n新しい文です。\n")
+
+    run_analyzer(root, results_dir, "--resume")
+    run_analyzer(root, root / "fresh")
+    assert read_outputs(results_dir) == read_outputs(root / "fresh")
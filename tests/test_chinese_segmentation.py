@@ -0,0 +1,68 @@
+import os
+import jieba
+import pytest
+from unittest.mock import patch
+
+from app import jieba_utils
+from app.analyzer import ChineseTokenizer
+
+
+@pytest.fixture
+def zh_text(zh_resources_dir):
+    parts = []
+    for name in ("chinese_text_1.txt", "context_test.txt"):
+        with open(os.path.join(zh_resources_dir, name), 'r', encoding='utf-8') as f:
+            parts.append(f.read())
+    # Mix in CRLF, blank lines and whitespace runs around the block boundaries
+    return ("\r\n".join(parts) + "\n\n  就把您不。\n") * 20
+
+
+def test_split_blocks_preserves_token_stream(zh_text):
+    blocks = jieba_utils.split_blocks(zh_text, block_chars=200)
+    assert len(blocks) > 1
+    assert "".join(blocks) == zh_text
+
+    blockwise = [w for block in blocks for w in jieba.cut(block, cut_all=False)]
+    assert blockwise == list(jieba.cut(zh_text, cut_all=False))
+
+
+def test_split_blocks_without_newlines():
+    assert jieba_utils.split_blocks("你好世界" * 10, block_chars=5) == ["你好世界" * 10]
+    assert jieba_utils.split_blocks("") == []
+
+
+def test_parallel_sentences_match_serial(zh_text):
+    serial = ChineseTokenizer(workers=1)
+    parallel = ChineseTokenizer(workers=2)
+    split_blocks = jieba_utils.split_blocks
+    block_counts = []
+
+    def counting_split(*args, **kwargs):
+        blocks = split_blocks(*args, **kwargs)
+        block_counts.append(len(blocks))
+        return blocks
+
+    try:
+        with patch("app.jieba_utils.PARALLEL_MIN_CHARS", 0), \
+             patch("app.jieba_utils.PARALLEL_BLOCK_CHARS", 300), \
+             patch("app.jieba_utils.split_blocks", counting_split):
+            assert list(parallel.tokenize_sentences(zh_text)) == list(serial.tokenize_sentences(zh_text))
+        # Cut in ~300 char blocks (the patched size), not just the couple the real default gives
+        assert block_counts == [len(split_blocks(zh_text, block_chars=300))]
+        assert block_counts[0] > 10
+    finally:
+        parallel.segmenter.close()
+
+
+def test_dictionary_cache_roundtrip(tmp_path):
+    with patch("app.jieba_utils.get_cache_path", return_value=str(tmp_path)):
+        base = jieba_utils.get_dictionary_cache_file(reinforce=False)
+        tuned = jieba_utils.get_dictionary_cache_file(reinforce=True)
+
+    # Variants never share a cache file, and both live in the user data cache dir
+    assert base != tuned
+    assert os.path.dirname(tuned) == str(tmp_path)
+
+    jieba_utils._write_dictionary_cache(tuned, {"就把": 0, "就": 5}, 5)
+    assert jieba_utils._read_dictionary_cache(tuned) == ({"就把": 0, "就": 5}, 5)
+    assert jieba_utils._read_dictionary_cache(str(tmp_path / "missing.cache")) is None
@@ -106,3 +106,23 @@ def test_context_prioritization_zh(context_test_env):
             analyzer.main()
             
     verify_context_length(results_dir / "priority_learning_list.csv", "冒险")
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 5])
+def test_extra_context_heap_matches_stable_sort(limit):
+    """The bounded heap must pick exactly what the old append + sort + slice picked, ties included."""
+    import random
+    rng = random.Random(limit)
+    candidates = [
+        ((rng.randint(0, 1), rng.randint(0, 1), rng.randint(0, 3)), f"sentence {i}")
+        for i in range(200)
+    ]
+
+    expected = []
+    heap = []
+    for seq, (rank, text) in enumerate(candidates):
+        expected.append((*rank, text))
+        expected.sort(key=lambda x: (x[0], x[1], x[2]))
+        expected = expected[:limit]
+        analyzer.push_extra_context(heap, rank, seq, text, limit)
+
+    assert analyzer.sorted_extra_contexts(heap) == expected
@@ -0,0 +1,62 @@
+import csv
+from collections import Counter
+
+import pytest
+
+from app.analyzer import load_yomitan_frequency_list
+from app.corpus_frequency import SpillingCounter, rank_terms, iter_text_blocks, build_frequency_list
+
+
+def test_blocks_are_cut_after_newlines(tmp_path):
+    path = tmp_path / "corpus.txt"
+    text = "".join(f"行{i}の文です。\n" for i in range(50)) + "最後"
+    path.write_text(text, encoding="utf-8")
+
+    blocks = list(iter_text_blocks(str(path), block_chars=32))
+    assert "".join(blocks) == text
+    assert all(block.endswith("\n") for block in blocks[:-1])
+    assert all(len(block) <= 64 for block in blocks)
+
+
+def test_spilled_counts_rank_like_in_memory(tmp_path):
+    batches = [Counter({"猫": 3, "犬": 1}), Counter({"鳥": 2, "猫": 1}), Counter({"犬": 4, "魚": 1}), Counter({"a,\"b": 2})]
+    expected = sum(batches, Counter())
+
+    counter = SpillingCounter(str(tmp_path), max_terms=2)
+    for batch in batches:
+        counter.update(batch)
+    assert len(counter.runs) >= 2
+    assert dict(counter.items()) == expected
+
+    ranked = list(rank_terms(counter.items(), str(tmp_path), max_terms=2, min_count=2))
+    assert ranked == [("犬", 5), ("猫", 4), ("a,\"b", 2), ("鳥", 2)]
+
+
+def test_build_matches_without_spilling(tmp_path):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text("猫が好きです。\n犬も好きです。\n" * 20, encoding="utf-8")
+    (corpus / "b.txt").write_text("猫と犬と鳥を見た。\n", encoding="utf-8")
+    (corpus / "notes.json").write_text("{}", encoding="utf-8")
+
+    spilled, in_memory = tmp_path / "spilled.csv", tmp_path / "memory.csv"
+    build_frequency_list([str(corpus)], str(spilled), language="ja", workers=1, max_terms=3, block_chars=16)
+    build_frequency_list([str(corpus)], str(in_memory), language="ja", workers=1)
+    assert spilled.read_bytes() == in_memory.read_bytes()
+
+    with open(spilled, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Word", "Rank"]
+    assert [int(rank) for _, rank in rows[1:]] == list(range(1, len(rows)))
+
+    # Drops into the analyzer as is
+    ranks = load_yomitan_frequency_list(str(spilled))
+    assert ranks["猫"] < ranks["鳥"]
+    assert ranks["好き"] < ranks["鳥"]
+
+
+def test_empty_corpus_is_an_error(tmp_path):
+    (tmp_path / "empty.txt").write_text("", encoding="utf-8")
+    with pytest.raises(ValueError):
+        build_frequency_list([str(tmp_path)], str(tmp_path / "out.csv"), workers=1)
+    assert not (tmp_path / "out.csv").exists()
@@ -98,3 +98,22 @@ def test_export_yomitan_missing_reading_fallback(tmp_path):
         term_data = json.loads(zf.read("term_meta_bank_1.json"))
         # Fallback to simple format: ["apple", "freq", 1]
         assert term_data[0] == ["apple", "freq", 1]
+
+def test_export_yomitan_splits_banks(tmp_path):
+    csv_path = tmp_path / "many.csv"
+    pd.DataFrame({"Word": ["ネコ", "イヌ", "鳥", "サカナ", "ウマ"], "Reading": ["ネコ", "イヌ", "とり", "", "ウマ"]}).to_csv(csv_path, index=False)
+
+    save_path = tmp_path / "yomitan_banks.zip"
+    FrequencyExporter.export_yomitan(str(csv_path), str(save_path), language='ja', bank_size=2)
+
+    with zipfile.ZipFile(save_path, 'r') as zf:
+        banks = sorted(n for n in zf.namelist() if n.startswith("term_meta_bank_"))
+        assert banks == ["term_meta_bank_1.json", "term_meta_bank_2.json", "term_meta_bank_3.json"]
+        entries = [e for name in banks for e in json.loads(zf.read(name))]
+
+    # Ranks keep counting across banks; only Katakana terms with a reading use the object form
+    assert [e[0] for e in entries] == ["ネコ", "イヌ", "鳥", "サカナ", "ウマ"]
+    assert entries[1] == ["イヌ", "freq", {"reading": "イヌ", "frequency": 2}]
+    assert entries[2] == ["鳥", "freq", 3]
+    assert entries[3] == ["サカナ", "freq", 4]
+    assert entries[4][2]["frequency"] == 5
@@ -41,7 +41,7 @@ class TestHTMLRegression(unittest.TestCase):
         self.assertIn('position: sticky', style_text)
         self.assertIn('top: 0', style_text)
         self.assertIn('background: #000', style_text) # Solid black header
-        self.assertIn('content-visibility: auto', style_text)
+        self.assertIn('.zen-row', style_text)  # Virtualized word list
         self.assertIn('cursor: default', style_text)
         self.assertIn('user-select: none', style_text)
         self.assertIn('caret-color: transparent', style_text)
@@ -3,7 +3,7 @@ import pytest
 import os
 import shutil
 from unittest.mock import patch, MagicMock
-from app.static_html_generator import generate_static_html
+from app.static_html_generator import generate_static_html, encode_columns, decode_columns, StringTable
 
 def test_html_generation(tmp_path):
     """
@@ -47,3 +47,283 @@ def test_html_generation(tmp_path):
          assert "let globalLogic = {\"test\": \"data\"};" in content
          # Verify logo injection wasn't attempted if icon missing (mocked exists check? no, we didn't mock os.path.exists)
          # That's fine, we just want to ensure it runs without crashing.
+
+
+def test_word_lists_are_separate_data_blocks(tmp_path):
+    """
+    Word lists are not part of the globalData literal: each file (and the priority list)
+    gets its own JSON data block that the page decodes on demand.
+    """
+    import json
+    import pandas as pd
+    from bs4 import BeautifulSoup
+
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    rows = [
+        {"Sequence": 1, "Source File": "ep1.srt", "Word": "猫", "Reading": "ネコ", "Context 1": "猫が</script><!--いる"},
+        {"Sequence": 1, "Source File": "ep1.srt", "Word": "犬", "Reading": "イヌ", "Context 1": "犬だ", "Context 2": "犬が走る"},
+        {"Sequence": 2, "Source File": "ep2.srt", "Word": "鳥", "Reading": "トリ", "Context 1": "鳥だ"},
+    ]
+    pd.DataFrame(rows).to_csv(results_dir / "progressive_learning_list.csv", index=False)
+    pd.DataFrame([{"Word": "猫", "Reading": "ネコ", "Score": 10}]).to_csv(results_dir / "priority_learning_list.csv", index=False)
+    (results_dir / "file_statistics.json").write_text(json.dumps([
+        {"File": "ep1.srt", "Total Words": 10, "Known Count": 8, "Coverage (%)": 80.0},
+        {"File": "ep2.srt", "Total Words": 5, "Known Count": 4, "Coverage (%)": 80.0},
+    ]), encoding="utf-8")
+
+    template_path = tmp_path / "web_app.html"
+    template_path.write_text("<html><head></head><body><h1>Surasura List</h1><script>let globalData = null;</script></body></html>", encoding="utf-8")
+    output_html = results_dir / "reading_list_static.html"
+
+    with patch("app.static_html_generator.RESULTS_DIR", str(results_dir)), \
+         patch("app.static_html_generator.PROGRESSIVE_CSV", str(results_dir / "progressive_learning_list.csv")), \
+         patch("app.static_html_generator.PRIORITY_CSV", str(results_dir / "priority_learning_list.csv")), \
+         patch("app.static_html_generator.OUTPUT_FILE", str(output_html)), \
+         patch("app.static_html_generator.get_resource", return_value=str(template_path)), \
+         patch("app.static_html_generator.settings_manager.load_settings", return_value={}):
+        generate_static_html(theme="default", open_browser=False)
+
+    soup = BeautifulSoup(output_html.read_text(encoding="utf-8"), "html.parser")
+    script = soup.find("script", type=None).string
+    index = json.loads(script.split("let globalData = ", 1)[1].split(";\n", 1)[0])
+    assert [f["filename"] for f in index["progressive"]] == ["ep1.srt", "ep2.srt"]
+    assert all("words" not in f for f in index["progressive"])
+    assert [f["word_count"] for f in index["progressive"]] == [2, 1]
+    assert index["priority_count"] == 1 and "priority" not in index
+
+    blocks = {tag["id"]: json.loads(tag.string) for tag in soup.find_all("script", type="application/json")}
+    strings = blocks[index["strings_block"]]
+    first = decode_columns(blocks[index["progressive"][0]["block"]], strings)
+    assert [w["Word"] for w in first] == ["猫", "犬"]
+    # Markup inside the data can't end the block early
+    assert first[0]["Context 1"] == "猫が</script><!--いる"
+    # Empty CSV cells are null (JSON.parse can't read NaN)
+    assert first[0]["Context 2"] is None
+    assert [w["Word"] for w in decode_columns(blocks[index["priority_block"]], strings)] == ["猫"]
+
+
+def test_columnar_encoding_roundtrip():
+    """Repeated strings go through the shared table, constant columns collapse, values survive."""
+    rows = [
+        {"Word": f"語{i}", "Tier": "global:1" if i % 2 else "Outside", "Sequence": 3,
+         "Score": 1.0 + i, "Context 2": None if i % 3 else "文"}
+        for i in range(6)
+    ]
+    strings = StringTable()
+    payload = encode_columns(rows, strings)
+
+    assert payload["n"] == 6
+    assert payload["cols"]["Sequence"] == {"c": 3}
+    assert set(payload["cols"]["Tier"]) == {"s"}
+    # Unique words stay inline instead of bloating the table
+    assert isinstance(payload["cols"]["Word"], list)
+    # Whole-number floats are written as ints
+    assert payload["cols"]["Score"][0] == 1
+
+    assert decode_columns(payload, strings.values) == rows
+
+
+def test_in_memory_page_matches_page_from_csvs(tmp_path, project_root):
+    """
+    --static hands the analyzer's in-memory rows to the generator; rebuilding the page
+    from the written CSVs (--static-only) must give the same data, GoalContent flags included.
+    """
+    import sys
+    import json
+    import subprocess
+    from bs4 import BeautifulSoup
+    from app.results_utils import get_active_run_dir
+
+    data_dir = tmp_path / "data" / "ja"
+    (tmp_path / "User Files" / "ja").mkdir(parents=True)
+    shutil.copytree(os.path.join(project_root, "samples", "ja", "HighPriority"), data_dir / "HighPriority")
+    shutil.copytree(os.path.join(project_root, "templates"), tmp_path / "templates")
+    (data_dir / "GoalContent").mkdir()
+    shutil.copy(os.path.join(project_root, "samples", "ja", "LowPriority", "L_priority_sample_1.txt"), data_dir / "GoalContent")
+
+    env = dict(os.environ, SURASURA_TEST_ROOT=str(tmp_path), PYTHONPATH=project_root)
+    result = subprocess.run([sys.executable, "-m", "app.analyzer", "--language", "ja", "--static"],
+                            env=env, cwd=project_root, capture_output=True, text=True, encoding="utf-8", timeout=300)
+    assert result.returncode == 0, result.stdout + result.stderr
+    run_dir = get_active_run_dir(str(tmp_path / "results"), "ja")
+
+    def page_data(path):
+        soup = BeautifulSoup(open(path, encoding="utf-8").read(), "html.parser")
+        script = next(tag.string for tag in soup.find_all("script", type=None) if "let globalData = " in (tag.string or ""))
+        index = json.loads(script.split("let globalData = ", 1)[1].split(";\n", 1)[0])
+        blocks = {tag["id"]: json.loads(tag.string) for tag in soup.find_all("script", type="application/json")}
+        return index, blocks
+
+    rebuilt = tmp_path / "rebuilt.html"
+    with patch("app.static_html_generator.get_data_path", return_value=str(data_dir)), \
+         patch("app.static_html_generator.get_resource", side_effect=lambda p: str(tmp_path / p)), \
+         patch("app.static_html_generator.settings_manager.load_settings", return_value={}):
+        generate_static_html(open_browser=False, results_dir=run_dir, language="ja", output_file=str(rebuilt))
+
+    index, blocks = page_data(os.path.join(run_dir, "reading_list_static.html"))
+    assert page_data(rebuilt) == (index, blocks)
+    goal = {f["filename"]: f["is_goal_content"] for f in index["progressive"]}
+    assert goal["L_priority_sample_1.txt"] is True
+    assert goal["H_priority_sample_1.txt"] is False
+
+
+def test_goal_content_follows_the_manifest_both_ways(tmp_path, project_root, monkeypatch):
+    """
+    With a master_manifest.json, --static (analyzer rows) and --static-only (CSVs) take
+    GoalContent from the manifest, even where it disagrees with the folders.
+    """
+    import sys
+    import json
+    import subprocess
+    from app import static_html_generator
+    from app.results_utils import get_active_run_dir
+
+    data_dir = tmp_path / "data" / "ja"
+    user_files = tmp_path / "User Files" / "ja"
+    user_files.mkdir(parents=True)
+    (data_dir / "HighPriority").mkdir(parents=True)
+    (data_dir / "GoalContent").mkdir()
+    shutil.copy(os.path.join(project_root, "samples", "ja", "HighPriority", "H_priority_sample_1.txt"), data_dir / "HighPriority")
+    shutil.copy(os.path.join(project_root, "samples", "ja", "LowPriority", "L_priority_sample_1.txt"), data_dir / "GoalContent")
+    shutil.copytree(os.path.join(project_root, "templates"), tmp_path / "templates")
+    # The schedule says the GoalContent folder's file is read now and the HighPriority one is the goal
+    (user_files / "master_manifest.json").write_text(json.dumps({"schedule": {
+        "PHASE_1_NOW": [{"physical_path": "./GoalContent/L_priority_sample_1.txt", "origin_source": "01_NOW"}],
+        "PHASE_3_LATER": [{"physical_path": "./HighPriority/H_priority_sample_1.txt", "origin_source": "03_LATER"}],
+    }}), encoding="utf-8")
+
+    env = dict(os.environ, SURASURA_TEST_ROOT=str(tmp_path), PYTHONPATH=project_root)
+    result = subprocess.run([sys.executable, "-m", "app.analyzer", "--language", "ja", "--static"],
+                            env=env, cwd=project_root, capture_output=True, text=True, encoding="utf-8", timeout=300)
+    assert result.returncode == 0, result.stdout + result.stderr
+    run_dir = get_active_run_dir(str(tmp_path / "results"), "ja")
+
+    def goal_flags(path):
+        html = open(path, encoding="utf-8").read()
+        script = html.split("let globalData = ", 1)[1].split(";\n", 1)[0]
+        index = json.loads(script)
+        return {f["filename"]: f["is_goal_content"] for f in index["progressive"] + index["completed_files"]}
+
+    monkeypatch.setenv("SURASURA_TEST_ROOT", str(tmp_path))
+    rebuilt = tmp_path / "rebuilt.html"
+    with patch("app.static_html_generator.get_resource", side_effect=lambda p: str(tmp_path / p)), \
+         patch("app.static_html_generator.settings_manager.load_settings", return_value={}):
+        assert static_html_generator.get_goal_files("ja") == {"H_priority_sample_1.txt"}
+        generate_static_html(open_browser=False, results_dir=run_dir, language="ja", output_file=str(rebuilt))
+
+    expected = {"H_priority_sample_1.txt": True, "L_priority_sample_1.txt": False}
+    assert goal_flags(os.path.join(run_dir, "reading_list_static.html")) == expected
+    assert goal_flags(rebuilt) == expected
+
+
+def test_unchanged_inputs_skip_regeneration(tmp_path):
+    """
+    Same results, settings, template and theme: the existing page is reused as-is.
+    Only the theme changed: rebuilt, but the word lists are not serialized again.
+    """
+    import json
+    import pandas as pd
+    from app import static_html_generator
+
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    pd.DataFrame([
+        {"Sequence": 1, "Source File": "ep1.srt", "Word": "猫", "Reading": "ネコ", "Context 1": "猫だ"},
+    ]).to_csv(results_dir / "progressive_learning_list.csv", index=False)
+    pd.DataFrame([{"Word": "猫", "Reading": "ネコ", "Score": 10}]).to_csv(results_dir / "priority_learning_list.csv", index=False)
+    (results_dir / "file_statistics.json").write_text(json.dumps([{"File": "ep1.srt", "Total Words": 10}]), encoding="utf-8")
+    template_path = tmp_path / "web_app.html"
+    template_path.write_text("<html><head></head><body><h1>Surasura List</h1><script>let globalData = null;</script></body></html>", encoding="utf-8")
+    output_html = results_dir / "reading_list_static.html"
+    settings = {"theme": "Default (Dark)"}
+
+    def build():
+        with patch("app.static_html_generator.RESULTS_DIR", str(results_dir)), \
+             patch("app.static_html_generator.PROGRESSIVE_CSV", str(results_dir / "progressive_learning_list.csv")), \
+             patch("app.static_html_generator.PRIORITY_CSV", str(results_dir / "priority_learning_list.csv")), \
+             patch("app.static_html_generator.OUTPUT_FILE", str(output_html)), \
+             patch("app.static_html_generator.get_resource", return_value=str(template_path)), \
+             patch("app.static_html_generator.settings_manager.load_settings", return_value=dict(settings)), \
+             patch("app.static_html_generator.open_in_browser") as opened, \
+             patch("app.static_html_generator.split_data_blocks", wraps=static_html_generator.split_data_blocks) as split:
+            generate_static_html(theme="default", open_browser=True)
+        assert opened.called
+        return split.call_count, output_html.read_text(encoding="utf-8")
+
+    serialized, first = build()
+    assert serialized == 1 and static_html_generator.read_build_stamp(str(output_html))
+
+    # Nothing changed: not rebuilt, just opened
+    mtime = output_html.stat().st_mtime_ns
+    assert build() == (0, first)
+    assert output_html.stat().st_mtime_ns == mtime
+
+    # Theme only: new page, same embedded data
+    settings["theme"] = "Modern Light"
+    serialized, themed = build()
+    assert serialized == 0
+    assert "let globalTheme = 'modern-light';" in themed
+    assert static_html_generator.read_embedded_data(str(output_html)) == \
+        (static_html_generator.GLOBAL_DATA_RE.search(first).group(1), first[first.index('<script type="application/json"'):first.rindex("</body>")].rstrip("\n"))
+
+    # New results: the lists are serialized again
+    pd.DataFrame([{"Word": "犬", "Reading": "イヌ", "Score": 9}]).to_csv(results_dir / "priority_learning_list.csv", index=False)
+    serialized, rebuilt = build()
+    assert serialized == 1 and "犬" in rebuilt
+
+
+def test_new_page_from_report_data_skips_hashing_the_results(tmp_path):
+    """The analyzer's first page of a fresh run is not fingerprinted from the CSVs; later rebuilds are."""
+    from app import static_html_generator
+
+    results_dir = tmp_path / "run"
+    results_dir.mkdir()
+    template_path = tmp_path / "web_app.html"
+    template_path.write_text("<html><head></head><body><script>let globalData = null;</script></body></html>", encoding="utf-8")
+    output_html = results_dir / "reading_list_static.html"
+    report_data = static_html_generator.build_report_data([], [], [], [])
+
+    def build(**kwargs):
+        with patch("app.static_html_generator.get_resource", return_value=str(template_path)), \
+             patch("app.static_html_generator.settings_manager.load_settings", return_value={}), \
+             patch("app.static_html_generator._file_digest", wraps=static_html_generator._file_digest) as digest:
+            generate_static_html(open_browser=False, results_dir=str(results_dir), language="ja", **kwargs)
+        return {os.path.dirname(call.args[0]) for call in digest.call_args_list}
+
+    assert str(results_dir) not in build(report_data=report_data)
+    assert static_html_generator.read_build_stamp(str(output_html))
+    # The page exists now: its inputs are fingerprinted, so the next build can be skipped
+    assert str(results_dir) in build(report_data=report_data)
+    mtime = output_html.stat().st_mtime_ns
+    build()
+    assert output_html.stat().st_mtime_ns == mtime
+
+
+def test_default_build_reads_the_active_run(tmp_path):
+    """Without a run folder the page is built from the active run, not the mirror in results/."""
+    import json
+    import pandas as pd
+    from app.results_utils import publish_run, get_runs_dir
+
+    results_dir = tmp_path / "results"
+    run_dir = os.path.join(get_runs_dir(str(results_dir)), "ja_aaa_1")
+    os.makedirs(run_dir)
+    pd.DataFrame([{"Sequence": 1, "Source File": "ep1.srt", "Word": "猫", "Reading": "ネコ", "Context 1": "猫だ"}]).to_csv(
+        os.path.join(run_dir, "progressive_learning_list.csv"), index=False)
+    publish_run(str(results_dir), run_dir, "ja", "aaa")
+    # A publish in progress: the mirror already holds another run's list
+    pd.DataFrame([{"Sequence": 1, "Source File": "old.srt", "Word": "犬", "Reading": "イヌ", "Context 1": "犬だ"}]).to_csv(
+        results_dir / "progressive_learning_list.csv", index=False)
+
+    template_path = tmp_path / "web_app.html"
+    template_path.write_text("<html><head></head><body><script>let globalData = null;</script></body></html>", encoding="utf-8")
+    output_html = results_dir / "reading_list_static.html"
+    with patch("app.static_html_generator.RESULTS_DIR", str(results_dir)), \
+         patch("app.static_html_generator.OUTPUT_FILE", str(output_html)), \
+         patch("app.static_html_generator.get_resource", return_value=str(template_path)), \
+         patch("app.static_html_generator.settings_manager.load_settings", return_value={}):
+        generate_static_html(theme="default", open_browser=False, language="ja")
+
+    script = output_html.read_text(encoding="utf-8").split("let globalData = ", 1)[1].split(";\n", 1)[0]
+    assert [f["filename"] for f in json.loads(script)["progressive"]] == ["ep1.srt"]
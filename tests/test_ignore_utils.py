@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from app.ignore_utils import IGNORE_EXPORT_FORMAT, read_ignore_export, merge_into_ignore_list, replay_journal
+
+
+def test_replay_keeps_words_after_last_clear():
+    entries = [
+        {"op": "ignore", "word": "猫", "at": 1},
+        {"op": "clear", "at": 2},
+        {"op": "ignore", "word": "犬", "at": 3},
+        {"op": "ignore", "word": "鳥", "at": 4},
+        {"op": "ignore", "word": "犬", "at": 5},
+    ]
+    assert replay_journal(entries) == ["犬", "鳥"]
+
+
+def test_read_export_and_plain_list(tmp_path):
+    export = tmp_path / "surasura_ignored_zh.json"
+    export.write_text(json.dumps({"format": IGNORE_EXPORT_FORMAT, "version": 1, "language": "zh",
+                                  "entries": [{"op": "ignore", "word": "我们"}]}), encoding="utf-8")
+    assert read_ignore_export(str(export)) == ("zh", ["我们"])
+
+    plain = tmp_path / "copied.txt"
+    plain.write_text("猫\n\n犬\n猫\n", encoding="utf-8")
+    assert read_ignore_export(str(plain)) == (None, ["猫", "犬"])
+
+    other = tmp_path / "other.json"
+    other.write_text('{"words": ["猫"]}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_ignore_export(str(other))
+
+
+def test_merge_appends_only_new_words(tmp_path):
+    ignore_path = tmp_path / "User Files" / "ja" / "IgnoreList.txt"
+    ignore_path.parent.mkdir(parents=True)
+    ignore_path.write_text("# Add words to ignore here (one per line)\n猫", encoding="utf-8")
+
+    assert merge_into_ignore_list(["猫", "犬", "犬", " 鳥 "], str(ignore_path)) == ["犬", "鳥"]
+    assert ignore_path.read_text(encoding="utf-8") == "# Add words to ignore here (one per line)\n猫\n犬\n鳥\n"
+    assert merge_into_ignore_list(["犬"], str(ignore_path)) == []
@@ -6,7 +6,11 @@ import os
 # Ensure package root is in sys.path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.analyzer import JapaneseTokenizer, has_target_language
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.analyzer import JapaneseTokenizer, has_target_language, extract_text
 
 class TestJapaneseRegression(unittest.TestCase):
     def test_kanji_detection(self):
@@ -28,5 +32,52 @@ class TestJapaneseRegression(unittest.TestCase):
         self.assertIn("学校", lemmas)
         self.assertIn("行く", lemmas)
 
+    def test_fast_path_matches_reference(self):
+        # The raw-feature fast path must yield exactly what the namedtuple path yields
+        fast = JapaneseTokenizer()
+        reference = JapaneseTokenizer(fast_path=False)
+        samples_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "samples", "ja")
+        texts = ["学校に行きます。「はい、」と言った！？本当に?"]
+        for root, _, files in os.walk(samples_dir):
+            for name in sorted(files):
+                texts.append(extract_text(os.path.join(root, name), 'ja'))
+
+        for sanitize in (False, True):
+            with patch("app.analyzer.SANITIZE_JA", sanitize):
+                for text in texts:
+                    self.assertEqual(list(fast.tokenize_sentences(text)),
+                                     list(reference.tokenize_sentences(text)))
+
+    def test_fast_path_follows_the_dictionary_layout(self):
+        # Full unidic has 29 feature fields (kana at 20, not 17 like unidic-lite)
+        from fugashi.fugashi import UnidicFeatures29
+        lite = JapaneseTokenizer(fast_path=False)
+        text = "学校に行きます。「はい、」と言った！？"
+
+        def as_unidic29(word):
+            # Same values, in the full unidic column order
+            values = dict.fromkeys(UnidicFeatures29._fields, "*")
+            values.update(pos1=word.feature.pos1, lemma=word.feature.lemma, kana=word.feature.kana)
+            feature = UnidicFeatures29(**values)
+            raw = ",".join(v if v is not None else "*" for v in feature)
+            return SimpleNamespace(surface=word.surface, feature=feature, feature_raw=raw)
+
+        def tagger(text):
+            return [as_unidic29(word) for word in lite.tagger(text)]
+
+        with patch("app.analyzer.fugashi.Tagger", return_value=tagger):
+            fast = JapaneseTokenizer()
+            reference = JapaneseTokenizer(fast_path=False)
+        self.assertTrue(fast.fast_path)
+        self.assertEqual(fast.feature_columns, (0, 7, 20))
+        self.assertEqual(list(fast.tokenize_sentences(text)), list(reference.tokenize_sentences(text)))
+        self.assertEqual(list(fast.tokenize_sentences(text)), list(lite.tokenize_sentences(text)))
+
+    def test_unknown_dictionary_layout_uses_reference_path(self):
+        Features = namedtuple("Features", ["surface_form", "reading"])
+        tagger = lambda text: [SimpleNamespace(surface=text, feature=Features(text, ""), feature_raw=text)]
+        with patch("app.analyzer.fugashi.Tagger", return_value=tagger):
+            self.assertFalse(JapaneseTokenizer().fast_path)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+
+from app import known_word_store
+from app.known_word_store import KnownWordStore, save_words, mark_words_known, get_store_path
+from app.analyzer import load_known_words, JapaneseTokenizer
+
+
+def word(dict_form, secondary="", status="KNOWN", has_card=0, **extra):
+    return {"dictForm": dict_form, "secondary": secondary, "partOfSpeech": "", "language": "ja",
+            "knownStatus": status, "hasCard": has_card, **extra}
+
+
+def test_running_statistics_follow_upserts(tmp_path):
+    with KnownWordStore(str(tmp_path / "KnownWord.sqlite")) as store:
+        store.replace_all([word("猫", "ねこ"), word("犬", "いぬ", "LEARNING"), word("鳥", "とり", "IGNORED"),
+                           word("犬", "いぬ", "UNKNOWN", has_card=1)])
+        stats = store.statistics()
+        assert stats["totalWords"] == 4
+        assert (stats["knownWords"], stats["learningWords"], stats["unknownWords"], stats["ignoredWords"]) == (1, 1, 1, 1)
+        assert stats["languages"] == ["ja"]
+
+        # Every entry of a marked word becomes KNOWN
+        store.mark_known([("犬", "いぬ"), ("魚", "さかな")], "ja", hasCard=1)
+        stats = store.statistics()
+        assert (stats["totalWords"], stats["knownWords"], stats["unknownWords"]) == (5, 4, 0)
+        assert sorted(store.known_terms()) == sorted(["猫", "犬", "魚"])
+
+        store.replace_all([word("猫", "ねこ", "LEARNING")])
+        assert store.statistics()["totalWords"] == 1
+        assert store.statistics()["knownWords"] == 0
+
+
+def test_anki_merge_keeps_existing_metadata(tmp_path):
+    json_path = str(tmp_path / "KnownWord.json")
+    save_words(json_path, [word("食べる", "たべる", "LEARNING", wordId=7), word("飲む", "のむ")], source="Jiten API")
+
+    stats = mark_words_known(json_path, [("食べる", "たべる"), ("見る", "みる")], "ja",
+                             {"hasCard": 1, "tracked": 0}, source="Anki Extraction")
+    assert stats["knownWords"] == 3
+
+    with open(json_path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert list(data) == ["exportDate", "source", "statistics", "words"]
+    assert data["statistics"] == stats
+    words = {w["dictForm"]: w for w in data["words"]}
+    assert [w["dictForm"] for w in data["words"]] == ["食べる", "飲む", "見る"]
+    assert words["食べる"]["knownStatus"] == "KNOWN"
+    assert words["食べる"]["wordId"] == 7
+    assert words["見る"]["hasCard"] == 1
+
+
+def test_export_keeps_every_entry(tmp_path):
+    """Entries differing only in partOfSpeech stay separate, and a missing language is the importer's."""
+    json_path = str(tmp_path / "KnownWord.json")
+    entries = [dict(word("見る", "みる"), partOfSpeech="v"), dict(word("見る", "みる", "LEARNING"), partOfSpeech="n"),
+               {"dictForm": "猫", "secondary": "ねこ", "knownStatus": "KNOWN"}]
+    stats = save_words(json_path, entries, "ja", source="Jiten API")
+    assert stats["totalWords"] == 3
+    assert stats["languages"] == ["ja"]
+    with open(json_path, encoding="utf-8") as f:
+        assert json.load(f)["words"] == entries
+
+    stats = mark_words_known(json_path, [("見る", "みる")], "ja")
+    assert (stats["totalWords"], stats["knownWords"]) == (3, 3)
+    with open(json_path, encoding="utf-8") as f:
+        words = json.load(f)["words"]
+    assert [(w["partOfSpeech"], w["knownStatus"]) for w in words[:2]] == [("v", "KNOWN"), ("n", "KNOWN")]
+
+
+def test_empty_export_is_valid_json(tmp_path):
+    json_path = str(tmp_path / "KnownWord.json")
+    save_words(json_path, [], databaseFile="migaku.db")
+    with open(json_path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["words"] == []
+    assert data["statistics"]["totalWords"] == 0
+
+
+def test_analyzer_resyncs_after_the_json_is_replaced(tmp_path):
+    json_path = str(tmp_path / "KnownWord.json")
+    tokenizer = JapaneseTokenizer()
+    save_words(json_path, [word("猫", "ねこ"), word("犬", "いぬ", "UNKNOWN")])
+    assert os.path.exists(get_store_path(json_path))
+
+    _, lemmas = load_known_words(json_path, tokenizer)
+    assert "猫" in lemmas and "犬" not in lemmas
+
+    # Replaced by hand (old list format): the store is rebuilt from it
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump([word("犬", "いぬ"), word("猫", "ねこ", "UNKNOWN")], f, ensure_ascii=False)
+    _, lemmas = load_known_words(json_path, tokenizer)
+    assert "犬" in lemmas and "猫" not in lemmas
+    assert known_word_store.load_known_terms(json_path) == ["犬"]
+
+
+def test_deleted_json_starts_over(tmp_path):
+    json_path = str(tmp_path / "KnownWord.json")
+    save_words(json_path, [word("猫", "ねこ")])
+    os.remove(json_path)
+
+    stats = mark_words_known(json_path, [("犬", "いぬ")], "ja", {"hasCard": 1})
+    assert stats["totalWords"] == 1
+    assert known_word_store.load_known_terms(json_path) == ["犬"]
+
+
+def test_reader_cannot_interleave_with_an_import(tmp_path, monkeypatch):
+    """
+    A reader arriving between an importer's upsert and its export must wait for the
+    export instead of re-importing the old JSON over the new words.
+    """
+    json_path = str(tmp_path / "KnownWord.json")
+    save_words(json_path, [word("猫", "ねこ")])
+
+    upserted, release = threading.Event(), threading.Event()
+    export_json = KnownWordStore.export_json
+
+    def slow_export(self, *args, **kwargs):
+        upserted.set()
+        release.wait(5)
+        return export_json(self, *args, **kwargs)
+
+    monkeypatch.setattr(KnownWordStore, "export_json", slow_export)
+    importer = threading.Thread(target=mark_words_known, args=(json_path, [("犬", "いぬ")], "ja"))
+    importer.start()
+    assert upserted.wait(5)
+
+    terms = []
+    reader = threading.Thread(target=lambda: terms.extend(known_word_store.load_known_terms(json_path)))
+    reader.start()
+    reader.join(0.3)
+    assert reader.is_alive()  # blocked on the importer's lock
+
+    release.set()
+    importer.join(5)
+    reader.join(5)
+    assert sorted(terms) == ["犬", "猫"]
+    with open(json_path, encoding="utf-8") as f:
+        assert sorted(w["dictForm"] for w in json.load(f)["words"]) == ["犬", "猫"]
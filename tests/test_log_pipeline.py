@@ -0,0 +1,70 @@
+import threading
+import time
+
+from app.log_utils import LogPipeline
+
+
+def _produce(pipeline, count):
+    thread = threading.Thread(target=lambda: [pipeline.put(f"line {i}") for i in range(count)], daemon=True)
+    thread.start()
+    return thread
+
+
+def test_drain_is_batched_and_scrollback_capped(tmp_path):
+    pipeline = LogPipeline(max_lines=50, max_pending=1000, batch_lines=30)
+    _produce(pipeline, 100).join(timeout=5)
+
+    batches = []
+    while True:
+        batch = pipeline.drain()
+        if not batch:
+            break
+        batches.append(batch)
+
+    assert [len(b) for b in batches] == [30, 30, 30, 10]
+    assert [line for b in batches for line in b] == [f"line {i}" for i in range(100)]
+    # Only the most recent lines are kept for display...
+    assert list(pipeline.scrollback) == [f"line {i}" for i in range(50, 100)]
+
+    # ...but the saved log is complete
+    out = tmp_path / "log.txt"
+    pipeline.save(str(out))
+    assert out.read_text(encoding="utf-8").splitlines() == [f"line {i}" for i in range(100)]
+    pipeline.close()
+
+
+def test_producer_blocks_when_gui_falls_behind():
+    pipeline = LogPipeline(max_pending=10, batch_lines=5)
+    producer = _produce(pipeline, 40)
+    time.sleep(0.2)
+
+    # The reader thread is stalled instead of queueing everything
+    assert producer.is_alive()
+    assert pipeline.pending.qsize() == 10
+
+    received = []
+    deadline = time.time() + 5
+    while len(received) < 40 and time.time() < deadline:
+        received.extend(pipeline.drain())
+        time.sleep(0.01)
+
+    producer.join(timeout=5)
+    assert not producer.is_alive()
+    assert received == [f"line {i}" for i in range(40)]
+    pipeline.close()
+
+
+def test_gui_thread_never_blocks_and_clear_resets(tmp_path):
+    pipeline = LogPipeline(max_pending=1)
+    # Called from the main thread (the consumer): must not block even past max_pending
+    pipeline.put("first\nsecond\nthird")
+    assert pipeline.drain() == ["first", "second", "third"]
+
+    pipeline.clear()
+    pipeline.put("after clear")
+    pipeline.drain()
+    out = tmp_path / "log.txt"
+    pipeline.save(str(out))
+    assert out.read_text(encoding="utf-8") == "after clear\n"
+    assert list(pipeline.scrollback) == ["after clear"]
+    pipeline.close()
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+
+from app.analyzer import parse_languages
+from app.progress_utils import parse_progress_line
+from app.results_utils import get_active_run_dir, read_active_pointer
+
+
+def make_library(root, project_root, languages):
+    for lang in languages:
+        (root / "User Files" / lang).mkdir(parents=True)
+        shutil.copytree(os.path.join(project_root, "samples", lang, "HighPriority"),
+                        root / "data" / lang / "HighPriority")
+
+
+def run_analyzer(root, project_root, *args):
+    env = dict(os.environ, SURASURA_TEST_ROOT=str(root), PYTHONPATH=project_root)
+    return subprocess.run([sys.executable, "-m", "app.analyzer", *args], env=env, cwd=project_root,
+                          capture_output=True, text=True, encoding="utf-8", timeout=300)
+
+
+def load_word_stats(root, language):
+    with open(os.path.join(get_active_run_dir(str(root / "results"), language), "word_stats.json"), encoding="utf-8") as f:
+        stats = json.load(f)
+    for entry in stats.values():
+        entry["sources"] = sorted(entry["sources"])
+    return stats
+
+
+def test_parse_languages():
+    assert parse_languages("ja") == ["ja"]
+    assert parse_languages("zh, ja,zh") == ["zh", "ja"]
+    assert parse_languages("all") == ["ja", "zh"]
+    assert parse_languages("ja,ko") == []
+
+
+def test_languages_are_analyzed_side_by_side(tmp_path, project_root):
+    batch_root = tmp_path / "batch"
+    make_library(batch_root, project_root, ["ja", "zh"])
+    result = run_analyzer(batch_root, project_root, "--language", "ja,zh", "--progress-format", "json")
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    # Each language published its own run
+    pointer = read_active_pointer(str(batch_root / "results"))
+    assert set(pointer["languages"]) == {"ja", "zh"}
+    assert load_word_stats(batch_root, "zh")
+
+    # Progress events of both workers arrive intact and tagged with their language
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{"event"')]
+    events = [parse_progress_line(line) for line in lines]
+    assert all(event is not None for event in events)
+    assert {event["language"] for event in events} == {"ja", "zh"}
+    assert {event["language"] for event in events if event["stage"] == "done"} == {"ja", "zh"}
+
+    # Same result as analyzing the language on its own
+    single_root = tmp_path / "single"
+    make_library(single_root, project_root, ["ja"])
+    assert run_analyzer(single_root, project_root, "--language", "ja").returncode == 0
+    assert load_word_stats(batch_root, "ja") == load_word_stats(single_root, "ja")
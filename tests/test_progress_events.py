@@ -0,0 +1,115 @@
+import io
+import os
+import shutil
+import pytest
+from unittest.mock import patch
+
+from app import analyzer
+from app.progress_utils import ProgressReporter, parse_progress_line, describe_progress, combine_progress
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_reporter_rates_and_eta(tmp_path):
+    paths = []
+    for name, size in (("a.txt", 100), ("b.txt", 300)):
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        paths.append(str(path))
+
+    clock = FakeClock()
+    out = io.StringIO()
+    progress = ProgressReporter("json", stream=out, clock=clock)
+    progress.begin(paths)
+    progress.set_stage("aggregate")
+
+    clock.now = 2.0
+    progress.file_done(paths[0], tokens=50)
+    clock.now = 4.0
+    progress.file_done(paths[1], tokens=150)
+
+    events = [parse_progress_line(line) for line in out.getvalue().splitlines()]
+    assert all(events)
+    last = events[-1]
+
+    # 400 of 800 bytes (two passes) in 4 seconds
+    assert last["stage"] == "aggregate"
+    assert (last["files_done"], last["files_total"]) == (2, 2)
+    assert last["percent"] == 50.0
+    assert last["bytes_per_sec"] == 100.0
+    assert last["tokens_per_sec"] == 50.0
+    assert last["eta_seconds"] == 4.0
+
+    progress.finish()
+    done = parse_progress_line(out.getvalue().splitlines()[-1])
+    assert done["percent"] == 100.0
+    assert done["eta_seconds"] == 0.0
+    assert describe_progress(done) == "Done"
+
+
+def test_text_mode_is_silent():
+    out = io.StringIO()
+    progress = ProgressReporter("text", stream=out)
+    progress.begin([])
+    progress.set_stage("aggregate")
+    progress.finish()
+    assert out.getvalue() == ""
+
+
+def test_parse_ignores_regular_log_lines():
+    assert parse_progress_line("Processing file.txt...") is None
+    assert parse_progress_line('{"event": "progress", broken') is None
+    assert parse_progress_line('{"event": "progress", "stage": "scan"}\n') == {"event": "progress", "stage": "scan"}
+
+
+def test_analyzer_emits_json_progress(tmp_path, ja_resources_dir, capsys):
+    data_dir = tmp_path / "data"
+    user_files_dir = tmp_path / "User Files"
+    results_dir = tmp_path / "results"
+    high = data_dir / "ja" / "HighPriority"
+    high.mkdir(parents=True)
+    (user_files_dir / "ja").mkdir(parents=True)
+    results_dir.mkdir()
+    shutil.copy(os.path.join(ja_resources_dir, "context_test.txt"), high / "context_test.txt")
+
+    with patch("app.path_utils.get_user_file", side_effect=lambda p: str(tmp_path / p)), \
+         patch("app.path_utils.get_data_path", side_effect=lambda lang=None: str(data_dir / lang) if lang else str(data_dir)), \
+         patch("app.path_utils.get_user_files_path", side_effect=lambda lang=None: str(user_files_dir / lang) if lang else str(user_files_dir)), \
+         patch("app.analyzer.RESULTS_DIR", str(results_dir)), \
+         patch("app.analyzer.OUTPUT_CSV", str(results_dir / "priority_learning_list.csv")), \
+         patch("app.analyzer.OUTPUT_STATS", str(results_dir / "file_statistics.txt")), \
+         patch("app.analyzer.OUTPUT_PROGRESSIVE", str(results_dir / "progressive_learning_list.csv")), \
+         patch("sys.argv", ["analyzer.py", "--language", "ja", "--progress-format", "json"]):
+        analyzer.main()
+
+    lines = capsys.readouterr().out.splitlines()
+    events = [e for e in (parse_progress_line(line) for line in lines) if e]
+    stages = [e["stage"] for e in events]
+
+    assert stages[0] == "scan"
+    assert stages[-1] == "done"
+    assert stages.index("aggregate") < stages.index("write") < stages.index("progressive")
+    assert [e["percent"] for e in events] == sorted(e["percent"] for e in events)
+    assert any(e["stage"] == "aggregate" and e["files_done"] == 1 and e["tokens_per_sec"] > 0 for e in events)
+    # Regular log lines are still printed alongside the events
+    assert any(line.startswith("Processing") for line in lines)
+
+
+def test_combine_progress_of_parallel_languages():
+    ja = {"event": "progress", "language": "ja", "stage": "done", "files_done": 10, "files_total": 10,
+          "percent": 100.0, "tokens_per_sec": 0, "bytes_per_sec": 0, "eta_seconds": 0.0}
+    zh = {"event": "progress", "language": "zh", "stage": "aggregate", "files_done": 5, "files_total": 30,
+          "percent": 20.0, "tokens_per_sec": 900.0, "bytes_per_sec": 2048.0, "eta_seconds": 80.0}
+
+    combined = combine_progress([ja, zh])
+    assert combined["percent"] == 40.0  # weighted by file count
+    assert combined["stage"] == "aggregate"
+    assert combined["eta_seconds"] == 80.0  # finished when the slowest language is
+    assert describe_progress(combined).startswith("Analyzing (ja, zh)")
+    assert combine_progress([ja])["stage"] == "done"
@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+import time
+import shutil
+import subprocess
+
+from app.results_utils import (get_runs_dir, get_active_run_dir, publish_run, prune_runs,
+                               read_active_pointer, RUN_INFO_NAME, STALE_RUN_SECONDS)
+
+
+def make_run(results_dir, name, language, published=None, files=("word_stats.json",)):
+    run_dir = os.path.join(get_runs_dir(str(results_dir)), name)
+    os.makedirs(run_dir)
+    for file_name in files:
+        with open(os.path.join(run_dir, file_name), "w", encoding="utf-8") as f:
+            f.write(json.dumps({"run": name}))
+    if published:
+        with open(os.path.join(run_dir, RUN_INFO_NAME), "w", encoding="utf-8") as f:
+            json.dump({"run": name, "language": language, "published": published}, f)
+    return run_dir
+
+
+def test_publish_swaps_the_active_run_per_language(tmp_path):
+    results_dir = str(tmp_path)
+    assert get_active_run_dir(results_dir, "ja") == results_dir
+
+    ja_run = make_run(tmp_path, "ja_aaa_1", "ja", files=("word_stats.json", "progressive_learning_list.csv"))
+    zh_run = make_run(tmp_path, "zh_bbb_1", "zh")
+    publish_run(results_dir, ja_run, "ja", "aaa")
+    assert (tmp_path / "progressive_learning_list.csv").exists()
+
+    publish_run(results_dir, zh_run, "zh", "bbb")
+
+    # Each language keeps its own active run; results/ mirrors the latest publish
+    assert get_active_run_dir(results_dir, "ja") == ja_run
+    assert get_active_run_dir(results_dir, "zh") == zh_run
+    assert get_active_run_dir(results_dir) == zh_run
+    assert json.loads((tmp_path / "word_stats.json").read_text(encoding="utf-8")) == {"run": "zh_bbb_1"}
+    # A file the published run did not produce is not left over from the previous one
+    assert not (tmp_path / "progressive_learning_list.csv").exists()
+
+
+def test_prune_keeps_newest_and_active_runs(tmp_path):
+    results_dir = str(tmp_path)
+    for i in range(1, 6):
+        make_run(tmp_path, f"ja_aaa_{i}", "ja", published=f"2026-01-0{i}T00:00:00")
+    make_run(tmp_path, "zh_bbb_1", "zh", published="2026-01-01T00:00:00")
+    active = make_run(tmp_path, "ja_ccc_0", "ja")
+    publish_run(results_dir, active, "ja", "ccc")
+    running = make_run(tmp_path, "ja_ddd_9", "ja")
+    crashed = make_run(tmp_path, "ja_eee_9", "ja")
+    old = time.time() - STALE_RUN_SECONDS - 60
+    os.utime(crashed, (old, old))
+
+    removed = prune_runs(results_dir, keep=3)
+
+    assert sorted(removed) == ["ja_aaa_1", "ja_aaa_2", "ja_aaa_3", "ja_eee_9"]
+    assert sorted(os.listdir(get_runs_dir(results_dir))) == [
+        "ja_aaa_4", "ja_aaa_5", "ja_ccc_0", "ja_ddd_9", "zh_bbb_1"]
+    assert os.path.isdir(running)
+    assert get_active_run_dir(results_dir, "ja") == active
+
+
+def test_concurrent_analyses_do_not_clobber_each_other(tmp_path, project_root):
+    """Two analyzer processes with different settings run side by side into their own run folders."""
+    high = tmp_path / "data" / "ja" / "HighPriority"
+    (tmp_path / "User Files" / "ja").mkdir(parents=True)
+    shutil.copytree(os.path.join(project_root, "samples", "ja", "HighPriority"), high)
+
+    env = dict(os.environ, SURASURA_TEST_ROOT=str(tmp_path), PYTHONPATH=project_root)
+    commands = [
+        [sys.executable, "-m", "app.analyzer", "--language", "ja"],
+        [sys.executable, "-m", "app.analyzer", "--language", "ja", "--min-freq", "2"],
+    ]
+    procs = [subprocess.Popen(cmd, env=env, cwd=project_root, stdout=subprocess.DEVNULL) for cmd in commands]
+    for proc in procs:
+        assert proc.wait(timeout=300) == 0
+
+    results_dir = tmp_path / "results"
+    runs = sorted(os.listdir(get_runs_dir(str(results_dir))))
+    assert len(runs) == 2
+    # Tagged by language and a config hash that differs between the two settings
+    assert all(run.startswith("ja_") for run in runs)
+    assert len({run.split("_")[1] for run in runs}) == 2
+
+    sizes = []
+    for run in runs:
+        run_dir = os.path.join(get_runs_dir(str(results_dir)), run)
+        with open(os.path.join(run_dir, "word_stats.json"), encoding="utf-8") as f:
+            sizes.append(len(json.load(f)))
+        assert os.path.exists(os.path.join(run_dir, "priority_learning_list.csv"))
+    assert sizes[0] == sizes[1]  # --min-freq only filters the lists, not the raw stats
+
+    # results/ holds a complete copy of whichever run was published last
+    active = read_active_pointer(str(results_dir))["languages"]["ja"]["run"]
+    active_dir = os.path.join(get_runs_dir(str(results_dir)), active)
+    for name in ("priority_learning_list.csv", "word_stats.json", "file_statistics.json"):
+        with open(results_dir / name, "rb") as published, open(os.path.join(active_dir, name), "rb") as original:
+            assert published.read() == original.read()
@@ -0,0 +1,136 @@
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app import results_server
+
+
+def write_results(results_dir, words_per_file=30):
+    progressive, priority = [], []
+    for seq, filename in enumerate(["a.txt", "b.txt"], start=1):
+        for j in range(words_per_file):
+            word = f"{filename[0]}語{j}"
+            row = {"Sequence": seq, "Source File": filename, "Word": word, "Reading": f"よみ{j}",
+                   "Tier": "global:1" if j % 2 else "Outside", "Occurrences (Global)": j + 1,
+                   "Context 1": f"{word}を含む例文です。", "Baseline %": 50.0,
+                   "Current %": 50.0 + j, "New %": 51.0 + j, "Known Count": 100 + j, "Total Count": 400}
+            progressive.append(row)
+            priority.append({"Word": word, "Reading": f"よみ{j}", "Tier": row["Tier"], "Occurrences": j + 1,
+                             "Sources": filename, "Context 1": row["Context 1"]})
+    pd.DataFrame(progressive).to_csv(results_dir / "progressive_learning_list.csv", index=False)
+    pd.DataFrame(priority).to_csv(results_dir / "priority_learning_list.csv", index=False)
+    stats = [{"File": "a.txt", "Total Words": 900}, {"File": "b.txt", "Total Words": 800},
+             {"File": "done.txt", "Total Words": 10}]
+    (results_dir / "file_statistics.json").write_text(json.dumps(stats), encoding="utf-8")
+
+
+@pytest.fixture
+def server(tmp_path, request):
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    write_results(results_dir)
+    theme = getattr(request, "param", "default")
+    with patch("app.static_html_generator.settings_manager.load_settings", return_value={}):
+        server = results_server.make_server("ja", port=0, results_dir=str(results_dir), theme=theme)
+        server.store.ignore_path = str(tmp_path / "IgnoreList.txt")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+
+def request(server, path, headers=None, data=None):
+    req = urllib.request.Request(results_server.server_url(server) + path.lstrip("/"), data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def get_json(server, path):
+    status, _, body = request(server, path)
+    assert status == 200
+    return json.loads(body)
+
+
+def test_index_and_pages(server):
+    index = get_json(server, "/api/index")
+    assert [f["filename"] for f in index["progressive"]] == ["a.txt", "b.txt"]
+    assert index["progressive"][0]["word_count"] == 30
+    assert index["progressive"][0]["growth"]["target"] == 80.0
+    assert index["priority_count"] == 60
+    assert [f["filename"] for f in index["completed_files"]] == ["done.txt"]
+
+    page = get_json(server, "/api/words?list=progressive&file=a.txt&offset=10&limit=5")
+    assert page["total"] == 30
+    assert [row["Word"] for row in page["rows"]] == [f"a語{j}" for j in range(10, 15)]
+
+    assert get_json(server, "/api/words?list=priority&tier=global")["total"] == 30
+    assert get_json(server, "/api/words?list=priority&q=" + quote("b語2"))["total"] == 11  # b語2, b語20..29
+    assert request(server, "/api/words?list=progressive&file=missing.txt")[0] == 404
+
+    status, _, body = request(server, "/")
+    assert status == 200
+    assert b'"api":"api"' in body
+
+
+@pytest.mark.parametrize("server", ["Zen Mode"], indirect=True)
+def test_zen_mode_serves_a_page_that_loads_from_the_api(server):
+    # zen_app.html only reads embedded lists; the served page must fetch them instead
+    status, _, body = request(server, "/")
+    assert status == 200
+    page = body.decode("utf-8")
+    assert "<title>Surasura - Zen Mode</title>" not in page
+    assert "${globalData.api}/words?" in page
+    assert "let globalTheme = 'default';" in page
+
+    index = get_json(server, "/api/index")
+    assert index["api"] == "api"
+    first = index["progressive"][0]
+    rows = get_json(server, f"/api/words?list=progressive&file={quote(first['filename'])}&limit=1000")["rows"]
+    assert len(rows) == first["word_count"] == 30
+
+
+def test_etag_and_gzip(server):
+    status, headers, _ = request(server, "/api/words?list=priority&limit=60")
+    assert status == 200
+    etag = headers["ETag"]
+    assert request(server, "/api/words?list=priority&limit=60", {"If-None-Match": etag})[0] == 304
+
+    status, headers, body = request(server, "/api/words?list=priority&limit=60", {"Accept-Encoding": "gzip"})
+    assert headers.get("Content-Encoding") == "gzip"
+    assert len(json.loads(gzip.decompress(body))["rows"]) == 60
+
+
+def test_ignore_goes_into_ignore_list(server, tmp_path):
+    etag = request(server, "/api/words?list=priority")[1]["ETag"]
+    payload = json.dumps({"words": ["a語3", "a語3"]}).encode("utf-8")
+    status, _, body = request(server, "/api/ignore", {"Content-Type": "application/json"}, payload)
+    assert status == 200
+    assert json.loads(body)["added"] == ["a語3"]
+    assert (tmp_path / "IgnoreList.txt").read_text(encoding="utf-8") == "a語3\n"
+
+    # Dropped from the lists; cached pages are no longer valid
+    page = get_json(server, "/api/words?list=progressive&file=a.txt&limit=100")
+    assert page["total"] == 29
+    assert "a語3" not in [row["Word"] for row in page["rows"]]
+    assert request(server, "/api/words?list=priority", {"If-None-Match": etag})[0] == 200
+
+    # Only JSON requests change the list
+    assert request(server, "/api/ignore", {"Content-Type": "text/plain"}, b"a")[0] == 415
+
+
+def test_search_reports_list_positions(server):
+    results = get_json(server, "/api/search?q=" + quote("b語1"))["results"]
+    exact = results[0]
+    assert (exact["word"], exact["rank"], exact["list"], exact["index"]) == ("b語1", 0, 1, 1)
+    assert {r["list"] for r in results} == {1, -1}
@@ -0,0 +1,109 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from app.search_utils import (build_search_index, search, encode_postings, decode_postings,
+                              encode_varints, decode_varints)
+from app.static_html_generator import StringTable, split_data_blocks, render_data_blocks
+
+
+def test_postings_roundtrip():
+    ids = [0, 1, 2, 31, 32, 1000, 10 ** 7]
+    assert decode_postings(encode_postings(ids)) == ids
+    assert decode_varints(encode_varints([5, 0, 33, 5])) == [5, 0, 33, 5]
+    # Plain ASCII only, nothing JSON or HTML would escape
+    assert all(c.isalnum() or c in "@$%&*+" for c in encode_postings(ids))
+
+
+def test_search_finds_words_readings_and_contexts():
+    strings = StringTable()
+    progressive = [
+        {"Word": "猫", "Reading": "ネコ", "Context 1": "猫が好きです"},
+        {"Word": "猫舌", "Reading": "ネコジタ", "Context 1": "私は猫舌だ"},
+    ]
+    priority = [
+        {"Word": "犬", "Reading": "イヌ", "Context 1": "犬と猫が遊ぶ", "Context 2": None},
+        {"Word": "Apple", "Reading": None, "Context 1": "An apple a day"},
+    ]
+    for rows in (progressive, priority):
+        for row in rows:
+            for field in ("Context 1", "Context 2"):
+                if row.get(field):
+                    strings.code(row[field])
+    index = build_search_index([(0, progressive), (-1, priority)], strings)
+
+    assert index["lists"] == [[0, 0], [-1, 2]]
+    # Exact word first, then prefix; sentences need at least a bigram
+    assert search(index, strings.values, "猫") == [0, 1]
+    assert search(index, strings.values, "ねこ") == []
+    assert search(index, strings.values, "ネコ") == [0, 1]
+    assert search(index, strings.values, "猫が") == [0, 2]
+    assert search(index, strings.values, "apple") == [3]
+    assert search(index, strings.values, "好き") == [0]
+
+
+def test_split_data_blocks_embeds_the_index():
+    data = {"progressive": [{"filename": "ep1.srt", "words": [{"Word": "猫", "Reading": "ネコ", "Context 1": "猫だ"}]}],
+            "priority": [{"Word": "猫", "Reading": "ネコ", "Context 1": "猫だ"}]}
+    index, blocks = split_data_blocks(data)
+    blocks = dict(blocks)
+    strings = blocks[index["strings_block"]]
+    # The context is stored once and shared by both lists and the search index
+    assert strings.count("猫だ") == 1
+    assert search(blocks[index["search_block"]], strings, "猫") == [0, 1]
+
+
+def _template_section(template, start, end):
+    begin = template.index(start)
+    return template[begin:template.index(end, begin)]
+
+
+def test_page_search_works_after_a_list_was_decoded(project_root):
+    """
+    Opening a list removes the shared string table's block from the page; the search
+    worker, started later on the first query, must still get the strings.
+    Runs the page's own block decoding and search code in node (main-thread fallback).
+    """
+    node = shutil.which("node")
+    if not node:
+        pytest.skip("node not found")
+    with open(os.path.join(project_root, "templates", "web_app.html"), encoding="utf-8") as f:
+        template = f.read()
+    tag = '<script type="text/plain" id="search-worker-source">'
+    worker_source = _template_section(template, tag, "</script>")[len(tag):]
+    page_code = (_template_section(template, "// --- Lazy Data Blocks ---", "// --- Served Results")
+                 + _template_section(template, "function getSearchWorker()", "function runSearch("))
+
+    data = {"progressive": [{"filename": "ep1.srt", "words": [{"Word": "猫", "Reading": "ネコ", "Context 1": "猫が好きです"}]}],
+            "priority": [{"Word": "犬", "Reading": "イヌ", "Context 1": "犬と猫が遊ぶ"}]}
+    index, blocks = split_data_blocks(data)
+    # Block contents exactly as the page embeds them
+    html_blocks = render_data_blocks(blocks)
+    elements = {block_id: html_blocks.split(f'id="{block_id}">', 1)[1].split("</script>", 1)[0] for block_id, _ in blocks}
+    elements["search-worker-source"] = worker_source
+
+    script = """
+    const texts = %s;
+    const document = { getElementById: id => id in texts
+        ? { textContent: texts[id], remove() { delete texts[id]; } } : null };
+    const globalData = %s;
+    let searchWorker = null;
+    let searchQueryId = 0;
+    function renderSearchResults(message) {
+        console.log(JSON.stringify({ rows: first.map(r => [r.Word, r["Context 1"]]), results: message.results }));
+    }
+    %s
+    const first = loadDataBlock(globalData.progressive[0].block);
+    searchQueryId++;
+    getSearchWorker().postMessage({ type: 'query', id: searchQueryId, query: '猫が' });
+    """ % (json.dumps(elements, ensure_ascii=False), json.dumps(index, ensure_ascii=False), page_code)
+    result = subprocess.run([node, "-"], input=script, capture_output=True, text=True, encoding="utf-8", timeout=60)
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert output["rows"] == [["猫", "猫が好きです"]]
+    assert [(r["list"], r["word"], r["sentence"]) for r in output["results"]] == \
+        [(0, "猫", "猫が好きです"), (-1, "犬", "犬と猫が遊ぶ")]
@@ -38,6 +38,19 @@ class TestTokenizerEdgeCases:
         tokens = self.ja_tokenizer.tokenize(text)
         assert isinstance(tokens, list)
         
+    @pytest.mark.parametrize("text", [
+        "",
+        "   \n  \t ",
+        "。。。！？",
+        "Hello こんにちは World",
+        "Hello 😺 World",
+        "ｱｲｳ　全角 \"quoted\", text",
+        "紅の思い切った資産。冷たい！？",
+    ])
+    def test_ja_fast_path_equivalence(self, text):
+        reference = JapaneseTokenizer(fast_path=False)
+        assert list(self.ja_tokenizer.tokenize_sentences(text)) == list(reference.tokenize_sentences(text))
+
     def test_zh_empty_string(self):
         tokens = self.zh_tokenizer.tokenize("")
         assert tokens == []
@@ -0,0 +1,137 @@
+import os
+import shutil
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+from app import analyzer
+from app.watch_utils import FolderWatcher
+
+
+def test_watcher_debounces_a_burst(tmp_path):
+    content = tmp_path / "HighPriority"
+    content.mkdir()
+    known = tmp_path / "KnownWord.json"
+    known.write_text("{}", encoding="utf-8")
+
+    watcher = FolderWatcher([str(tmp_path / "HighPriority")], [str(known), str(tmp_path / "missing.txt")],
+                            interval=0.02, debounce=0.3)
+    before = watcher.snapshot()
+    assert set(before) == {str(known)}
+
+    def burst():
+        for i in range(5):
+            (content / f"ep{i}.srt").write_text("字幕", encoding="utf-8")
+            time.sleep(0.05)
+
+    writer = threading.Thread(target=burst)
+    writer.start()
+    changed, after = watcher.wait_for_changes(before)
+    writer.join()
+
+    # One notification for the whole burst, after it settled
+    assert changed == {str(content / f"ep{i}.srt") for i in range(5)}
+    assert after == watcher.snapshot()
+
+
+def test_watcher_can_be_stopped(tmp_path):
+    watcher = FolderWatcher([str(tmp_path)], [], interval=0.01, debounce=0.01)
+    assert watcher.wait_for_changes(watcher.snapshot(), should_stop=lambda: True) is None
+
+
+def test_watch_reanalyzes_only_changed_files(tmp_path, ja_resources_dir, project_root):
+    user_files_ja = tmp_path / "User Files" / "ja"
+    high = tmp_path / "data" / "ja" / "HighPriority"
+    results_dir = tmp_path / "results"
+    user_files_ja.mkdir(parents=True)
+    results_dir.mkdir()
+    shutil.copytree(os.path.join(project_root, "samples", "ja", "HighPriority"), high)
+    target = high / "context_test.txt"
+    shutil.copy(os.path.join(ja_resources_dir, "context_test.txt"), target)
+
+    real_extract = analyzer.extract_text
+    extracted = []
+    waits = []
+
+    def counting_extract(path, *a, **kw):
+        extracted.append(os.path.basename(path))
+        return real_extract(path, *a, **kw)
+
+    def fake_wait(self, since, should_stop=lambda: False):
+        waits.append(since)
+        if len(waits) == 1:
+            with open(target, "a", encoding="utf-8") as f:
+                f.write("\n新しい冒険の文です。\n")
+            return {str(target)}, self.snapshot()
+        return None
+
+    with patch("app.path_utils.get_user_file", side_effect=lambda p: str(tmp_path / p)), \
+         patch("app.path_utils.get_data_path", side_effect=lambda lang=None: str(tmp_path / "data" / lang) if lang else str(tmp_path / "data")), \
+         patch("app.path_utils.get_user_files_path", side_effect=lambda lang=None: str(tmp_path / "User Files" / lang) if lang else str(tmp_path / "User Files")), \
+         patch("app.analyzer.get_data_path", side_effect=lambda lang=None: str(tmp_path / "data" / lang)), \
+         patch("app.analyzer.get_user_files_path", side_effect=lambda lang=None: str(tmp_path / "User Files" / lang)), \
+         patch("app.analyzer.RESULTS_DIR", str(results_dir)), \
+         patch("app.analyzer.OUTPUT_CSV", str(results_dir / "priority_learning_list.csv")), \
+         patch("app.analyzer.OUTPUT_STATS", str(results_dir / "file_statistics.txt")), \
+         patch("app.analyzer.OUTPUT_PROGRESSIVE", str(results_dir / "progressive_learning_list.csv")), \
+         patch("app.analyzer.extract_text", side_effect=counting_extract), \
+         patch("app.watch_utils.FolderWatcher.wait_for_changes", fake_wait), \
+         patch("app.static_html_generator.generate_static_html") as mock_static, \
+         patch("sys.argv", ["analyzer.py", "--language", "ja", "--watch"]):
+        analyzer.main()
+
+    # Run 1 reads each file once (shared by both passes); run 2 only the edited file
+    assert sorted(extracted) == sorted(os.listdir(high)) + ["context_test.txt"]
+    assert len(waits) == 2
+
+    # The page is refreshed after every run, but the browser is never opened without --static
+    assert mock_static.call_count == 2
+    assert all(call.kwargs["open_browser"] is False for call in mock_static.call_args_list)
+
+    import pandas as pd
+    df = pd.read_csv(results_dir / "priority_learning_list.csv")
+    contexts = " ".join(df[["Context 1", "Context 2", "Context 3"]].fillna("").values.ravel())
+    assert "新しい冒険の文です。" in contexts
+
+
+def test_sentence_cache_is_bounded(tmp_path):
+    files = []
+    for i in range(4):
+        path = tmp_path / f"{i}.txt"
+        path.write_text("x", encoding="utf-8")
+        files.append(str(path))
+    loads = []
+
+    def loader(path):
+        def load():
+            loads.append(os.path.basename(path))
+            return [("文", [("語", "ゴ", "語")] * 2)]  # 3 tokens with the sentence
+        return load
+
+    cache = analyzer.SentenceCache(max_tokens=7)
+    cache.start_run()
+    for path in files[:3]:
+        cache.get(path, loader(path))
+    # Over the cap: the least recently used file went first
+    assert list(cache.entries) == files[1:3]
+    assert cache.tokens == 6
+
+    cache.get(files[1], loader(files[1]))  # hit, now most recent
+    cache.get(files[3], loader(files[3]))
+    assert list(cache.entries) == [files[1], files[3]]
+    assert loads == ["0.txt", "1.txt", "2.txt", "3.txt"]
+
+    # A file the next run doesn't read any more is dropped when it finishes
+    cache.start_run()
+    cache.get(files[3], loader(files[3]))
+    cache.finish_run()
+    assert list(cache.entries) == [files[3]]
+
+    # Changed files are reloaded, deleted ones discarded
+    with open(files[3], "a", encoding="utf-8") as f:
+        f.write("more")
+    cache.get(files[3], loader(files[3]))
+    assert loads[-1] == "3.txt" and len(loads) == 5
+    cache.discard([files[3]])
+    assert not cache.entries and cache.tokens == 0
@@ -0,0 +1,89 @@
+import io
+import json
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from app import yomitan_utils
+from app.analyzer import discover_yomitan_frequency_lists, load_yomitan_frequency_list
+
+
+def write_dictionary(path, banks, mode=None):
+    index = {"title": "Test Freq", "format": 3, "revision": "1"}
+    if mode:
+        index["frequencyMode"] = mode
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("index.json", json.dumps(index))
+        for i, bank in enumerate(banks, start=1):
+            zf.writestr(f"term_meta_bank_{i}.json", json.dumps(bank, ensure_ascii=False, indent=1))
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    with patch("app.yomitan_utils.get_cache_path", return_value=str(cache)):
+        yield cache
+
+
+def test_stream_parser_handles_any_chunking():
+    values = [["猫", "freq", 12345], ["犬", "freq", {"value": 7, "displayValue": "7, 8"}], [], {"a": "]["}]
+    text = json.dumps(values, ensure_ascii=False)
+    with patch("app.yomitan_utils.READ_CHUNK", 3):
+        assert list(yomitan_utils.iter_json_array(io.StringIO(text))) == values
+    assert list(yomitan_utils.iter_json_array(io.StringIO(" [ ] "))) == []
+    with pytest.raises(ValueError):
+        list(yomitan_utils.iter_json_array(io.StringIO('[["猫", "freq", 1],')))
+
+
+def test_entry_forms(tmp_path, cache_dir):
+    zip_path = tmp_path / "freq.zip"
+    write_dictionary(zip_path, [
+        [["の", "freq", 1], ["猫", "freq", {"reading": "ねこ", "frequency": 1500}], ["猫", "pitch", {"reading": "ねこ", "pitches": []}]],
+        [["猫", "freq", {"reading": "ネコ", "frequency": {"value": 900, "displayValue": "900"}}],
+         ["犬", "freq", {"value": 2000, "displayValue": "2000㋕"}], ["鳥", "freq", "3000㋕"], ["魚", "freq", "-"],
+         ["アイリス-iris", "freq", 4000]],
+    ])
+
+    assert yomitan_utils.compile_rank_index(str(zip_path)) == {
+        "の": 1, "猫": 900, "犬": 2000, "鳥": 3000, "アイリス-iris": 4000}
+
+    # The analyzer sanitizes, and reads the compiled index from the cache on the next run
+    expected = {"の": 1, "猫": 900, "犬": 2000, "鳥": 3000, "アイリス": 4000}
+    assert load_yomitan_frequency_list(str(zip_path)) == expected
+    assert len(list(cache_dir.glob("*.cache"))) == 1
+    with patch("app.yomitan_utils.compile_rank_index", side_effect=AssertionError("reparsed")):
+        assert load_yomitan_frequency_list(str(zip_path)) == expected
+
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path, cache_dir):
+    zip_path = tmp_path / "freq.zip"
+    write_dictionary(zip_path, [[["猫", "freq", 1500]]])
+
+    with patch("app.yomitan_utils.marshal.dump", side_effect=ValueError("unmarshallable object")):
+        assert yomitan_utils.load_rank_index(str(zip_path)) == {"猫": 1500}
+    assert not [p for p in cache_dir.iterdir() if not p.name.endswith(".lock")]
+
+
+def test_occurrence_based_becomes_ranks(tmp_path):
+    zip_path = tmp_path / "counts.zip"
+    write_dictionary(zip_path, [[["の", "freq", 500], ["猫", "freq", 20], ["犬", "freq", 20], ["鳥", "freq", 3]]],
+                     mode="occurrence-based")
+    assert yomitan_utils.compile_rank_index(str(zip_path)) == {"の": 1, "猫": 2, "犬": 2, "鳥": 3}
+
+
+def test_discovery_and_non_frequency_zip(tmp_path):
+    write_dictionary(tmp_path / "frequency_list_ja_JPDB.zip", [[["の", "freq", 1]]])
+    (tmp_path / "frequency_list_ja_Novel.csv").write_text("Word,Rank\nの,1\n", encoding="utf-8")
+    (tmp_path / "frequency_list_ja_Novel.zip").write_bytes(b"")
+    (tmp_path / "frequency_list_zh_Other.zip").write_bytes(b"")
+
+    found = discover_yomitan_frequency_lists(str(tmp_path), "ja")
+    assert {name: path.rsplit("_", 1)[-1] for name, path in found.items()} == {"JPDB": "JPDB.zip", "Novel": "Novel.csv"}
+
+    terms_only = tmp_path / "terms.zip"
+    with zipfile.ZipFile(terms_only, "w") as zf:
+        zf.writestr("term_bank_1.json", "[]")
+    with pytest.raises(ValueError):
+        yomitan_utils.read_dictionary_info(str(terms_only))